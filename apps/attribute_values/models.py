@@ -29,4 +29,13 @@ class AttributeValue(models.Model):
     attribute_values_updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
-        db_table = "attribute_values"
\ No newline at end of file
+        db_table = "attribute_values"
+        indexes = [
+            # Serves the attribute segment filters of the audience list and export
+            # endpoints: (attribute, value) equality, returning audience IDs
+            models.Index(
+                fields=['attribute_values_attributes_id', 'attribute_values_value', 'attribute_values_audiences_id'],
+                name='attribute_values_segment_idx',
+                condition=models.Q(attribute_values_is_deleted=False)
+            ),
+        ]
\ No newline at end of file
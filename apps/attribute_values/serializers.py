@@ -2,6 +2,7 @@ from rest_framework import serializers
 from apps.attribute_values.models import AttributeValue
 from apps.attributes.models import Attribute
 from apps.audiences.models import Audience
+from apps.segments.membership import refresh_segment_members
 from django.db import transaction
 
 
@@ -74,12 +75,14 @@ class AttributeValueSerializer(serializers.Serializer):
             attribute_values_value=validated_data.get('attribute_values_value'),
             attribute_values_created_by=None,
         )
+        refresh_segment_members([attribute_value.attribute_values_audiences_id_id])
         return attribute_value
 
     # Updates an existing attribute value instance
     @transaction.atomic()
     def update(self, instance, validated_data):
         request = self.context.get("request")
+        previous_audience_id = instance.attribute_values_audiences_id_id
         instance.attribute_values_attributes_id = validated_data.get(
             "attribute_values_attributes_id", 
             instance.attribute_values_attributes_id
@@ -94,4 +97,5 @@ class AttributeValueSerializer(serializers.Serializer):
         )
         instance.attribute_values_updated_by = None
         instance.save()
+        refresh_segment_members([previous_audience_id, instance.attribute_values_audiences_id_id])
         return instance
\ No newline at end of file
@@ -5,11 +5,11 @@ from rest_framework.response import Response
 from rest_framework import status
 from apps.attribute_values.models import AttributeValue
 from apps.attribute_values.serializers import AttributeValueSerializer
+from apps.segments.membership import refresh_segment_members
 
 
 class AttributeValueListCreateView(APIView):
     # GET requests to fetch attribute values with filters
-    @transaction.atomic
     def get(self, request):
         try:
             attribute_values = AttributeValue.objects.filter(attribute_values_is_deleted=False)
@@ -73,7 +73,6 @@ class AttributeValueListCreateView(APIView):
 
 class AttributeValueDetailView(APIView):
     # Retrieve attribute value by ID if not soft deleted
-    @transaction.atomic
     def get(self, request, attribute_values_id):
         try:
             attribute_value = AttributeValue.objects.get(
@@ -159,6 +158,7 @@ class AttributeValueDetailView(APIView):
             )
             attribute_value.attribute_values_is_deleted = True
             attribute_value.save()
+            refresh_segment_members([attribute_value.attribute_values_audiences_id_id])
 
             return Response({
                 "success": True,
@@ -14,4 +14,8 @@ class Attribute(models.Model):
     attributes_updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
-        db_table = "attributes"
\ No newline at end of file
+        db_table = "attributes"
+        indexes = [
+            # Serves the created_at date range filter of the list endpoint
+            models.Index(fields=['attributes_created_at'], name='attributes_created_at_idx'),
+        ]
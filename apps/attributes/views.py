@@ -3,94 +3,33 @@ from django.db import transaction
 from django.core.exceptions import ObjectDoesNotExist
 from rest_framework.response import Response
 from rest_framework import status
+from apps.common.filters import BooleanFilter, DateRangeFilter, FilterError, apply_filters
 from apps.attributes.models import Attribute
 from apps.attributes.serializers import AttributeSerializer
 from apps.attribute_values.models import AttributeValue
-from django.utils.dateparse import parse_date
+from apps.segments.membership import rebuild_segments_referencing
 
 class AttributeListCreateView(APIView):
+    query_filters = (
+        BooleanFilter('attributes_status', 'attributes_is_active'),
+        DateRangeFilter('created_at', 'attributes_created_at'),
+    )
+
     # GET requests to fetch all non-deleted attributes with optional status filter
-    @transaction.atomic
     def get(self, request):
         try:
-            attributes = Attribute.objects.filter(attributes_is_deleted=False)
-            
-            status_filter = request.GET.get('attributes_status')
-            if status_filter is not None:
-                if status_filter.lower() == 'true':
-                    attributes = attributes.filter(attributes_is_active=True)
-                elif status_filter.lower() == 'false':
-                    attributes = attributes.filter(attributes_is_active=False)
+            try:
+                attributes = apply_filters(
+                    Attribute.objects.filter(attributes_is_deleted=False), request.GET, self.query_filters
+                )
+            except FilterError as e:
+                return Response({
+                    "success": False,
+                    "status": 400,
+                    "message": e.message,
+                    "error": e.error
+                }, status=status.HTTP_400_BAD_REQUEST)
 
-            created_at_param = request.GET.get('created_at')
-            
-            if created_at_param:
-                try:
-                    if 'to' in created_at_param.lower():
-                        date_parts = created_at_param.lower().split('to')
-                        if len(date_parts) == 2:
-                            start_date_str = date_parts[0].strip()
-                            end_date_str = date_parts[1].strip()
-                            
-                            start_date = parse_date(start_date_str)
-                            end_date = parse_date(end_date_str)
-                            
-                            if start_date and end_date:
-                                attributes = attributes.filter(
-                                    attributes_created_at__date__gte=start_date,
-                                    attributes_created_at__date__lte=end_date
-                                )
-                            else:
-                                return Response({
-                                    "success": False,
-                                    "status": 400,
-                                    "message": "Invalid date range format. Use 'YYYY-MM-DD to YYYY-MM-DD' with valid dates",
-                                    "error": "Invalid date format in range"
-                                }, status=status.HTTP_400_BAD_REQUEST)
-                        else:
-                            return Response({
-                                "success": False,
-                                "status": 400,
-                                "message": "Invalid date range format. Use 'YYYY-MM-DD to YYYY-MM-DD'",
-                                "error": "Invalid range format"
-                            }, status=status.HTTP_400_BAD_REQUEST)
-                    
-                    elif '-' in created_at_param and created_at_param.count('-') >= 2:
-                        filter_date = parse_date(created_at_param)
-                        if filter_date:
-                            attributes = attributes.filter(attributes_created_at__date=filter_date)
-                        else:
-                            return Response({
-                                "success": False,
-                                "status": 400,
-                                "message": "Invalid date format. Use 'YYYY-MM-DD'",
-                                "error": "Invalid date format"
-                            }, status=status.HTTP_400_BAD_REQUEST)
-                    
-                    else:
-                        return Response({
-                            "success": False,
-                            "status": 400,
-                            "message": "Invalid date parameter. Use 'YYYY-MM-DD' for single date or 'YYYY-MM-DD to YYYY-MM-DD' for range",
-                            "error": "Invalid date parameter format"
-                        }, status=status.HTTP_400_BAD_REQUEST)
-                        
-                except ValueError as e:
-                    return Response({
-                        "success": False,
-                        "status": 400,
-                        "message": "Invalid date value",
-                        "error": str(e)
-                    }, status=status.HTTP_400_BAD_REQUEST)
-                except Exception as e:
-                    return Response({
-                        "success": False,
-                        "status": 400,
-                        "message": "Error processing date filter",
-                        "error": str(e)
-                    }, status=status.HTTP_400_BAD_REQUEST)
-            
-            
             serializer = AttributeSerializer(attributes, many=True)
             return Response({
                 "success": True,
@@ -140,7 +79,6 @@ class AttributeListCreateView(APIView):
 
 class AttributeDetailView(APIView):
     # Retrieve attribute by ID if not soft deleted
-    @transaction.atomic
     def get(self, request, attributes_id):
         try:
             attribute = Attribute.objects.get(attributes_id=attributes_id, attributes_is_deleted=False)
@@ -180,9 +118,14 @@ class AttributeDetailView(APIView):
             }, status=status.HTTP_404_NOT_FOUND)
         
         try:
+            previous_name, was_active = attribute.attributes_name, attribute.attributes_is_active
             serializer = AttributeSerializer(attribute, data=request.data, partial=True, context={'request': request})
             if serializer.is_valid():
                 serializer.save()
+
+                # Segments naming the attribute under its old or new name resolve differently now
+                if attribute.attributes_name != previous_name or attribute.attributes_is_active != was_active:
+                    rebuild_segments_referencing(attribute_names=[previous_name, attribute.attributes_name])
                 return Response({
                     "success": True,
                     "status": 200,
@@ -219,6 +162,9 @@ class AttributeDetailView(APIView):
                 attribute_values_is_deleted=False
             ).update(attribute_values_is_deleted=True)
 
+            # Segments filtering on this attribute no longer resolve and are emptied
+            rebuild_segments_referencing(attribute_names=[attribute.attributes_name])
+
             return Response({
                 "success": True,
                 "status": 200,
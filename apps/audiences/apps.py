@@ -1,6 +1,22 @@
 from django.apps import AppConfig
+from django.db import connections
+from django.db.models.signals import pre_migrate
+
+
+# The trigram indexes of the q= search (audiences_name_trgm_idx,
+# audiences_email_trgm_idx) need pg_trgm, so create it before the tables,
+# e.g. when the test database is built from a template without it.
+def create_trigram_extension(sender, using, **kwargs):
+    connection = connections[using]
+    if connection.vendor != 'postgresql':
+        return
+    with connection.cursor() as cursor:
+        cursor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
 
 
 class AudiencesConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.audiences'
+
+    def ready(self):
+        pre_migrate.connect(create_trigram_extension, sender=self)
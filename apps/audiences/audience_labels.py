@@ -0,0 +1,117 @@
+from collections import defaultdict
+
+from django.conf import settings
+from django.db.models import Count, Q
+
+from apps.audiences.models import Audience, AudienceLabel
+
+
+LABEL_MATCH_MODES = ('any', 'all')
+SYNC_BATCH_SIZE = 5000
+
+
+# True when the normalized audience_labels table is kept in sync and used for
+# label filters and counts; audiences_labels stays the source of truth.
+def join_table_enabled():
+    return getattr(settings, 'AUDIENCE_LABELS_JOIN_TABLE', False)
+
+
+def _label_id_set(labels):
+    label_ids = set()
+    for label_id in labels or []:
+        try:
+            label_ids.add(int(label_id))
+        except (TypeError, ValueError):
+            continue
+    return label_ids
+
+
+# Writes the audience_labels rows for saved audiences so they match
+# audiences_labels, inserting missing pairs and deleting stale ones.
+def write_audience_label_rows(audiences, batch_size=SYNC_BATCH_SIZE):
+    wanted = {audience.audiences_id: _label_id_set(audience.audiences_labels) for audience in audiences}
+    if not wanted:
+        return
+
+    existing = defaultdict(set)
+    stale_ids = []
+    rows = AudienceLabel.objects.filter(audience_labels_audiences_id__in=list(wanted)).values_list(
+        'audience_labels_id', 'audience_labels_audiences_id', 'audience_labels_labels_id'
+    )
+    for row_id, audience_id, label_id in rows:
+        if label_id in wanted[audience_id]:
+            existing[audience_id].add(label_id)
+        else:
+            stale_ids.append(row_id)
+
+    if stale_ids:
+        AudienceLabel.objects.filter(audience_labels_id__in=stale_ids).delete()
+
+    new_rows = [
+        AudienceLabel(audience_labels_audiences_id_id=audience_id, audience_labels_labels_id_id=label_id)
+        for audience_id, label_ids in wanted.items()
+        for label_id in label_ids - existing[audience_id]
+    ]
+    if new_rows:
+        AudienceLabel.objects.bulk_create(new_rows, batch_size=batch_size, ignore_conflicts=True)
+
+
+def sync_audience_labels(audiences):
+    if join_table_enabled():
+        write_audience_label_rows(audiences)
+
+
+def delete_label_rows(label_ids):
+    if join_table_enabled():
+        AudienceLabel.objects.filter(audience_labels_labels_id__in=label_ids).delete()
+
+
+def _any_label_q(label_ids):
+    any_label = Q()
+    for label_id in label_ids:
+        any_label |= Q(audiences_labels__contains=[label_id])
+    return any_label
+
+
+# Narrows an audience queryset to audiences carrying any (or all) of the
+# given label IDs. Both paths are index lookups: the join table through
+# audience_labels_label_idx, audiences_labels through its GIN index.
+def filter_by_label_ids(queryset, label_ids, match='any'):
+    label_ids = sorted(set(label_ids))
+    if not label_ids:
+        return queryset.none()
+
+    if join_table_enabled():
+        pairs = AudienceLabel.objects.filter(audience_labels_labels_id__in=label_ids)
+        if match == 'all' and len(label_ids) > 1:
+            pairs = pairs.values('audience_labels_audiences_id').annotate(
+                matched=Count('audience_labels_id')
+            ).filter(matched=len(label_ids))
+        return queryset.filter(audiences_id__in=pairs.values('audience_labels_audiences_id'))
+
+    if match == 'all':
+        return queryset.filter(audiences_labels__contains=label_ids)
+    return queryset.filter(_any_label_q(label_ids))
+
+
+# Returns {label_id: number of non-deleted audiences carrying it} in one query.
+def count_audiences_per_label(label_ids):
+    label_ids = sorted(set(label_ids))
+    counts = dict.fromkeys(label_ids, 0)
+    if not label_ids:
+        return counts
+
+    if join_table_enabled():
+        rows = AudienceLabel.objects.filter(
+            audience_labels_labels_id__in=label_ids,
+            audience_labels_audiences_id__audiences_is_deleted=False
+        ).values('audience_labels_labels_id').annotate(total=Count('audience_labels_id'))
+        counts.update((row['audience_labels_labels_id'], row['total']) for row in rows)
+        return counts
+
+    totals = Audience.objects.filter(_any_label_q(label_ids), audiences_is_deleted=False).aggregate(**{
+        f"label_{label_id}": Count('audiences_id', filter=Q(audiences_labels__contains=[label_id]))
+        for label_id in label_ids
+    })
+    counts.update((label_id, totals[f"label_{label_id}"]) for label_id in label_ids)
+    return counts
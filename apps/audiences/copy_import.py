@@ -0,0 +1,266 @@
+import csv
+import io
+import json
+
+from django.db import connection, transaction
+from django.utils import timezone
+
+from apps.audiences.audience_labels import join_table_enabled
+from apps.audiences.importer import resolve_import_attributes, resolve_import_labels, resolve_row_label_ids
+from apps.audiences.serializers import AudienceImportSerializer
+from apps.segments.membership import refresh_segment_members
+
+
+STAGING_COLUMNS = [
+    'row_index', 'phone', 'name', 'email', 'source', 'opted', 'labels', 'is_active'
+]
+ATTRIBUTE_STAGING_COLUMNS = ['phone', 'attribute_id', 'value']
+
+
+# Raised when the COPY import is requested on a database that does not support it.
+class CopyImportUnavailable(Exception):
+    pass
+
+
+def copy_import_available():
+    return connection.vendor == 'postgresql'
+
+
+# Streams rows into a table with COPY ... FROM STDIN (psycopg2 or psycopg 3).
+def _copy_rows(cursor, table, columns, rows):
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(rows)
+    buffer.seek(0)
+
+    sql = f"COPY {table} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)"
+    raw_cursor = cursor.cursor
+    if hasattr(raw_cursor, 'copy_expert'):
+        raw_cursor.copy_expert(sql, buffer)
+    else:
+        with raw_cursor.copy(sql) as copy:
+            copy.write(buffer.getvalue())
+
+
+# High-volume import path for PostgreSQL: rows are validated in Python, COPYed
+# into temporary staging tables and merged into audiences and attribute_values
+# with set-based statements. Returns the same summary/details shape as
+# run_audience_import.
+def run_audience_copy_import(audiences_data, skip_existing=True, index_offset=0):
+    if not copy_import_available():
+        raise CopyImportUnavailable("COPY import is only available on PostgreSQL")
+
+    results = {
+        "summary": {
+            "total": len(audiences_data),
+            "created": 0,
+            "updated": 0,
+            "skipped": 0,
+            "failed": 0
+        },
+        "details": []
+    }
+    details = [
+        {
+            "index": index_offset + index,
+            "phone_number": audience_data.get('audiences_phone_number') if isinstance(audience_data, dict) else None,
+            "status": "pending",
+            "message": "",
+            "audience_id": None
+        }
+        for index, audience_data in enumerate(audiences_data)
+    ]
+
+    def fail(index, message):
+        details[index]["status"] = "failed"
+        details[index]["message"] = message
+        results["summary"]["failed"] += 1
+
+    with transaction.atomic():
+        existing_labels_cache = resolve_import_labels(audiences_data)
+        existing_attributes_cache = resolve_import_attributes(audiences_data)
+
+        # Validate rows; the last row wins when a phone number repeats
+        staged_rows = {}
+        for index, audience_data in enumerate(audiences_data):
+            serializer = AudienceImportSerializer(data=audience_data)
+            if not serializer.is_valid():
+                error_msg = list(serializer.errors.values())[0][0] if serializer.errors else "Invalid data"
+                fail(index, f"Validation error: {error_msg}")
+                continue
+
+            validated_data = serializer.validated_data
+            phone_number = validated_data['audiences_phone_number']
+            if phone_number in staged_rows:
+                fail(staged_rows[phone_number][0], "Duplicate phone number in import, a later row was used")
+            staged_rows[phone_number] = (index, validated_data)
+
+        if staged_rows:
+            _merge_staged_rows(
+                staged_rows, skip_existing, existing_labels_cache, existing_attributes_cache, details, results
+            )
+
+    results["details"] = details
+    return results
+
+
+def _merge_staged_rows(staged_rows, skip_existing, existing_labels_cache, existing_attributes_cache, details, results):
+    now = timezone.now()
+    audience_rows = []
+    attribute_rows = []
+    for phone_number, (index, validated_data) in staged_rows.items():
+        label_ids = resolve_row_label_ids(validated_data.get('audiences_labels', []), existing_labels_cache)
+        audience_rows.append([
+            index,
+            phone_number,
+            validated_data['audiences_name'],
+            validated_data.get('audiences_email') or None,
+            validated_data.get('audiences_source') or None,
+            validated_data.get('audiences_opted') or None,
+            json.dumps(label_ids),
+            validated_data.get('audiences_is_active', True),
+        ])
+        for attr_name, attr_value in validated_data.get('audiences_attributes', {}).items():
+            attribute = existing_attributes_cache.get(attr_name.strip().lower())
+            if attribute:
+                attribute_rows.append([phone_number, attribute.attributes_id, str(attr_value)])
+
+    if skip_existing:
+        conflict_clause = "DO NOTHING"
+    else:
+        # Same merge rules as the ORM path: labels are unioned, soft-deleted audiences are left alone
+        conflict_clause = """DO UPDATE SET
+                audiences_name = EXCLUDED.audiences_name,
+                audiences_email = COALESCE(EXCLUDED.audiences_email, a.audiences_email),
+                audiences_source = COALESCE(EXCLUDED.audiences_source, a.audiences_source),
+                audiences_opted = COALESCE(EXCLUDED.audiences_opted, a.audiences_opted),
+                audiences_labels = (
+                    SELECT COALESCE(jsonb_agg(DISTINCT label), '[]'::jsonb)
+                    FROM jsonb_array_elements(COALESCE(a.audiences_labels, '[]'::jsonb) || EXCLUDED.audiences_labels) AS label
+                ),
+                audiences_is_active = EXCLUDED.audiences_is_active,
+                audiences_last_active = EXCLUDED.audiences_last_active,
+                audiences_updated_by = NULL,
+                audiences_updated_at = EXCLUDED.audiences_updated_at
+            WHERE a.audiences_is_deleted = FALSE"""
+
+    with connection.cursor() as cursor:
+        cursor.execute("""
+            DROP TABLE IF EXISTS audience_import_staging, audience_import_attribute_staging, audience_import_merged
+        """)
+        cursor.execute("""
+            CREATE TEMP TABLE audience_import_staging (
+                row_index INT, phone VARCHAR(20), name VARCHAR(255), email VARCHAR(255),
+                source VARCHAR(50), opted VARCHAR(50), labels JSONB, is_active BOOLEAN
+            ) ON COMMIT DROP
+        """)
+        cursor.execute("""
+            CREATE TEMP TABLE audience_import_attribute_staging (
+                phone VARCHAR(20), attribute_id INT, value VARCHAR(255)
+            ) ON COMMIT DROP
+        """)
+        cursor.execute("""
+            CREATE TEMP TABLE audience_import_merged (
+                audiences_id INT, phone VARCHAR(20), inserted BOOLEAN
+            ) ON COMMIT DROP
+        """)
+
+        _copy_rows(cursor, 'audience_import_staging', STAGING_COLUMNS, audience_rows)
+        if attribute_rows:
+            _copy_rows(cursor, 'audience_import_attribute_staging', ATTRIBUTE_STAGING_COLUMNS, attribute_rows)
+        cursor.execute("ANALYZE audience_import_staging")
+
+        cursor.execute(f"""
+            WITH upserted AS (
+                INSERT INTO audiences AS a (
+                    audiences_name, audiences_phone_number, audiences_email, audiences_source,
+                    audiences_opted, audiences_labels, audiences_last_active, audiences_created_by,
+                    audiences_is_active, audiences_is_deleted, audiences_created_at, audiences_updated_at
+                )
+                SELECT s.name, s.phone, s.email, COALESCE(s.source, 'imported'), COALESCE(s.opted, 'in'),
+                       s.labels, %(now)s, NULL, s.is_active, FALSE, %(now)s, %(now)s
+                FROM audience_import_staging s
+                ORDER BY s.row_index
+                ON CONFLICT (audiences_phone_number) {conflict_clause}
+                RETURNING a.audiences_id, a.audiences_phone_number, (a.xmax = 0) AS inserted
+            )
+            INSERT INTO audience_import_merged (audiences_id, phone, inserted)
+            SELECT audiences_id, audiences_phone_number, inserted FROM upserted
+        """, {"now": now})
+
+        if attribute_rows:
+            cursor.execute("""
+                UPDATE attribute_values av
+                SET attribute_values_value = sa.value,
+                    attribute_values_updated_by = NULL,
+                    attribute_values_updated_at = %(now)s
+                FROM audience_import_attribute_staging sa
+                JOIN audience_import_merged m ON m.phone = sa.phone
+                WHERE av.attribute_values_audiences_id = m.audiences_id
+                  AND av.attribute_values_attributes_id = sa.attribute_id
+                  AND av.attribute_values_is_deleted = FALSE
+                  AND av.attribute_values_value IS DISTINCT FROM sa.value
+            """, {"now": now})
+            cursor.execute("""
+                INSERT INTO attribute_values (
+                    attribute_values_attributes_id, attribute_values_audiences_id, attribute_values_value,
+                    attribute_values_created_by, attribute_values_is_deleted,
+                    attribute_values_created_at, attribute_values_updated_at
+                )
+                SELECT sa.attribute_id, m.audiences_id, sa.value, NULL, FALSE, %(now)s, %(now)s
+                FROM audience_import_attribute_staging sa
+                JOIN audience_import_merged m ON m.phone = sa.phone
+                WHERE NOT EXISTS (
+                    SELECT 1 FROM attribute_values av
+                    WHERE av.attribute_values_audiences_id = m.audiences_id
+                      AND av.attribute_values_attributes_id = sa.attribute_id
+                      AND av.attribute_values_is_deleted = FALSE
+                )
+            """, {"now": now})
+
+        if join_table_enabled():
+            # Labels are only ever added by the merge, so inserting the missing pairs is enough
+            cursor.execute("""
+                INSERT INTO audience_labels (
+                    audience_labels_audiences_id, audience_labels_labels_id, audience_labels_created_at
+                )
+                SELECT m.audiences_id, label.value::int, %(now)s
+                FROM audience_import_merged m
+                JOIN audiences a ON a.audiences_id = m.audiences_id
+                CROSS JOIN LATERAL jsonb_array_elements_text(a.audiences_labels) AS label(value)
+                WHERE label.value ~ '^[0-9]+$'
+                ON CONFLICT (audience_labels_audiences_id, audience_labels_labels_id) DO NOTHING
+            """, {"now": now})
+
+        # Created and updated rows
+        cursor.execute("SELECT phone, audiences_id, inserted FROM audience_import_merged")
+        merged = {phone: (audiences_id, inserted) for phone, audiences_id, inserted in cursor.fetchall()}
+
+        # Rows the merge left alone: existing audiences when skipping, or soft-deleted ones
+        cursor.execute("""
+            SELECT s.phone, a.audiences_id, a.audiences_is_deleted
+            FROM audience_import_staging s
+            JOIN audiences a ON a.audiences_phone_number = s.phone
+            LEFT JOIN audience_import_merged m ON m.phone = s.phone
+            WHERE m.phone IS NULL
+        """)
+        untouched = {phone: (audiences_id, is_deleted) for phone, audiences_id, is_deleted in cursor.fetchall()}
+
+    refresh_segment_members(audiences_id for audiences_id, _ in merged.values())
+
+    summary = results["summary"]
+    for phone_number, (index, _) in staged_rows.items():
+        detail = details[index]
+        if phone_number in merged:
+            audiences_id, inserted = merged[phone_number]
+            detail["audience_id"] = audiences_id
+            detail["status"] = "created" if inserted else "updated"
+            summary["created" if inserted else "updated"] += 1
+        elif phone_number in untouched and not untouched[phone_number][1]:
+            detail["audience_id"] = untouched[phone_number][0]
+            detail["status"] = "skipped"
+            detail["message"] = "Audience already exists and skip_existing is true"
+            summary["skipped"] += 1
+        else:
+            detail["status"] = "failed"
+            detail["message"] = "Phone number belongs to a deleted audience"
+            summary["failed"] += 1
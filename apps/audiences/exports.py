@@ -0,0 +1,80 @@
+import csv
+import json
+from itertools import islice
+
+from django.core.serializers.json import DjangoJSONEncoder
+
+from apps.attributes.models import Attribute
+from apps.audiences.serializers import AudienceSerializer
+
+
+EXPORT_CHUNK_SIZE = 2000
+
+EXPORT_FORMATS = ('csv', 'ndjson')
+
+EXPORT_CONTENT_TYPES = {
+    'csv': 'text/csv',
+    'ndjson': 'application/x-ndjson',
+}
+
+CSV_BASE_COLUMNS = [
+    'audiences_id',
+    'audiences_name',
+    'audiences_phone_number',
+    'audiences_email',
+    'audiences_source',
+    'audiences_opted',
+    'audiences_labels',
+    'audiences_last_active',
+    'audiences_is_active',
+    'audiences_created_at',
+    'audiences_updated_at',
+]
+
+
+# Yields the filtered audiences as serialized rows, one chunk at a time.
+# Labels and attributes are resolved per chunk, so memory stays bounded by the chunk size.
+def iter_audience_rows(queryset, chunk_size=EXPORT_CHUNK_SIZE):
+    audiences = queryset.order_by('audiences_id').iterator(chunk_size=chunk_size)
+    while True:
+        chunk = list(islice(audiences, chunk_size))
+        if not chunk:
+            return
+        yield from AudienceSerializer(chunk, many=True).data
+
+
+# Minimal file-like object so csv.writer hands back each formatted line.
+class _Echo:
+    def write(self, value):
+        return value
+
+
+def stream_audiences_csv(queryset, chunk_size=EXPORT_CHUNK_SIZE):
+    # One column per attribute, so the header is known before streaming rows
+    attribute_names = list(
+        Attribute.objects.filter(attributes_is_deleted=False)
+        .order_by('attributes_id')
+        .values_list('attributes_name', flat=True)
+    )
+    writer = csv.writer(_Echo())
+
+    yield writer.writerow(CSV_BASE_COLUMNS + attribute_names)
+    for row in iter_audience_rows(queryset, chunk_size):
+        values = [row.get(column) for column in CSV_BASE_COLUMNS]
+        values[CSV_BASE_COLUMNS.index('audiences_labels')] = '|'.join(
+            str(label) for label in row.get('audiences_labels') or []
+        )
+        attributes = row.get('audiences_attributes') or {}
+        values.extend(attributes.get(name) for name in attribute_names)
+        yield writer.writerow(values)
+
+
+def stream_audiences_ndjson(queryset, chunk_size=EXPORT_CHUNK_SIZE):
+    for row in iter_audience_rows(queryset, chunk_size):
+        yield json.dumps(row, cls=DjangoJSONEncoder) + '\n'
+
+
+def stream_audiences(queryset, export_format, chunk_size=EXPORT_CHUNK_SIZE):
+    if export_format == 'ndjson':
+        return stream_audiences_ndjson(queryset, chunk_size)
+    return stream_audiences_csv(queryset, chunk_size)
@@ -0,0 +1,145 @@
+from django.db.models import Exists, OuterRef, Q
+
+from apps.attribute_values.models import AttributeValue
+from apps.attributes.models import Attribute
+from apps.audiences.audience_labels import LABEL_MATCH_MODES, filter_by_label_ids
+from apps.audiences.models import Audience
+from apps.common.filters import BooleanFilter, DateRangeFilter, ExactFilter, FilterError, apply_filters
+from apps.labels.models import Label
+
+
+# Filters that map straight to an audience column; the label filters below
+# need a label lookup first
+AUDIENCE_FILTERS = (
+    BooleanFilter('audiences_status', 'audiences_is_active'),
+    ExactFilter('audiences_source', 'audiences_source'),
+    ExactFilter('audiences_opted', 'audiences_opted'),
+    DateRangeFilter('created_at', 'audiences_created_at'),
+    DateRangeFilter('last_active', 'audiences_last_active', 'last_active'),
+)
+# Every parameter filter_audiences reads; saved segments store a subset of them
+AUDIENCE_FILTER_PARAMS = tuple(query_filter.param for query_filter in AUDIENCE_FILTERS) + (
+    'audiences_label', 'audiences_labels', 'audiences_labels_match', 'attribute',
+)
+
+
+# Resolves comma-separated label names to active label IDs, one per name.
+# The oldest label wins when a name is used twice, so creating a duplicate
+# later cannot change what a filter (or a saved segment) matches.
+def _resolve_label_names(param_value):
+    names = {name.strip().lower() for name in param_value.split(',') if name.strip()}
+    if not names:
+        raise FilterError("audiences_labels must list at least one label name", "Invalid label names")
+
+    name_query = Q()
+    for name in names:
+        name_query |= Q(labels_name__iexact=name)
+    labels = Label.objects.filter(
+        name_query, labels_is_deleted=False, labels_is_active=True
+    ).order_by('-labels_id').values_list('labels_id', 'labels_name')
+    # Newest first, so the oldest label with a name is written last and wins
+    label_ids = {labels_name.strip().lower(): labels_id for labels_id, labels_name in labels}
+
+    missing = sorted(names - set(label_ids))
+    if missing:
+        raise FilterError(f"Label '{missing[0]}' not found", "Invalid label name")
+    return list(label_ids.values())
+
+
+# Values of a query parameter that may be repeated; plain dicts hold a string
+# or a list.
+def _param_values(params, name):
+    if hasattr(params, 'getlist'):
+        return params.getlist(name)
+    value = params.get(name)
+    if value is None:
+        return []
+    return value if isinstance(value, (list, tuple)) else [value]
+
+
+# Parses attribute segment conditions, one per 'attribute' parameter, written
+# 'Name:value' or 'Name:value1,value2' (any of the values). Returns
+# [(attribute name, [values])].
+def _parse_attribute_conditions(param_values):
+    conditions = []
+    for param_value in param_values:
+        name, separator, values = param_value.partition(':')
+        values = [value.strip() for value in values.split(',') if value.strip()]
+        if not separator or not name.strip() or not values:
+            raise FilterError(
+                "Invalid attribute filter. Use 'attribute=Name:value' or 'attribute=Name:value1,value2'",
+                "Invalid attribute filter"
+            )
+        conditions.append((name.strip(), values))
+    return conditions
+
+
+# Resolves attribute names (case-insensitive) to active attribute IDs, the
+# oldest one when a name is used twice (the same rule as _resolve_label_names).
+def _resolve_attribute_names(names):
+    names = {name.lower() for name in names}
+    name_query = Q()
+    for name in names:
+        name_query |= Q(attributes_name__iexact=name)
+    attributes = Attribute.objects.filter(
+        name_query, attributes_is_deleted=False, attributes_is_active=True
+    ).order_by('-attributes_id').values_list('attributes_id', 'attributes_name')
+    # Newest first, so the oldest attribute with a name is written last and wins
+    attribute_ids = {attributes_name.strip().lower(): attributes_id for attributes_id, attributes_name in attributes}
+
+    missing = sorted(names - set(attribute_ids))
+    if missing:
+        raise FilterError(f"Attribute '{missing[0]}' not found", "Invalid attribute name")
+    return attribute_ids
+
+
+# Narrows an audience queryset to audiences matching every attribute
+# condition. Each condition is an EXISTS subquery over attribute_values, an
+# index lookup on attribute_values_segment_idx.
+def filter_by_attribute_values(queryset, conditions):
+    attribute_ids = _resolve_attribute_names(name for name, _ in conditions)
+    for name, values in conditions:
+        queryset = queryset.filter(Exists(AttributeValue.objects.filter(
+            attribute_values_attributes_id=attribute_ids[name.lower()],
+            attribute_values_value__in=values,
+            attribute_values_audiences_id=OuterRef('audiences_id'),
+            attribute_values_is_deleted=False
+        )))
+    return queryset
+
+
+# Builds the filtered audience queryset shared by the list and export endpoints.
+def filter_audiences(params):
+    audiences = apply_filters(Audience.objects.filter(audiences_is_deleted=False), params, AUDIENCE_FILTERS)
+
+    # Filter by Label (by label name)
+    label_filter = params.get('audiences_label')
+    if label_filter:
+        # Get label ID from name, the oldest label when the name is used twice
+        label = Label.objects.filter(
+            labels_name__iexact=label_filter.strip(),
+            labels_is_deleted=False,
+            labels_is_active=True
+        ).order_by('labels_id').first()
+        if label is None:
+            raise FilterError(f"Label '{label_filter}' not found", "Invalid label name")
+        # Filter audiences that have this label ID in their labels array
+        audiences = filter_by_label_ids(audiences, [label.labels_id])
+
+    # Filter by several labels (comma-separated names), matching any or all of them
+    labels_filter = params.get('audiences_labels')
+    if labels_filter:
+        match = (params.get('audiences_labels_match') or 'any').lower()
+        if match not in LABEL_MATCH_MODES:
+            raise FilterError(
+                "Invalid audiences_labels_match. Use 'any' or 'all'",
+                "Invalid label match mode"
+            )
+        audiences = filter_by_label_ids(audiences, _resolve_label_names(labels_filter), match)
+
+    # Filter by attribute values, e.g. attribute=City:Pune&attribute=Plan:Gold,Silver
+    attribute_filters = [value for value in _param_values(params, 'attribute') if value]
+    if attribute_filters:
+        audiences = filter_by_attribute_values(audiences, _parse_attribute_conditions(attribute_filters))
+
+    return audiences
@@ -0,0 +1,133 @@
+import codecs
+import csv
+import os
+import zipfile
+from itertools import islice
+
+
+IMPORT_FILE_TYPES = ('csv', 'xlsx')
+
+# Spreadsheet header (lower-cased) -> audience field. Every other column is
+# imported as a dynamic attribute named after its header.
+IMPORT_COLUMN_MAP = {
+    'audiences_name': 'audiences_name',
+    'name': 'audiences_name',
+    'audiences_phone_number': 'audiences_phone_number',
+    'phone_number': 'audiences_phone_number',
+    'phone': 'audiences_phone_number',
+    'audiences_email': 'audiences_email',
+    'email': 'audiences_email',
+    'audiences_source': 'audiences_source',
+    'source': 'audiences_source',
+    'audiences_opted': 'audiences_opted',
+    'opted': 'audiences_opted',
+    'audiences_labels': 'audiences_labels',
+    'labels': 'audiences_labels',
+    'audiences_is_active': 'audiences_is_active',
+    'is_active': 'audiences_is_active',
+}
+
+LABEL_SEPARATORS = ('|', ',')
+
+
+# Raised when an uploaded import file cannot be read.
+class ImportFileError(ValueError):
+    pass
+
+
+def get_import_file_type(uploaded_file, file_type=None):
+    if file_type:
+        file_type = file_type.lower()
+    else:
+        file_type = os.path.splitext(uploaded_file.name or '')[1].lstrip('.').lower()
+
+    if file_type not in IMPORT_FILE_TYPES:
+        raise ImportFileError("Unsupported file type. Upload a .csv or .xlsx file")
+    return file_type
+
+
+def _iter_csv_records(uploaded_file):
+    # UploadedFile yields byte lines read chunk by chunk from the temp file
+    yield from csv.reader(codecs.iterdecode(uploaded_file, 'utf-8-sig'))
+
+
+def _iter_xlsx_records(uploaded_file):
+    try:
+        from openpyxl import load_workbook
+        from openpyxl.utils.exceptions import InvalidFileException
+    except ImportError:
+        raise ImportFileError("XLSX import requires the openpyxl package")
+
+    # read_only mode streams rows from the sheet XML instead of loading the workbook
+    try:
+        workbook = load_workbook(uploaded_file, read_only=True, data_only=True)
+    except (InvalidFileException, zipfile.BadZipFile, KeyError, OSError) as e:
+        raise ImportFileError(f"Could not read the uploaded file: {e}")
+
+    try:
+        for values in workbook.active.iter_rows(values_only=True):
+            yield ['' if value is None else str(value) for value in values]
+    except (zipfile.BadZipFile, KeyError, OSError, SyntaxError) as e:
+        # SyntaxError covers the XML parse errors of a damaged sheet
+        raise ImportFileError(f"Could not read the uploaded file: {e}")
+    finally:
+        workbook.close()
+
+
+def _build_row(columns, values):
+    row = {}
+    attributes = {}
+    for (header, field), value in zip(columns, values):
+        value = value.strip() if isinstance(value, str) else value
+        if value in (None, ''):
+            continue
+
+        if field == 'audiences_labels':
+            separator = next((sep for sep in LABEL_SEPARATORS if sep in value), None)
+            row[field] = [label.strip() for label in value.split(separator)] if separator else [value]
+        elif field:
+            row[field] = value
+        else:
+            attributes[header] = value
+
+    row['audiences_attributes'] = attributes
+    return row
+
+
+# Yields audience import rows (the same shape as the JSON 'audiences' items)
+# from a CSV or XLSX upload, one record at a time.
+def iter_import_file_rows(uploaded_file, file_type):
+    records = _iter_xlsx_records(uploaded_file) if file_type == 'xlsx' else _iter_csv_records(uploaded_file)
+
+    try:
+        header = next(records)
+    except StopIteration:
+        raise ImportFileError("The uploaded file is empty")
+    except (UnicodeDecodeError, csv.Error) as e:
+        raise ImportFileError(f"Could not read the uploaded file: {e}")
+
+    columns = []
+    for name in header:
+        name = (name or '').strip()
+        columns.append((name, IMPORT_COLUMN_MAP.get(name.lower())))
+
+    if not any(field == 'audiences_phone_number' for _, field in columns):
+        raise ImportFileError("The uploaded file must have a phone number column")
+
+    try:
+        for values in records:
+            # Skip blank lines
+            if not any(isinstance(value, str) and value.strip() for value in values):
+                continue
+            yield _build_row(columns, values)
+    except (UnicodeDecodeError, csv.Error) as e:
+        raise ImportFileError(f"Could not read the uploaded file: {e}")
+
+
+def iter_chunks(rows, chunk_size):
+    rows = iter(rows)
+    while True:
+        chunk = list(islice(rows, chunk_size))
+        if not chunk:
+            return
+        yield chunk
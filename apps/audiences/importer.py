@@ -0,0 +1,472 @@
+import re
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from apps.attribute_values.models import AttributeValue
+from apps.attributes.models import Attribute
+from apps.audiences.audience_labels import sync_audience_labels
+from apps.audiences.models import Audience, AudienceImportJob
+from apps.audiences.serializers import AudienceImportSerializer
+from apps.labels.models import Label
+from apps.segments.membership import refresh_segment_members
+
+
+DEFAULT_IMPORT_JOB_CHUNK_SIZE = 1000
+MAX_IMPORT_JOB_CHUNK_SIZE = 10000
+# Failed rows kept on a job for the status endpoint; audience_import_jobs_failed
+# still counts all of them
+MAX_IMPORT_JOB_FAILURES = 1000
+# Per-row details returned by a file upload import; later rows are only counted
+MAX_IMPORT_FILE_DETAILS = 1000
+ATTRIBUTE_VALUE_BATCH_SIZE = 5000
+
+# Values of the import 'details' option
+IMPORT_DETAIL_MODES = ('full', 'errors_only', 'none')
+
+
+# Gets or creates the labels named in the payload.
+# Returns a lower-cased label name -> labels_id map.
+def resolve_import_labels(audiences_data):
+    existing_labels_cache = {}
+
+    # Get all label names to create missing ones
+    label_names = set()
+    for audience_data in audiences_data:
+        labels = audience_data.get('audiences_labels', [])
+        for label_name in labels:
+            if isinstance(label_name, str) and label_name.strip():
+                label_names.add(label_name.strip().lower())
+
+    # Get or create labels
+    if label_names:
+        existing_labels = Label.objects.filter(
+            labels_name__in=[name.title() for name in label_names],
+            labels_is_deleted=False
+        )
+        for label in existing_labels:
+            existing_labels_cache[label.labels_name.lower()] = label.labels_id
+
+        # Create missing labels
+        existing_label_names = {name.lower() for name in existing_labels_cache.keys()}
+        new_labels_to_create = []
+
+        for label_name in label_names:
+            if label_name not in existing_label_names:
+                # Create new label
+                label = Label(
+                    labels_name=label_name.title(),
+                    labels_created_by=None,
+                    labels_is_active=True
+                )
+                new_labels_to_create.append(label)
+
+        if new_labels_to_create:
+            Label.objects.bulk_create(new_labels_to_create)
+            # Update cache with new labels
+            new_labels = Label.objects.filter(
+                labels_name__in=[l.labels_name for l in new_labels_to_create],
+                labels_is_deleted=False
+            )
+            for label in new_labels:
+                existing_labels_cache[label.labels_name.lower()] = label.labels_id
+
+    return existing_labels_cache
+
+
+# Gets or creates the attributes named in the payload.
+# Returns a lower-cased attribute name -> Attribute map.
+def resolve_import_attributes(audiences_data):
+    existing_attributes_cache = {}
+
+    # Get all attribute names to create missing ones
+    attribute_names = set()
+    for audience_data in audiences_data:
+        attributes = audience_data.get('audiences_attributes', {})
+        for attr_name in attributes.keys():
+            if isinstance(attr_name, str) and attr_name.strip():
+                attribute_names.add(attr_name.strip().lower())
+
+    # Get or create attributes
+    if attribute_names:
+        existing_attrs = Attribute.objects.filter(
+            attributes_name__in=[name.title() for name in attribute_names],
+            attributes_is_deleted=False
+        )
+        for attr in existing_attrs:
+            existing_attributes_cache[attr.attributes_name.lower()] = attr
+
+        # Create missing attributes
+        existing_attr_names = {name.lower() for name in existing_attributes_cache.keys()}
+        new_attrs_to_create = []
+
+        for attr_name in attribute_names:
+            if attr_name not in existing_attr_names:
+                # Create new attribute
+                attr = Attribute(
+                    attributes_name=attr_name.title(),
+                    attributes_created_by=None,
+                    attributes_is_active=True
+                )
+                new_attrs_to_create.append(attr)
+
+        if new_attrs_to_create:
+            Attribute.objects.bulk_create(new_attrs_to_create)
+            # Update cache with new attributes
+            new_attrs = Attribute.objects.filter(
+                attributes_name__in=[a.attributes_name for a in new_attrs_to_create],
+                attributes_is_deleted=False
+            )
+            for attr in new_attrs:
+                existing_attributes_cache[attr.attributes_name.lower()] = attr
+
+    return existing_attributes_cache
+
+
+# Maps a row's label names to label IDs, looking up names missing from the cache.
+def resolve_row_label_ids(label_names_input, existing_labels_cache):
+    label_ids = []
+    for label_name in label_names_input:
+        if isinstance(label_name, str) and label_name.strip():
+            label_key = label_name.strip().lower()
+            if label_key in existing_labels_cache:
+                label_ids.append(existing_labels_cache[label_key])
+            else:
+                # Try to find label by name (case-insensitive)
+                try:
+                    label = Label.objects.get(
+                        labels_name__iexact=label_name.strip(),
+                        labels_is_deleted=False,
+                        labels_is_active=True
+                    )
+                    label_ids.append(label.labels_id)
+                    existing_labels_cache[label_key] = label.labels_id
+                except Label.DoesNotExist:
+                    # Skip this label if not found
+                    pass
+
+    return label_ids
+
+
+# Imports a list of audience rows: creates missing labels and attributes, then
+# creates or updates audiences by phone number. Used by the import endpoint for
+# the whole payload and by the import job worker for each chunk; index_offset
+# keeps detail indexes relative to the full payload.
+def run_audience_import(audiences_data, skip_existing=True, index_offset=0):
+    results = {
+        "summary": {
+            "total": len(audiences_data),
+            "created": 0,
+            "updated": 0,
+            "skipped": 0,
+            "failed": 0
+        },
+        "details": []
+    }
+
+    # Batch phone numbers to check existing audiences
+    phone_numbers = []
+    for audience_data in audiences_data:
+        phone = audience_data.get('audiences_phone_number')
+        if phone:
+            phone = re.sub(r'[+\s\-()]', '', phone)
+            phone_numbers.append(phone)
+
+    # Get existing audiences by phone number
+    existing_audiences = {}
+    if phone_numbers:
+        existing_auds = Audience.objects.filter(
+            audiences_phone_number__in=phone_numbers,
+            audiences_is_deleted=False
+        )
+        for aud in existing_auds:
+            existing_audiences[aud.audiences_phone_number] = aud
+
+    # Get or create labels and attributes used by the payload
+    existing_labels_cache = resolve_import_labels(audiences_data)
+    existing_attributes_cache = resolve_import_attributes(audiences_data)
+
+    # Process each audience
+    audiences_to_create = []
+    # Input row position of each entry in audiences_to_create
+    created_row_positions = []
+    audiences_to_update = []
+    # (audience, is_new, [(attribute, value), ...]) for every imported row
+    audience_attributes = []
+
+    for index, audience_data in enumerate(audiences_data):
+        detail = {
+            "index": index_offset + index,
+            "phone_number": audience_data.get('audiences_phone_number'),
+            "status": "pending",
+            "message": "",
+            "audience_id": None
+        }
+
+        try:
+            # Validate the data
+            serializer = AudienceImportSerializer(data=audience_data)
+            if not serializer.is_valid():
+                error_msg = list(serializer.errors.values())[0][0] if serializer.errors else "Invalid data"
+                detail["status"] = "failed"
+                detail["message"] = f"Validation error: {error_msg}"
+                results["summary"]["failed"] += 1
+                results["details"].append(detail)
+                continue
+
+            validated_data = serializer.validated_data
+            phone_number = validated_data['audiences_phone_number']
+
+            # Check if audience exists
+            existing_audience = existing_audiences.get(phone_number)
+
+            if existing_audience and skip_existing:
+                # Skip existing audience
+                detail["status"] = "skipped"
+                detail["message"] = "Audience already exists and skip_existing is true"
+                detail["audience_id"] = existing_audience.audiences_id
+                results["summary"]["skipped"] += 1
+                results["details"].append(detail)
+                continue
+
+            # Process labels
+            label_ids = resolve_row_label_ids(validated_data.get('audiences_labels', []), existing_labels_cache)
+
+            # Process attributes, keeping each row's own values
+            attributes_input = validated_data.get('audiences_attributes', {})
+            row_attributes = []
+            for attr_name, attr_value in attributes_input.items():
+                attr_key = attr_name.strip().lower()
+                if attr_key in existing_attributes_cache:
+                    row_attributes.append((existing_attributes_cache[attr_key], str(attr_value)))
+
+            if existing_audience:
+                # Update existing audience
+                audience = existing_audience
+                audience.audiences_name = validated_data['audiences_name']
+                audience.audiences_email = validated_data.get('audiences_email', audience.audiences_email)
+                audience.audiences_source = validated_data.get('audiences_source', audience.audiences_source)
+                audience.audiences_opted = validated_data.get('audiences_opted', audience.audiences_opted)
+
+                # Merge labels (add new ones, keep existing)
+                existing_labels = set(audience.audiences_labels or [])
+                new_labels = set(label_ids)
+                audience.audiences_labels = list(existing_labels.union(new_labels))
+
+                audience.audiences_is_active = validated_data.get('audiences_is_active', audience.audiences_is_active)
+                audience.audiences_last_active = timezone.now()
+                audience.audiences_updated_by = None
+
+                audiences_to_update.append(audience)
+                detail["status"] = "updated"
+                detail["audience_id"] = audience.audiences_id
+                results["summary"]["updated"] += 1
+
+                if row_attributes:
+                    audience_attributes.append((audience, False, row_attributes))
+
+            else:
+                # Create new audience
+                audience = Audience(
+                    audiences_name=validated_data['audiences_name'],
+                    audiences_phone_number=phone_number,
+                    audiences_email=validated_data.get('audiences_email'),
+                    audiences_source=validated_data.get('audiences_source', 'imported'),
+                    audiences_opted=validated_data.get('audiences_opted', 'in'),
+                    audiences_labels=label_ids,
+                    audiences_last_active=timezone.now(),
+                    audiences_created_by=None,
+                    audiences_is_active=validated_data.get('audiences_is_active', True)
+                )
+                audiences_to_create.append(audience)
+                created_row_positions.append(index)
+                if row_attributes:
+                    audience_attributes.append((audience, True, row_attributes))
+                detail["status"] = "created"
+                results["summary"]["created"] += 1
+
+        except Exception as e:
+            detail["status"] = "failed"
+            detail["message"] = str(e)
+            results["summary"]["failed"] += 1
+
+        results["details"].append(detail)
+
+    # Batch create/update operations
+    if audiences_to_create:
+        Audience.objects.bulk_create(audiences_to_create)
+        # Update detail records with created IDs; details holds one entry per input row
+        for position, audience in zip(created_row_positions, audiences_to_create):
+            results["details"][position]["audience_id"] = audience.audiences_id
+
+    if audiences_to_update:
+        Audience.objects.bulk_update(
+            audiences_to_update,
+            [
+                'audiences_name', 'audiences_email', 'audiences_source',
+                'audiences_opted', 'audiences_labels', 'audiences_is_active',
+                'audiences_last_active', 'audiences_updated_by', 'audiences_updated_at'
+            ]
+        )
+
+    sync_audience_labels(audiences_to_create + audiences_to_update)
+
+    # Attribute values for created and updated audiences
+    upsert_attribute_values(audience_attributes)
+
+    refresh_segment_members(audience.audiences_id for audience in audiences_to_create + audiences_to_update)
+
+    return results
+
+
+# Trims per-row details for the import response: 'full' keeps every row,
+# 'errors_only' keeps failed rows and 'none' drops them.
+def filter_import_details(details, details_mode):
+    if details_mode == 'none':
+        return []
+    if details_mode == 'errors_only':
+        return [detail for detail in details if detail["status"] == "failed"]
+    return details
+
+
+# Writes imported attribute values with one prefetch of the existing
+# (audience, attribute) pairs, an in-memory diff and batched bulk writes,
+# so the number of queries does not grow with the number of rows.
+def upsert_attribute_values(audience_attributes, batch_size=ATTRIBUTE_VALUE_BATCH_SIZE):
+    # Last value wins when the same audience and attribute appear more than once
+    wanted = {}
+    existing_audience_ids = set()
+    for audience, is_new, row_attributes in audience_attributes:
+        if not is_new:
+            existing_audience_ids.add(audience.audiences_id)
+        for attribute, value in row_attributes:
+            wanted[(audience.audiences_id, attribute.attributes_id)] = (audience, attribute, value)
+
+    if not wanted:
+        return
+
+    # Only audiences that existed before this import can already have values
+    existing_values = {}
+    if existing_audience_ids:
+        attribute_values = AttributeValue.objects.filter(
+            attribute_values_audiences_id__in=existing_audience_ids,
+            attribute_values_attributes_id__in={key[1] for key in wanted},
+            attribute_values_is_deleted=False
+        )
+        for attr_value_obj in attribute_values:
+            key = (attr_value_obj.attribute_values_audiences_id_id, attr_value_obj.attribute_values_attributes_id_id)
+            existing_values.setdefault(key, attr_value_obj)
+
+    now = timezone.now()
+    attribute_values_to_create = []
+    attribute_values_to_update = []
+    for key, (audience, attribute, value) in wanted.items():
+        attr_value_obj = existing_values.get(key)
+        if attr_value_obj is None:
+            attribute_values_to_create.append(AttributeValue(
+                attribute_values_attributes_id=attribute,
+                attribute_values_audiences_id=audience,
+                attribute_values_value=value,
+                attribute_values_created_by=None
+            ))
+        elif attr_value_obj.attribute_values_value != value:
+            attr_value_obj.attribute_values_value = value
+            attr_value_obj.attribute_values_updated_by = None
+            attr_value_obj.attribute_values_updated_at = now
+            attribute_values_to_update.append(attr_value_obj)
+
+    if attribute_values_to_create:
+        AttributeValue.objects.bulk_create(attribute_values_to_create, batch_size=batch_size)
+
+    if attribute_values_to_update:
+        AttributeValue.objects.bulk_update(
+            attribute_values_to_update,
+            ['attribute_values_value', 'attribute_values_updated_by', 'attribute_values_updated_at'],
+            batch_size=batch_size
+        )
+
+
+# Takes the oldest pending import job, or a running one whose worker stopped
+# updating it for stale_after seconds, and marks it as running.
+def claim_next_import_job(stale_after=600):
+    now = timezone.now()
+    with transaction.atomic():
+        job = AudienceImportJob.objects.select_for_update(skip_locked=True).filter(
+            Q(audience_import_jobs_status='pending') |
+            Q(
+                audience_import_jobs_status='running',
+                audience_import_jobs_updated_at__lt=now - timedelta(seconds=stale_after)
+            )
+        ).order_by('audience_import_jobs_created_at').first()
+
+        if job:
+            job.audience_import_jobs_status = 'running'
+            job.audience_import_jobs_started_at = job.audience_import_jobs_started_at or now
+            job.save(update_fields=[
+                'audience_import_jobs_status', 'audience_import_jobs_started_at', 'audience_import_jobs_updated_at'
+            ])
+    return job
+
+
+# Processes a claimed import job chunk by chunk. Each chunk and its progress
+# counters are committed together, so a restarted worker resumes after the
+# last committed chunk. The job row stays locked while a chunk runs, which
+# keeps claim_next_import_job from handing a slow chunk to another worker, and
+# every committed chunk refreshes audience_import_jobs_updated_at.
+def process_import_job(job):
+    payload = job.audience_import_jobs_payload or []
+    chunk_size = job.audience_import_jobs_chunk_size or DEFAULT_IMPORT_JOB_CHUNK_SIZE
+
+    try:
+        while job.audience_import_jobs_processed < len(payload):
+            start = job.audience_import_jobs_processed
+            chunk = payload[start:start + chunk_size]
+
+            with transaction.atomic():
+                locked_job = AudienceImportJob.objects.select_for_update().get(
+                    audience_import_jobs_id=job.audience_import_jobs_id
+                )
+                # Another worker reclaimed the job and has moved it on
+                if (
+                    locked_job.audience_import_jobs_status != 'running'
+                    or locked_job.audience_import_jobs_processed != start
+                ):
+                    return locked_job
+
+                results = run_audience_import(chunk, job.audience_import_jobs_skip_existing, index_offset=start)
+                summary = results["summary"]
+
+                job.audience_import_jobs_created += summary["created"]
+                job.audience_import_jobs_updated += summary["updated"]
+                job.audience_import_jobs_skipped += summary["skipped"]
+                job.audience_import_jobs_failed += summary["failed"]
+                update_fields = [
+                    'audience_import_jobs_created', 'audience_import_jobs_updated',
+                    'audience_import_jobs_skipped', 'audience_import_jobs_failed',
+                    'audience_import_jobs_processed', 'audience_import_jobs_updated_at'
+                ]
+
+                # Only the first MAX_IMPORT_JOB_FAILURES failures are stored, so
+                # the JSON rewritten per chunk stays bounded
+                room = MAX_IMPORT_JOB_FAILURES - len(job.audience_import_jobs_failures)
+                if room > 0 and summary["failed"]:
+                    failures = [detail for detail in results["details"] if detail["status"] == "failed"]
+                    job.audience_import_jobs_failures.extend(failures[:room])
+                    update_fields.append('audience_import_jobs_failures')
+
+                job.audience_import_jobs_processed = start + len(chunk)
+                job.save(update_fields=update_fields)
+
+        job.audience_import_jobs_status = 'completed'
+    except Exception as e:
+        job.audience_import_jobs_status = 'failed'
+        job.audience_import_jobs_error = str(e)
+
+    job.audience_import_jobs_finished_at = timezone.now()
+    job.save(update_fields=[
+        'audience_import_jobs_status', 'audience_import_jobs_error',
+        'audience_import_jobs_finished_at', 'audience_import_jobs_updated_at'
+    ])
+    return job
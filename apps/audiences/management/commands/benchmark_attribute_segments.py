@@ -0,0 +1,126 @@
+import statistics
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.http import QueryDict
+
+from apps.audiences.filters import filter_audiences
+from apps.audiences.pagination import paginate_audiences_by_cursor
+
+
+# (name, values) of the synthetic attributes; audience n gets value
+# n % len(values) of each, offset per attribute so the values are independent
+BENCHMARK_ATTRIBUTES = [
+    ('City', ['Pune', 'Mumbai', 'Delhi', 'Bengaluru', 'Chennai', 'Hyderabad', 'Kolkata', 'Jaipur', 'Nagpur', 'Surat']),
+    ('Plan', ['Gold', 'Silver', 'Bronze', 'Free']),
+    ('Language', ['Marathi', 'Hindi', 'English', 'Tamil', 'Telugu', 'Bengali', 'Gujarati']),
+    ('Gender', ['Female', 'Male', 'Other']),
+    ('Age Band', ['18-24', '25-34', '35-44', '45-54', '55+']),
+    ('Channel', ['Website', 'Store', 'Referral', 'Ads', 'Event', 'Partner']),
+    ('Loyalty Tier', ['L1', 'L2', 'L3', 'L4', 'L5', 'L6', 'L7', 'L8']),
+    ('Device', ['Android', 'iOS', 'Desktop']),
+    ('Payment', ['UPI', 'Card', 'Cash', 'Net Banking', 'Wallet']),
+    ('Pincode', [str(411000 + offset) for offset in range(1000)]),
+]
+DEFAULT_SEGMENTS = [
+    'attribute=City:Pune',
+    'attribute=City:Pune&attribute=Plan:Gold,Silver',
+    'attribute=City:Pune&attribute=Plan:Gold&attribute=Language:Marathi',
+    'attribute=Pincode:411001',
+]
+SEGMENT_MODES = ('no-index', 'index')
+PAGE_SIZE = 50
+
+
+# Times attribute segment filters on synthetic audiences with one value for
+# each of the benchmark attributes: the segment size (count) and the first
+# cursor page of the list endpoint, with index scans disabled and on the
+# attribute_values_segment_idx index. Rows are inserted inside a transaction
+# that is rolled back.
+class Command(BaseCommand):
+    help = "Benchmark attribute segment filters on the audiences list"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=1000000)
+        parser.add_argument('--repeat', type=int, default=5)
+        parser.add_argument('--segments', nargs='+', default=DEFAULT_SEGMENTS, help="Query strings of attribute filters")
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'postgresql':
+            raise CommandError("The benchmark needs a PostgreSQL database")
+
+        with transaction.atomic():
+            self.insert_rows(options['rows'])
+            self.stdout.write(f"{'mode':<9} {'count':>8} {'count ms':>9} {'page ms':>8}  segment")
+            for segment in options['segments']:
+                for mode in SEGMENT_MODES:
+                    count, count_elapsed, page_elapsed = self.run_segment(mode, segment, options['repeat'])
+                    self.stdout.write(
+                        f"{mode:<9} {count:>8} {count_elapsed * 1000:>9.2f} {page_elapsed * 1000:>8.2f}  {segment}"
+                    )
+            transaction.set_rollback(True)
+
+    def insert_rows(self, row_count):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                """
+                INSERT INTO audiences (
+                    audiences_name, audiences_phone_number, audiences_labels,
+                    audiences_is_active, audiences_is_deleted, audiences_created_at, audiences_updated_at
+                )
+                SELECT 'Benchmark ' || n, 'bench' || n, '[]'::jsonb, TRUE, FALSE,
+                       NOW() - n * INTERVAL '1 second', NOW()
+                FROM generate_series(1, %s) AS n
+                """,
+                [row_count]
+            )
+            for position, (name, values) in enumerate(BENCHMARK_ATTRIBUTES):
+                cursor.execute(
+                    """
+                    INSERT INTO attributes (
+                        attributes_name, attributes_is_active, attributes_is_deleted,
+                        attributes_created_at, attributes_updated_at
+                    )
+                    VALUES (%s, TRUE, FALSE, NOW(), NOW())
+                    RETURNING attributes_id
+                    """,
+                    [name]
+                )
+                attributes_id = cursor.fetchone()[0]
+                cursor.execute(
+                    """
+                    INSERT INTO attribute_values (
+                        attribute_values_attributes_id, attribute_values_audiences_id, attribute_values_value,
+                        attribute_values_is_deleted, attribute_values_created_at, attribute_values_updated_at
+                    )
+                    SELECT %s, audiences_id, (%s::text[])[1 + (audiences_id / %s) %% %s], FALSE, NOW(), NOW()
+                    FROM audiences
+                    WHERE audiences_name LIKE 'Benchmark %%'
+                    """,
+                    [attributes_id, values, position + 1, len(values)]
+                )
+            cursor.execute("ANALYZE audiences")
+            cursor.execute("ANALYZE attributes")
+            cursor.execute("ANALYZE attribute_values")
+
+    def run_segment(self, mode, segment, repeat):
+        audiences = filter_audiences(QueryDict(segment))
+
+        with connection.cursor() as cursor:
+            index_scans = 'off' if mode == 'no-index' else 'on'
+            cursor.execute(f"SET LOCAL enable_indexscan = {index_scans}")
+            cursor.execute(f"SET LOCAL enable_indexonlyscan = {index_scans}")
+            cursor.execute(f"SET LOCAL enable_bitmapscan = {index_scans}")
+
+        count_timings = []
+        page_timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            count = audiences.count()
+            count_timings.append(time.perf_counter() - started)
+
+            started = time.perf_counter()
+            paginate_audiences_by_cursor(audiences, None, PAGE_SIZE)
+            page_timings.append(time.perf_counter() - started)
+        return count, statistics.median(count_timings), statistics.median(page_timings)
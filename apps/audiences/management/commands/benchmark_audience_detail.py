@@ -0,0 +1,98 @@
+import time
+from contextlib import contextmanager
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import close_old_connections, connection
+from django.test import Client
+from django.urls import reverse
+
+from apps.audiences.models import Audience
+
+
+CONNECTION_MODES = ('new', 'persistent', 'pool')
+
+
+# Reports p50/p99 latency of GET audience/<id>/ when every request opens a new
+# database connection, when connections are kept open (CONN_MAX_AGE) and when
+# they come from psycopg's pool. Requests go through the full Django stack in
+# process; the test client skips the end-of-request connection cleanup, so it
+# is run after every request as a worker would.
+class Command(BaseCommand):
+    help = "Benchmark GET audience/<id>/ latency with and without connection reuse"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=500)
+        parser.add_argument('--modes', nargs='+', choices=CONNECTION_MODES, default=['new', 'persistent'])
+        parser.add_argument('--audience-id', type=int, help="Existing audience to fetch; a temporary one is created otherwise")
+        parser.add_argument('--conn-max-age', type=int, default=600, help="CONN_MAX_AGE used by the persistent mode")
+        parser.add_argument('--host', default='localhost', help="Host header, must be in ALLOWED_HOSTS")
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'postgresql':
+            raise CommandError("The benchmark needs a PostgreSQL database")
+        if 'pool' in options['modes'] and not self.pool_available():
+            raise CommandError("The pool mode needs psycopg[pool] (psycopg 3)")
+
+        audience = None
+        audience_id = options['audience_id']
+        if audience_id is None:
+            audience = Audience.objects.create(audiences_name="Benchmark", audiences_phone_number="0000000000")
+            audience_id = audience.audiences_id
+
+        try:
+            url = reverse('audience-detail', args=[audience_id])
+            client = Client(SERVER_NAME=options['host'])
+            self.stdout.write(f"{'mode':<11} {'requests':>8} {'p50 ms':>8} {'p99 ms':>8}")
+            for mode in options['modes']:
+                with self.connection_mode(mode, options['conn_max_age']):
+                    latencies = self.run_requests(client, url, options['requests'])
+                p50 = latencies[len(latencies) // 2] * 1000
+                p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1000
+                self.stdout.write(f"{mode:<11} {options['requests']:>8} {p50:>8.2f} {p99:>8.2f}")
+        finally:
+            if audience is not None:
+                audience.delete()
+
+    def pool_available(self):
+        try:
+            import psycopg_pool  # noqa: F401
+            from django.db.backends.postgresql.psycopg_any import is_psycopg3
+        except ImportError:
+            return False
+        return is_psycopg3
+
+    # Switches the default connection to one of CONNECTION_MODES and restores
+    # the configured settings afterwards
+    @contextmanager
+    def connection_mode(self, mode, conn_max_age):
+        settings_dict = connection.settings_dict
+        configured = (settings_dict['CONN_MAX_AGE'], settings_dict['OPTIONS'])
+        options = {key: value for key, value in configured[1].items() if key != 'pool'}
+        if mode == 'pool':
+            options['pool'] = configured[1].get('pool') or True
+
+        connection.close()
+        connection.close_pool()
+        settings_dict['CONN_MAX_AGE'] = conn_max_age if mode == 'persistent' else 0
+        settings_dict['OPTIONS'] = options
+        try:
+            yield
+        finally:
+            connection.close()
+            connection.close_pool()
+            settings_dict['CONN_MAX_AGE'], settings_dict['OPTIONS'] = configured
+
+    def run_requests(self, client, url, request_count):
+        # One warm-up request so the first connection is not counted
+        client.get(url)
+        close_old_connections()
+
+        latencies = []
+        for _ in range(request_count):
+            started = time.perf_counter()
+            response = client.get(url)
+            close_old_connections()
+            latencies.append(time.perf_counter() - started)
+            if response.status_code != 200:
+                raise CommandError(f"GET {url} returned {response.status_code}")
+        return sorted(latencies)
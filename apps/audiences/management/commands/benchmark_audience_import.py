@@ -0,0 +1,60 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from apps.audiences.copy_import import copy_import_available, run_audience_copy_import
+from apps.audiences.importer import run_audience_import
+
+
+IMPORT_MODES = {
+    'orm': run_audience_import,
+    'copy': run_audience_copy_import,
+}
+
+
+# Compares rows/sec of the ORM and COPY import paths on synthetic audiences.
+# Every run happens inside a transaction that is rolled back, so the database
+# is left unchanged.
+class Command(BaseCommand):
+    help = "Benchmark the ORM and COPY audience import paths"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, nargs='+', default=[10000, 100000, 1000000])
+        parser.add_argument('--modes', nargs='+', choices=list(IMPORT_MODES), default=list(IMPORT_MODES))
+        parser.add_argument('--attributes', type=int, default=3, help="Attributes per audience")
+        parser.add_argument('--existing', action='store_true', help="Import each batch twice and time the update pass")
+
+    def handle(self, *args, **options):
+        if 'copy' in options['modes'] and not copy_import_available():
+            raise CommandError("The copy mode needs a PostgreSQL database")
+
+        self.stdout.write(f"{'mode':<6} {'rows':>9} {'seconds':>9} {'rows/sec':>10}")
+        for row_count in options['rows']:
+            audiences_data = self.build_rows(row_count, options['attributes'])
+            for mode in options['modes']:
+                elapsed = self.run_once(IMPORT_MODES[mode], audiences_data, options['existing'])
+                self.stdout.write(f"{mode:<6} {row_count:>9} {elapsed:>9.2f} {row_count / elapsed:>10.0f}")
+
+    def build_rows(self, row_count, attribute_count):
+        return [
+            {
+                "audiences_name": f"Benchmark {index}",
+                "audiences_phone_number": f"9{index:09d}",
+                "audiences_labels": ["benchmark"],
+                "audiences_attributes": {
+                    f"Benchmark {attr}": f"value {index % 100}" for attr in range(attribute_count)
+                },
+            }
+            for index in range(row_count)
+        ]
+
+    def run_once(self, import_func, audiences_data, existing):
+        with transaction.atomic():
+            if existing:
+                import_func(audiences_data, skip_existing=False)
+            started = time.perf_counter()
+            import_func(audiences_data, skip_existing=False)
+            elapsed = time.perf_counter() - started
+            transaction.set_rollback(True)
+        return elapsed
@@ -0,0 +1,82 @@
+import statistics
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+
+from apps.audiences.models import Audience
+from apps.audiences.search import DEFAULT_SEARCH_LIMIT, search_audiences
+
+
+FIRST_NAMES = [
+    'Aarav', 'Aditi', 'Akash', 'Ananya', 'Arjun', 'Deepak', 'Divya', 'Isha', 'Karan', 'Kavya',
+    'Manish', 'Meera', 'Neha', 'Nikhil', 'Pooja', 'Priya', 'Rahul', 'Riya', 'Rohan', 'Sneha',
+]
+LAST_NAMES = [
+    'Agarwal', 'Bhat', 'Chopra', 'Desai', 'Gupta', 'Iyer', 'Jain', 'Joshi', 'Kapoor', 'Kulkarni',
+    'Kumar', 'Mehta', 'Menon', 'Nair', 'Patel', 'Pillai', 'Rao', 'Reddy', 'Shah', 'Sharma',
+]
+DEFAULT_QUERIES = ['Priya Sharma', 'priya sharma 1234', 'priya', 'Kulkarny', 'rohan.kumar99', '90001', '9000 12 34']
+
+
+# Times q= searches against synthetic audiences with realistic names, emails
+# and phone numbers (a quarter of them typed with a space). Rows are inserted
+# inside a transaction that is rolled back.
+class Command(BaseCommand):
+    help = "Benchmark the audience q= search"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=1000000)
+        parser.add_argument('--repeat', type=int, default=5)
+        parser.add_argument('--queries', nargs='+', default=DEFAULT_QUERIES)
+        parser.add_argument('--limit', type=int, default=DEFAULT_SEARCH_LIMIT)
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'postgresql':
+            raise CommandError("The benchmark needs a PostgreSQL database")
+
+        with transaction.atomic():
+            self.insert_rows(options['rows'])
+            self.stdout.write(f"{'query':<20} {'results':>7} {'median ms':>10}  top match")
+            for query in options['queries']:
+                results, elapsed = self.run_search(query, options['limit'], options['repeat'])
+                top_match = results[0].audiences_name if results else '-'
+                self.stdout.write(f"{query:<20} {len(results):>7} {elapsed * 1000:>10.2f}  {top_match}")
+            transaction.set_rollback(True)
+
+    def insert_rows(self, row_count):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                """
+                INSERT INTO audiences (
+                    audiences_name, audiences_email, audiences_phone_number, audiences_labels,
+                    audiences_is_active, audiences_is_deleted, audiences_created_at, audiences_updated_at
+                )
+                SELECT first_name || ' ' || last_name || ' ' || n,
+                       lower(first_name) || '.' || lower(last_name) || n || '@example.com',
+                       CASE WHEN n %% 4 = 0 THEN substr(digits, 1, 5) || ' ' || substr(digits, 6) ELSE digits END,
+                       '[]'::jsonb, TRUE, FALSE, NOW(), NOW()
+                FROM (
+                    SELECT n,
+                           (%s::text[])[1 + n %% %s] AS first_name,
+                           (%s::text[])[1 + (n / %s) %% %s] AS last_name,
+                           (9000000000 + n)::text AS digits
+                    FROM generate_series(1, %s) AS n
+                ) AS rows
+                """,
+                [
+                    FIRST_NAMES, len(FIRST_NAMES),
+                    LAST_NAMES, len(FIRST_NAMES), len(LAST_NAMES),
+                    row_count
+                ]
+            )
+            cursor.execute("ANALYZE audiences")
+
+    def run_search(self, query, limit, repeat):
+        audiences = Audience.objects.filter(audiences_is_deleted=False)
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            results = search_audiences(audiences, query, limit)
+            timings.append(time.perf_counter() - started)
+        return results, statistics.median(timings)
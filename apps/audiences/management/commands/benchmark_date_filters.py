@@ -0,0 +1,87 @@
+import statistics
+import time
+from datetime import date, timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+
+from apps.audiences.models import Audience
+from apps.common.filters import DateRangeFilter
+
+
+BENCHMARK_START_DATE = date(2024, 1, 1)
+BENCHMARK_DAYS = 730
+DATE_FILTER_MODES = ('date', 'range-no-index', 'range')
+
+
+# Compares the created_at filter before and after the filter engine on
+# synthetic audiences: the old __date lookups, the half-open range with index
+# scans disabled (as before the index existed) and the half-open range on the
+# index. Rows are inserted inside a transaction that is rolled back.
+class Command(BaseCommand):
+    help = "Benchmark created_at date filters on the audiences table"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=1000000)
+        parser.add_argument('--repeat', type=int, default=5)
+        parser.add_argument('--days', type=int, nargs='+', default=[1, 30], help="Lengths of the filtered ranges")
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'postgresql':
+            raise CommandError("The benchmark needs a PostgreSQL database")
+
+        with transaction.atomic():
+            self.insert_rows(options['rows'])
+            self.stdout.write(f"{'mode':<15} {'days':>5} {'rows':>8} {'median ms':>10}  plan")
+            for days in options['days']:
+                end_date = BENCHMARK_START_DATE + timedelta(days=BENCHMARK_DAYS // 2)
+                start_date = end_date - timedelta(days=days - 1)
+                for mode in DATE_FILTER_MODES:
+                    count, elapsed, plan = self.run_filter(mode, start_date, end_date, options['repeat'])
+                    self.stdout.write(f"{mode:<15} {days:>5} {count:>8} {elapsed * 1000:>10.2f}  {plan}")
+            transaction.set_rollback(True)
+
+    # Spreads the rows evenly over BENCHMARK_DAYS days
+    def insert_rows(self, row_count):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                """
+                INSERT INTO audiences (
+                    audiences_name, audiences_phone_number, audiences_labels,
+                    audiences_is_active, audiences_is_deleted, audiences_created_at, audiences_updated_at
+                )
+                SELECT 'Benchmark ' || n, 'bench' || n, '[]'::jsonb, TRUE, FALSE,
+                       %s::timestamptz + (n::bigint * %s / %s) * INTERVAL '1 second', NOW()
+                FROM generate_series(1, %s) AS n
+                """,
+                [BENCHMARK_START_DATE.isoformat(), BENCHMARK_DAYS * 86400, row_count, row_count]
+            )
+            cursor.execute("ANALYZE audiences")
+
+    def run_filter(self, mode, start_date, end_date, repeat):
+        audiences = Audience.objects.filter(audiences_is_deleted=False)
+        if mode == 'date':
+            audiences = audiences.filter(
+                audiences_created_at__date__gte=start_date,
+                audiences_created_at__date__lte=end_date
+            )
+        else:
+            audiences = DateRangeFilter('created_at', 'audiences_created_at').apply(
+                audiences, f"{start_date} to {end_date}"
+            )
+
+        with connection.cursor() as cursor:
+            index_scans = 'off' if mode == 'range-no-index' else 'on'
+            cursor.execute(f"SET LOCAL enable_indexscan = {index_scans}")
+            cursor.execute(f"SET LOCAL enable_bitmapscan = {index_scans}")
+
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            count = audiences.count()
+            timings.append(time.perf_counter() - started)
+        scans = [
+            line.strip().lstrip('->').strip().split('  (')[0]
+            for line in audiences.explain().splitlines() if ' Scan ' in line
+        ]
+        return count, statistics.median(timings), ', '.join(scans)
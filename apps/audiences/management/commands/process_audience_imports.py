@@ -0,0 +1,33 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from apps.audiences.importer import claim_next_import_job, process_import_job
+
+
+# Worker for queued audience imports. Polls the audience_import_jobs table and
+# processes one job at a time; several workers can run side by side.
+class Command(BaseCommand):
+    help = "Process queued audience import jobs in chunks"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true', help="Process the queued jobs and exit instead of polling")
+        parser.add_argument('--poll-interval', type=float, default=5, help="Seconds to wait when the queue is empty")
+        parser.add_argument('--stale-after', type=int, default=600, help="Seconds after which a running job is reclaimed")
+
+    def handle(self, *args, **options):
+        while True:
+            job = claim_next_import_job(stale_after=options['stale_after'])
+            if job is None:
+                if options['once']:
+                    return
+                time.sleep(options['poll_interval'])
+                continue
+
+            self.stdout.write(f"Processing audience import job {job.audience_import_jobs_id}")
+            job = process_import_job(job)
+            self.stdout.write(
+                f"Audience import job {job.audience_import_jobs_id} {job.audience_import_jobs_status}: "
+                f"created={job.audience_import_jobs_created} updated={job.audience_import_jobs_updated} "
+                f"skipped={job.audience_import_jobs_skipped} failed={job.audience_import_jobs_failed}"
+            )
@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from apps.audiences.audience_labels import SYNC_BATCH_SIZE, write_audience_label_rows
+from apps.audiences.import_files import iter_chunks
+from apps.audiences.models import Audience
+
+
+# Back-fills (or repairs) the audience_labels table from audiences_labels.
+# Run it once before setting AUDIENCE_LABELS_JOIN_TABLE=true.
+class Command(BaseCommand):
+    help = "Rebuild the audience_labels join table from audiences_labels"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=SYNC_BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        audiences = Audience.objects.only('audiences_id', 'audiences_labels').order_by('audiences_id')
+        synced = 0
+        for batch in iter_chunks(audiences.iterator(chunk_size=options['batch_size']), options['batch_size']):
+            with transaction.atomic():
+                write_audience_label_rows(batch)
+            synced += len(batch)
+        self.stdout.write(f"Synced labels for {synced} audiences")
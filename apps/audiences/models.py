@@ -1,4 +1,9 @@
+from django.contrib.postgres.indexes import GinIndex, OpClass
 from django.db import models
+from django.db.models.functions import Upper
+
+from apps.audiences.search import normalized_phone
+from apps.labels.models import Label
 
 # Create your models here.
 
@@ -16,6 +21,15 @@ OPTED_CHOICES = [
 ]
 
 
+# Import job status choices
+IMPORT_JOB_STATUS_CHOICES = [
+    ('pending', 'Pending'),
+    ('running', 'Running'),
+    ('completed', 'Completed'),
+    ('failed', 'Failed'),
+]
+
+
 # Model for Audience
 class Audience(models.Model):
     audiences_id = models.AutoField(primary_key=True)
@@ -34,4 +48,76 @@ class Audience(models.Model):
     audiences_updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
-        db_table = "audiences"
\ No newline at end of file
+        db_table = "audiences"
+        indexes = [
+            models.Index(fields=['audiences_created_at', 'audiences_id'], name='audiences_created_at_id_idx'),
+            models.Index(fields=['audiences_last_active'], name='audiences_last_active_idx'),
+            # Serves audiences_labels @> '[...]' (the __contains lookup) for label filters
+            GinIndex(fields=['audiences_labels'], name='audiences_labels_gin_idx', opclasses=['jsonb_path_ops']),
+            # q= search: case-insensitive substring and trigram matching on name and
+            # email, prefix matching on the digits of the phone number. The trigram
+            # indexes need the pg_trgm extension.
+            GinIndex(OpClass(Upper('audiences_name'), name='gin_trgm_ops'), name='audiences_name_trgm_idx'),
+            GinIndex(OpClass(Upper('audiences_email'), name='gin_trgm_ops'), name='audiences_email_trgm_idx'),
+            models.Index(normalized_phone(), name='audiences_phone_prefix_idx'),
+        ]
+
+
+# Model for AudienceLabel, one row per (audience, label) pair mirroring
+# audiences_labels. Only kept in sync when AUDIENCE_LABELS_JOIN_TABLE is on.
+class AudienceLabel(models.Model):
+    audience_labels_id = models.AutoField(primary_key=True)
+    audience_labels_audiences_id = models.ForeignKey(
+        Audience,
+        to_field="audiences_id",
+        db_column="audience_labels_audiences_id",
+        on_delete=models.CASCADE
+    )
+    audience_labels_labels_id = models.ForeignKey(
+        Label,
+        to_field="labels_id",
+        db_column="audience_labels_labels_id",
+        on_delete=models.CASCADE
+    )
+    audience_labels_created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = "audience_labels"
+        constraints = [
+            models.UniqueConstraint(
+                fields=['audience_labels_audiences_id', 'audience_labels_labels_id'],
+                name='audience_labels_audience_label_uniq'
+            ),
+        ]
+        indexes = [
+            models.Index(fields=['audience_labels_labels_id', 'audience_labels_audiences_id'], name='audience_labels_label_idx'),
+        ]
+
+
+# Model for AudienceImportJob, a queued import processed in chunks by the
+# process_audience_imports management command
+class AudienceImportJob(models.Model):
+    audience_import_jobs_id = models.AutoField(primary_key=True)
+    audience_import_jobs_status = models.CharField(max_length=20, choices=IMPORT_JOB_STATUS_CHOICES, default='pending')
+    audience_import_jobs_payload = models.JSONField(default=list)
+    audience_import_jobs_skip_existing = models.BooleanField(default=True)
+    audience_import_jobs_chunk_size = models.PositiveIntegerField(default=1000)
+    audience_import_jobs_total = models.PositiveIntegerField(default=0)
+    audience_import_jobs_processed = models.PositiveIntegerField(default=0)
+    audience_import_jobs_created = models.PositiveIntegerField(default=0)
+    audience_import_jobs_updated = models.PositiveIntegerField(default=0)
+    audience_import_jobs_skipped = models.PositiveIntegerField(default=0)
+    audience_import_jobs_failed = models.PositiveIntegerField(default=0)
+    audience_import_jobs_failures = models.JSONField(default=list)
+    audience_import_jobs_error = models.TextField(null=True, blank=True)
+    audience_import_jobs_created_by = models.CharField(max_length=255, null=True, blank=True)
+    audience_import_jobs_started_at = models.DateTimeField(null=True, blank=True)
+    audience_import_jobs_finished_at = models.DateTimeField(null=True, blank=True)
+    audience_import_jobs_created_at = models.DateTimeField(auto_now_add=True)
+    audience_import_jobs_updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = "audience_import_jobs"
+        indexes = [
+            models.Index(fields=['audience_import_jobs_status', 'audience_import_jobs_created_at'], name='audience_import_jobs_queue_idx'),
+        ]
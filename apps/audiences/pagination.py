@@ -0,0 +1,85 @@
+import base64
+import json
+
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+
+
+DEFAULT_CURSOR_LIMIT = 50
+MAX_CURSOR_LIMIT = 500
+
+
+# Raised when the cursor token or limit sent by the client cannot be used.
+class CursorPaginationError(ValueError):
+    pass
+
+
+# Opaque cursor token: base64 of the (created_at, id) position and the direction to read in.
+def encode_cursor(audience, direction):
+    payload = json.dumps([audience.audiences_created_at.isoformat(), audience.audiences_id, direction])
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+
+def decode_cursor(token):
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        created_at_str, audiences_id, direction = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        created_at = parse_datetime(created_at_str)
+    except (ValueError, TypeError):
+        raise CursorPaginationError("Invalid cursor")
+
+    if created_at is None or not isinstance(audiences_id, int) or direction not in ('next', 'prev'):
+        raise CursorPaginationError("Invalid cursor")
+    return created_at, audiences_id, direction
+
+
+def parse_cursor_limit(limit_param):
+    if limit_param in (None, ''):
+        return DEFAULT_CURSOR_LIMIT
+    try:
+        limit = int(limit_param)
+    except (ValueError, TypeError):
+        raise CursorPaginationError("limit must be an integer")
+    if limit < 1 or limit > MAX_CURSOR_LIMIT:
+        raise CursorPaginationError(f"limit must be between 1 and {MAX_CURSOR_LIMIT}")
+    return limit
+
+
+# Keyset pagination over audiences ordered by (audiences_created_at, audiences_id).
+# Each page is a range scan from the cursor position, so deep pages cost the same
+# as the first one. Returns (audiences, next_cursor, prev_cursor).
+def paginate_audiences_by_cursor(queryset, cursor, limit):
+    if cursor:
+        created_at, audiences_id, direction = decode_cursor(cursor)
+    else:
+        created_at, audiences_id, direction = None, None, 'next'
+
+    if direction == 'next':
+        if cursor:
+            queryset = queryset.filter(
+                Q(audiences_created_at__gt=created_at) |
+                Q(audiences_created_at=created_at, audiences_id__gt=audiences_id)
+            )
+        queryset = queryset.order_by('audiences_created_at', 'audiences_id')
+    else:
+        queryset = queryset.filter(
+            Q(audiences_created_at__lt=created_at) |
+            Q(audiences_created_at=created_at, audiences_id__lt=audiences_id)
+        ).order_by('-audiences_created_at', '-audiences_id')
+
+    # Fetch one extra row to know whether another page exists in this direction
+    rows = list(queryset[:limit + 1])
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    if direction == 'prev':
+        rows.reverse()
+        has_next = True
+        has_prev = has_more
+    else:
+        has_next = has_more
+        has_prev = bool(cursor)
+
+    next_cursor = encode_cursor(rows[-1], 'next') if rows and has_next else None
+    prev_cursor = encode_cursor(rows[0], 'prev') if rows and has_prev else None
+    return rows, next_cursor, prev_cursor
@@ -0,0 +1,80 @@
+import re
+
+from django.contrib.postgres.search import TrigramWordSimilarity
+from django.db.models import F, Func, Q, Value
+from django.db.models.functions import Collate, Greatest, Upper
+
+from apps.common.filters import FilterError
+
+
+DEFAULT_SEARCH_LIMIT = 20
+MAX_SEARCH_LIMIT = 100
+MIN_SEARCH_LENGTH = 3
+# Audiences containing the query that are ranked. Bounds the ranking work when
+# a common name is contained in tens of thousands of audiences.
+SEARCH_POOL_SIZE = 500
+# Digits with the separators people type in phone numbers
+PHONE_QUERY_RE = re.compile(r'^[\d\s+().-]+$')
+
+
+# audiences_phone_number with everything but digits removed, in the "C"
+# collation so a b-tree index on it serves both prefix matches and ordering.
+# The audiences_phone_prefix_idx index is built on this same expression.
+def normalized_phone(field_name='audiences_phone_number'):
+    return Collate(Func(F(field_name), Value(r'\D'), Value(''), Value('g'), function='REGEXP_REPLACE'), 'C')
+
+
+def parse_search_limit(limit_param):
+    if limit_param in (None, ''):
+        return DEFAULT_SEARCH_LIMIT
+    try:
+        limit = int(limit_param)
+    except (ValueError, TypeError):
+        raise FilterError("Invalid search parameters", "limit must be an integer")
+    if limit < 1 or limit > MAX_SEARCH_LIMIT:
+        raise FilterError("Invalid search parameters", f"limit must be between 1 and {MAX_SEARCH_LIMIT}")
+    return limit
+
+
+def _rank_by_similarity(audiences, query, limit):
+    return list(audiences.annotate(
+        search_rank=Greatest(
+            TrigramWordSimilarity(query, 'audiences_name'),
+            TrigramWordSimilarity(query, 'audiences_email')
+        )
+    ).order_by('-search_rank', 'audiences_id')[:limit])
+
+
+# Searches audiences for q and returns at most limit of them, best match first.
+# Phone-like queries are a prefix match on the normalized phone number (an
+# ordered scan of audiences_phone_prefix_idx). Other queries rank up to
+# SEARCH_POOL_SIZE audiences whose name or email contains the query by trigram
+# word similarity; if that leaves room, audiences with a similar name or email
+# (typos) follow, ranked the same way. Both use the pg_trgm GIN indexes on
+# UPPER(name) and UPPER(email).
+def search_audiences(audiences, query, limit):
+    query = query.strip()
+    if len(query) < MIN_SEARCH_LENGTH:
+        raise FilterError(f"q must be at least {MIN_SEARCH_LENGTH} characters", "Search query too short")
+
+    if PHONE_QUERY_RE.match(query):
+        digits = re.sub(r'\D', '', query)
+        if len(digits) < MIN_SEARCH_LENGTH:
+            raise FilterError(f"q must contain at least {MIN_SEARCH_LENGTH} digits", "Search query too short")
+        return list(audiences.annotate(
+            normalized_phone=normalized_phone()
+        ).filter(normalized_phone__startswith=digits).order_by('normalized_phone', 'audiences_id')[:limit])
+
+    containing = audiences.filter(
+        Q(audiences_name__icontains=query) | Q(audiences_email__icontains=query)
+    ).values('audiences_id')[:SEARCH_POOL_SIZE]
+    results = _rank_by_similarity(audiences.filter(audiences_id__in=containing), query, limit)
+    if len(results) < limit:
+        similar = audiences.annotate(
+            name_upper=Upper('audiences_name'),
+            email_upper=Upper('audiences_email')
+        ).filter(
+            Q(name_upper__trigram_word_similar=query) | Q(email_upper__trigram_word_similar=query)
+        ).exclude(audiences_id__in=[audience.audiences_id for audience in results])
+        results += _rank_by_similarity(similar, query, limit - len(results))
+    return results
@@ -1,10 +1,69 @@
 from rest_framework import serializers
 from apps.audiences.models import Audience
-from django.db import transaction
+from apps.audiences.audience_labels import sync_audience_labels
+from django.db import models, transaction
 import re
 from django.utils import timezone
 from apps.labels.models import Label
 from apps.attribute_values.models import AttributeValue
+from apps.segments.membership import refresh_segment_members
+
+
+# Resolves label names and attribute values for a batch of audiences in two queries.
+# Returns (label_name_map, attributes_map) where label_name_map is keyed by the
+# label ID as a string and attributes_map by audience ID.
+def build_audience_hydration(audiences):
+    label_ids_int = set()
+    audience_ids = []
+    for audience in audiences:
+        audience_ids.append(audience.audiences_id)
+        for label_id in audience.audiences_labels or []:
+            try:
+                label_ids_int.add(int(label_id))
+            except (ValueError, TypeError):
+                continue
+
+    # Create mapping of label_id -> label_name
+    label_name_map = {}
+    if label_ids_int:
+        labels = Label.objects.filter(
+            labels_id__in=label_ids_int,
+            labels_is_deleted=False
+        ).values_list('labels_id', 'labels_name')
+        for labels_id, labels_name in labels:
+            label_name_map[str(labels_id)] = labels_name
+
+    # Create mapping of audience_id -> {attribute name: value}
+    attributes_map = {}
+    if audience_ids:
+        attribute_values = AttributeValue.objects.filter(
+            attribute_values_audiences_id__in=audience_ids,
+            attribute_values_attributes_id__isnull=False,
+            attribute_values_is_deleted=False
+        ).values_list(
+            'attribute_values_audiences_id',
+            'attribute_values_attributes_id__attributes_name',
+            'attribute_values_value'
+        )
+        for audience_id, attr_name, attr_value in attribute_values:
+            attributes_map.setdefault(audience_id, {})[attr_name] = attr_value
+
+    return label_name_map, attributes_map
+
+
+# List serializer for audiences that hydrates labels and attributes for the
+# whole page at once instead of querying per audience.
+class AudienceListSerializer(serializers.ListSerializer):
+
+    def to_representation(self, data):
+        iterable = data.all() if isinstance(data, models.manager.BaseManager) else data
+        audiences = list(iterable)
+
+        self.child._hydration = build_audience_hydration(audiences)
+        try:
+            return [self.child.to_representation(audience) for audience in audiences]
+        finally:
+            self.child._hydration = None
 
 
 # Serializer for Audience model, handling creation and updates.
@@ -75,60 +134,27 @@ class AudienceSerializer(serializers.Serializer):
     audiences_created_at = serializers.DateTimeField(read_only=True)
     audiences_updated_at = serializers.DateTimeField(read_only=True)
 
+    class Meta:
+        list_serializer_class = AudienceListSerializer
+
     def to_representation(self, instance):
         representation = super().to_representation(instance)
-        
+
+        # List responses pre-resolve labels and attributes for the whole page,
+        # a single audience resolves its own.
+        hydration = getattr(self, '_hydration', None)
+        if hydration is None:
+            hydration = build_audience_hydration([instance])
+        label_name_map, attributes_map = hydration
+
+        # Replace label IDs with label names in response
         label_ids = instance.audiences_labels if instance.audiences_labels else []
-        
-        if label_ids:
-            # Convert all label IDs to integers
-            label_ids_int = []
-            for label_id in label_ids:
-                try:
-                    label_ids_int.append(int(label_id))
-                except (ValueError, TypeError):
-                    continue
-            
-            # Get label names for label IDs
-            labels = Label.objects.filter(
-                labels_id__in=label_ids_int,
-                labels_is_deleted=False
-            ).values('labels_id', 'labels_name')
-            
-            # Create mapping of label_id -> label_name
-            label_name_map = {}
-            for label in labels:
-                label_name_map[str(label['labels_id'])] = label['labels_name']
-            
-            # Replace label IDs with label names in response
-            label_names = []
-            for label_id in label_ids:
-                label_str = str(label_id)
-                if label_str in label_name_map:
-                    label_names.append(label_name_map[label_str])
-                else:
-                    label_names.append(label_str)
-            
-            representation['audiences_labels'] = label_names
-        else:
-            representation['audiences_labels'] = []
-        
-        
-        # Get attributes for this audience
-        attributes = AttributeValue.objects.filter(
-            attribute_values_audiences_id=instance,
-            attribute_values_is_deleted=False
-        ).select_related('attribute_values_attributes_id')
-        
-        # Create attributes dictionary with attribute names and values
-        attributes_dict = {}
-        for attr_value in attributes:
-            if attr_value.attribute_values_attributes_id:
-                attr_name = attr_value.attribute_values_attributes_id.attributes_name
-                attributes_dict[attr_name] = attr_value.attribute_values_value
-        
-        representation['audiences_attributes'] = attributes_dict
-        
+        representation['audiences_labels'] = [
+            label_name_map.get(str(label_id), str(label_id)) for label_id in label_ids
+        ]
+
+        representation['audiences_attributes'] = dict(attributes_map.get(instance.audiences_id, {}))
+
         return representation
 
 
@@ -259,6 +285,8 @@ class AudienceSerializer(serializers.Serializer):
             audiences_last_active=timezone.now(),
             audiences_created_by=None,
         )
+        sync_audience_labels([audience])
+        refresh_segment_members([audience.audiences_id])
         return audience
 
     # Updates an existing audience instance
@@ -275,6 +303,9 @@ class AudienceSerializer(serializers.Serializer):
         instance.audiences_last_active = timezone.now()
         instance.audiences_updated_by = None
         instance.save()
+        if "audiences_labels" in validated_data:
+            sync_audience_labels([instance])
+        refresh_segment_members([instance.audiences_id])
         return instance
 
 class AudienceStatusSerializer(serializers.Serializer):
@@ -290,6 +321,7 @@ class AudienceStatusSerializer(serializers.Serializer):
         instance.audiences_is_active = validated_data.get("audiences_is_active")
         instance.audiences_updated_by = None
         instance.save()
+        refresh_segment_members([instance.audiences_id])
         return instance
 
 
@@ -372,4 +404,32 @@ class AudienceImportSerializer(serializers.Serializer):
     def validate_audiences_attributes(self, value):
         if not isinstance(value, dict):
             raise serializers.ValidationError("Attributes must be provided as a dictionary.")
-        return value
\ No newline at end of file
+        return value
+
+
+# Read-only view of an import job's progress counters
+class AudienceImportJobSerializer(serializers.Serializer):
+    audience_import_jobs_id = serializers.IntegerField(read_only=True)
+    audience_import_jobs_status = serializers.CharField(read_only=True)
+    audience_import_jobs_total = serializers.IntegerField(read_only=True)
+    audience_import_jobs_processed = serializers.IntegerField(read_only=True)
+    audience_import_jobs_created = serializers.IntegerField(read_only=True)
+    audience_import_jobs_updated = serializers.IntegerField(read_only=True)
+    audience_import_jobs_skipped = serializers.IntegerField(read_only=True)
+    audience_import_jobs_failed = serializers.IntegerField(read_only=True)
+    audience_import_jobs_error = serializers.CharField(read_only=True)
+    audience_import_jobs_started_at = serializers.DateTimeField(read_only=True)
+    audience_import_jobs_finished_at = serializers.DateTimeField(read_only=True)
+    audience_import_jobs_created_at = serializers.DateTimeField(read_only=True)
+    audience_import_jobs_updated_at = serializers.DateTimeField(read_only=True)
+
+    def to_representation(self, instance):
+        representation = super().to_representation(instance)
+        if self.context.get("include_failures"):
+            failures = instance.audience_import_jobs_failures or []
+            representation['audience_import_jobs_failures'] = failures
+            # Only the first MAX_IMPORT_JOB_FAILURES failed rows are stored
+            representation['audience_import_jobs_failures_truncated'] = (
+                instance.audience_import_jobs_failed > len(failures)
+            )
+        return representation
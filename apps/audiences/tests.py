@@ -0,0 +1,127 @@
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from apps.attribute_values.models import AttributeValue
+from apps.attributes.models import Attribute
+from apps.audiences.models import Audience, AudienceImportJob
+from apps.audiences.search import search_audiences
+from apps.labels.models import Label
+
+
+AUDIENCE_LIST_URL = '/api/v1/whatsapp/audience/'
+AUDIENCE_IMPORT_URL = '/api/v1/whatsapp/audience/import/'
+
+
+# Labels and attributes of a list page are hydrated in a fixed number of
+# queries, so the count must not grow with the page size.
+class AudienceListQueryCountTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        labels = [Label.objects.create(labels_name=f'Label {n}') for n in range(3)]
+        attributes = [Attribute.objects.create(attributes_name=f'Attribute {n}') for n in range(3)]
+        for n in range(30):
+            audience = Audience.objects.create(
+                audiences_name=f'Audience {n}',
+                audiences_phone_number=f'90000000{n:02d}',
+                audiences_labels=[label.labels_id for label in labels]
+            )
+            for attribute in attributes:
+                AttributeValue.objects.create(
+                    attribute_values_attributes_id=attribute,
+                    attribute_values_audiences_id=audience,
+                    attribute_values_value=f'Value {n}'
+                )
+
+    def setUp(self):
+        self.client = APIClient()
+
+    def count_list_queries(self, limit):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(AUDIENCE_LIST_URL, {'pagination': 'cursor', 'limit': limit})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()['data']), limit)
+        return len(queries)
+
+    def test_list_query_count_is_independent_of_page_size(self):
+        small_page_queries = self.count_list_queries(5)
+        large_page_queries = self.count_list_queries(25)
+        self.assertEqual(small_page_queries, large_page_queries)
+
+        # audiences page + label names + attribute values
+        with self.assertNumQueries(3):
+            self.client.get(AUDIENCE_LIST_URL, {'pagination': 'cursor', 'limit': 25})
+
+    def test_list_hydrates_labels_and_attributes(self):
+        response = self.client.get(AUDIENCE_LIST_URL, {'pagination': 'cursor', 'limit': 5})
+        audience = response.json()['data'][0]
+        self.assertEqual(len(audience['audiences_labels']), 3)
+        self.assertEqual(len(audience['audiences_attributes']), 3)
+
+
+# The q= search tiers: phone prefix, name/email substring, then trigram
+# similarity for typos.
+class AudienceSearchTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.priya = Audience.objects.create(
+            audiences_name='Priya Sharma', audiences_email='priya.sharma@example.com',
+            audiences_phone_number='98765 43210'
+        )
+        cls.rohan = Audience.objects.create(
+            audiences_name='Rohan Kulkarni', audiences_email='rohan.k@example.com',
+            audiences_phone_number='9123456789'
+        )
+        cls.meera = Audience.objects.create(
+            audiences_name='Meera Iyer', audiences_email='meera@example.org',
+            audiences_phone_number='9876500000'
+        )
+
+    def search(self, query, limit=20):
+        return [audience.audiences_id for audience in search_audiences(Audience.objects.all(), query, limit)]
+
+    def test_phone_query_matches_normalized_prefix(self):
+        self.assertEqual(self.search('98765'), [self.meera.audiences_id, self.priya.audiences_id])
+        self.assertEqual(self.search('(98765) 432'), [self.priya.audiences_id])
+
+    def test_substring_of_name_or_email(self):
+        self.assertEqual(self.search('sharma'), [self.priya.audiences_id])
+        self.assertEqual(self.search('rohan.k@'), [self.rohan.audiences_id])
+
+    def test_typo_falls_back_to_trigram_similarity(self):
+        self.assertEqual(self.search('Kulkarny'), [self.rohan.audiences_id])
+
+    def test_endpoint_ranks_and_rejects_short_queries(self):
+        client = APIClient()
+        response = client.get(AUDIENCE_LIST_URL, {'q': 'Priya Sharma'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['data'][0]['audiences_id'], self.priya.audiences_id)
+
+        response = client.get(AUDIENCE_LIST_URL, {'q': 'pr'})
+        self.assertEqual(response.status_code, 400)
+
+
+# Queued imports take chunk_size as a JSON integer between 1 and
+# MAX_IMPORT_JOB_CHUNK_SIZE.
+class AudienceImportJobTests(TestCase):
+
+    def queue(self, chunk_size):
+        return APIClient().post(AUDIENCE_IMPORT_URL, {
+            'async': True,
+            'chunk_size': chunk_size,
+            'audiences': [{'audiences_name': 'Queued', 'audiences_phone_number': '9000000001'}]
+        }, format='json')
+
+    def test_rejects_invalid_chunk_sizes(self):
+        for chunk_size in (True, False, 0, -1, '10', 10.5):
+            with self.subTest(chunk_size=chunk_size):
+                self.assertEqual(self.queue(chunk_size).status_code, 400)
+        self.assertFalse(AudienceImportJob.objects.exists())
+
+    def test_queues_valid_chunk_size(self):
+        response = self.queue(10)
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(AudienceImportJob.objects.get().audience_import_jobs_chunk_size, 10)
@@ -1,9 +1,11 @@
 from django.urls import path
-from apps.audiences.views import AudienceListCreateView, AudienceDetailView , AudienceImportView , AudienceStatusDetailView
+from apps.audiences.views import AudienceListCreateView, AudienceDetailView , AudienceImportView , AudienceStatusDetailView, AudienceExportView, AudienceImportJobDetailView
 
 urlpatterns = [
     path('audience/', AudienceListCreateView.as_view(), name='audience-list-create'),
     path('audience/<int:audiences_id>/', AudienceDetailView.as_view(), name='audience-detail'),
     path('audience/<int:audiences_id>/status/', AudienceStatusDetailView.as_view(), name='audience-status-detail'),
+    path('audience/export/', AudienceExportView.as_view(), name='audience-export'),
     path('audience/import/', AudienceImportView.as_view(), name='audience-import'), 
+    path('audience/import/<int:job_id>/', AudienceImportJobDetailView.as_view(), name='audience-import-job-detail'),
 ]   
\ No newline at end of file
@@ -22,4 +22,8 @@ class CannedMessage(models.Model):
     canned_messages_updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
-        db_table = "canned_messages"
\ No newline at end of file
+        db_table = "canned_messages"
+        indexes = [
+            # Serves the created_at date range filter of the list endpoint
+            models.Index(fields=['canned_messages_created_at'], name='canned_messages_created_at_idx'),
+        ]
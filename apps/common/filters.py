@@ -0,0 +1,122 @@
+from datetime import datetime, time, timedelta
+
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+
+
+# Raised when a query parameter cannot be turned into a filter. Views return it
+# as a 400 response with the given message and error.
+class FilterError(Exception):
+    def __init__(self, message, error):
+        super().__init__(message)
+        self.message = message
+        self.error = error
+
+
+# 'true' / 'false' on a boolean field; any other value is ignored.
+class BooleanFilter:
+    def __init__(self, param, field_name):
+        self.param = param
+        self.field_name = field_name
+
+    def apply(self, queryset, value):
+        if value.lower() == 'true':
+            return queryset.filter(**{self.field_name: True})
+        if value.lower() == 'false':
+            return queryset.filter(**{self.field_name: False})
+        return queryset
+
+
+# Exact match on a field. With choices, the value is lower-cased and must be
+# one of them.
+class ExactFilter:
+    def __init__(self, param, field_name, choices=None):
+        self.param = param
+        self.field_name = field_name
+        self.choices = choices
+
+    def apply(self, queryset, value):
+        if self.choices is not None:
+            value = value.lower()
+            if value not in self.choices:
+                allowed = " or ".join(f"'{choice}'" for choice in self.choices)
+                raise FilterError(f"Invalid {self.param} filter. Use {allowed}", "Invalid filter value")
+        return queryset.filter(**{self.field_name: value})
+
+
+# Returns the [start, end) datetimes covering start_date through end_date in
+# the current time zone.
+def date_range_bounds(start_date, end_date):
+    tz = timezone.get_current_timezone()
+    start = timezone.make_aware(datetime.combine(start_date, time.min), tz)
+    end = timezone.make_aware(datetime.combine(end_date + timedelta(days=1), time.min), tz)
+    return start, end
+
+
+# 'YYYY-MM-DD' or 'YYYY-MM-DD to YYYY-MM-DD' on a date time field. Days are
+# taken in the current time zone and compiled to field >= start AND field < end,
+# which a b-tree index on the column can serve (a __date lookup cannot).
+# label only changes the wording of the error messages.
+class DateRangeFilter:
+    def __init__(self, param, field_name, label=None):
+        self.param = param
+        self.field_name = field_name
+        self.label = label
+
+    def apply(self, queryset, value):
+        start_date, end_date = self.parse(value)
+        start, end = date_range_bounds(start_date, end_date)
+        return queryset.filter(**{f"{self.field_name}__gte": start, f"{self.field_name}__lt": end})
+
+    def parse(self, value):
+        suffix = f" for {self.label}" if self.label else ""
+        try:
+            if 'to' in value.lower():
+                date_parts = value.lower().split('to')
+                if len(date_parts) != 2:
+                    raise FilterError(
+                        f"Invalid date range format{suffix}. Use 'YYYY-MM-DD to YYYY-MM-DD'",
+                        "Invalid range format"
+                    )
+
+                start_date = parse_date(date_parts[0].strip())
+                end_date = parse_date(date_parts[1].strip())
+                if not (start_date and end_date):
+                    raise FilterError(
+                        f"Invalid date range format{suffix}. Use 'YYYY-MM-DD to YYYY-MM-DD' with valid dates",
+                        "Invalid date format in range"
+                    )
+                return start_date, end_date
+
+            if '-' in value and value.count('-') >= 2:
+                filter_date = parse_date(value)
+                if not filter_date:
+                    raise FilterError(
+                        f"Invalid date format{suffix}. Use 'YYYY-MM-DD'",
+                        "Invalid date format"
+                    )
+                return filter_date, filter_date
+
+            raise FilterError(
+                f"Invalid {self.label or 'date'} parameter. Use 'YYYY-MM-DD' for single date or 'YYYY-MM-DD to YYYY-MM-DD' for range",
+                "Invalid date parameter format"
+            )
+
+        except FilterError:
+            raise
+        except ValueError as e:
+            raise FilterError(f"Invalid date value{suffix}", str(e))
+        except Exception as e:
+            raise FilterError(f"Error processing {self.label or 'date'} filter", str(e))
+
+
+# Applies every filter whose query parameter is present and not empty.
+# Views declare their filters as a tuple, e.g.
+#   query_filters = (BooleanFilter('label_status', 'labels_is_active'),
+#                    DateRangeFilter('created_at', 'labels_created_at'))
+def apply_filters(queryset, params, query_filters):
+    for query_filter in query_filters:
+        value = params.get(query_filter.param)
+        if value:
+            queryset = query_filter.apply(queryset, value)
+    return queryset
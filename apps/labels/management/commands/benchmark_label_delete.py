@@ -0,0 +1,47 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+
+from apps.audiences.models import Audience
+from apps.labels.models import Label
+from apps.labels.utils import soft_delete_labels
+
+
+# Times label deletion against growing numbers of labelled audiences and reports
+# the number of queries, which should stay constant. Runs are rolled back.
+class Command(BaseCommand):
+    help = "Benchmark set-based label deletion"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--audiences', type=int, nargs='+', default=[1000, 10000, 100000])
+        parser.add_argument('--labels', type=int, default=3, help="Labels deleted in one call")
+
+    def handle(self, *args, **options):
+        self.stdout.write(f"{'audiences':>10} {'labels':>7} {'queries':>8} {'seconds':>8}")
+        for audience_count in options['audiences']:
+            with transaction.atomic():
+                labels = Label.objects.bulk_create([
+                    Label(labels_name=f"Benchmark {index}") for index in range(options['labels'])
+                ])
+                label_ids = [label.labels_id for label in labels]
+                Audience.objects.bulk_create([
+                    Audience(
+                        audiences_name=f"Benchmark {index}",
+                        audiences_phone_number=f"8{index:09d}",
+                        audiences_labels=label_ids
+                    )
+                    for index in range(audience_count)
+                ], batch_size=5000)
+
+                started = time.perf_counter()
+                with CaptureQueriesContext(connection) as queries:
+                    soft_delete_labels(label_ids)
+                elapsed = time.perf_counter() - started
+
+                transaction.set_rollback(True)
+
+            self.stdout.write(
+                f"{audience_count:>10} {len(label_ids):>7} {len(queries.captured_queries):>8} {elapsed:>8.2f}"
+            )
@@ -16,4 +16,8 @@ class Label(models.Model):
     labels_updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
-        db_table = "labels"
\ No newline at end of file
+        db_table = "labels"
+        indexes = [
+            # Serves the created_at date range filter of the list endpoint
+            models.Index(fields=['labels_created_at'], name='labels_created_at_idx'),
+        ]
@@ -1,10 +1,14 @@
 from django.urls import path
 
-from apps.labels.views import LabelListCreateView , LabelDetailView
+from apps.labels.views import LabelListCreateView , LabelDetailView, LabelBulkDeleteView, LabelAudienceCountView
 
 urlpatterns = [
     # URL for listing all Labels and creating a new one
     path('label/', LabelListCreateView.as_view(), name='label-list-create'),
     # URL for retrieving, updating, or soft deleting a specific Labels by its ID
-    path('label/<int:labels_id>/', LabelDetailView.as_view(), name='label-detail')
+    path('label/<int:labels_id>/', LabelDetailView.as_view(), name='label-detail'),
+    # URL for soft deleting several Labels at once
+    path('label/bulk-delete/', LabelBulkDeleteView.as_view(), name='label-bulk-delete'),
+    # URL for the number of audiences carrying each Label
+    path('label/audience-counts/', LabelAudienceCountView.as_view(), name='label-audience-counts')
 ]
\ No newline at end of file
@@ -0,0 +1,62 @@
+import json
+
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+from django.utils import timezone
+
+from apps.audiences.audience_labels import delete_label_rows
+from apps.audiences.models import Audience
+from apps.labels.models import Label
+from apps.segments.membership import rebuild_segments_referencing
+
+
+# Strips the given label IDs from audiences_labels of every audience carrying
+# one of them, in a single UPDATE. IDs are matched whether they were stored as
+# numbers or as strings. Returns the number of audiences changed.
+def remove_labels_from_audiences(label_ids):
+    label_ids = [int(label_id) for label_id in label_ids]
+    if not label_ids:
+        return 0
+
+    has_label = Q()
+    for label_id in label_ids:
+        has_label |= Q(audiences_labels__contains=[label_id]) | Q(audiences_labels__contains=[str(label_id)])
+
+    delete_label_rows(label_ids)
+
+    removed_values = json.dumps(label_ids + [str(label_id) for label_id in label_ids])
+    remaining_labels = RawSQL(
+        """
+        COALESCE((
+            SELECT jsonb_agg(elems.label ORDER BY elems.position)
+            FROM jsonb_array_elements(audiences_labels) WITH ORDINALITY AS elems(label, position)
+            WHERE NOT %s::jsonb @> jsonb_build_array(elems.label)
+        ), '[]'::jsonb)
+        """,
+        [removed_values]
+    )
+
+    changed = Audience.objects.filter(has_label, audiences_is_deleted=False).update(
+        audiences_labels=remaining_labels,
+        audiences_updated_at=timezone.now()
+    )
+
+    # Segments filtering on these labels no longer resolve and are emptied
+    rebuild_segments_referencing(
+        label_names=Label.objects.filter(labels_id__in=label_ids).values_list('labels_name', flat=True)
+    )
+    return changed
+
+
+# Soft deletes the given labels and strips them from audiences.
+# Returns the IDs that were deleted.
+def soft_delete_labels(label_ids):
+    labels = Label.objects.filter(labels_id__in=label_ids, labels_is_deleted=False)
+    deleted_ids = list(labels.values_list('labels_id', flat=True))
+    if deleted_ids:
+        Label.objects.filter(labels_id__in=deleted_ids).update(
+            labels_is_deleted=True,
+            labels_updated_at=timezone.now()
+        )
+        remove_labels_from_audiences(deleted_ids)
+    return deleted_ids
@@ -3,99 +3,38 @@ from django.db import transaction
 from django.core.exceptions import ObjectDoesNotExist
 from rest_framework.response import Response
 from rest_framework import status
+from apps.common.filters import BooleanFilter, DateRangeFilter, FilterError, apply_filters
 from apps.labels.models import Label
-from apps.audiences.models import Audience
 from apps.labels.serializers import LabelSerializer
-from django.utils.dateparse import parse_date
+from apps.audiences.audience_labels import count_audiences_per_label
+from apps.labels.utils import remove_labels_from_audiences, soft_delete_labels
+from apps.segments.membership import rebuild_segments_referencing
 from apps.role_permissions_management.permissions.decorators import feature_permission_required
 
 
 
 
 class LabelListCreateView(APIView):
+    query_filters = (
+        BooleanFilter('label_status', 'labels_is_active'),
+        DateRangeFilter('created_at', 'labels_created_at'),
+    )
 
     # GET requests to fetch all non-deleted labels records
     # @feature_permission_required(feature_key='label', action_key='read')
     def get(self, request):
         try:
-            labels = Label.objects.filter(labels_is_deleted=False)
-                
-            status_filter = request.GET.get('label_status')
-            if status_filter is not None:
-                if status_filter.lower() == 'true':
-                    labels = labels.filter(labels_is_active=True)
-                elif status_filter.lower() == 'false':
-                    labels = labels.filter(labels_is_active=False)
-
-
-            created_at_param = request.GET.get('created_at')
-            
-            if created_at_param:
-                try:
-                    if 'to' in created_at_param.lower():
-                        date_parts = created_at_param.lower().split('to')
-                        if len(date_parts) == 2:
-                            start_date_str = date_parts[0].strip()
-                            end_date_str = date_parts[1].strip()
-                            
-                            start_date = parse_date(start_date_str)
-                            end_date = parse_date(end_date_str)
-                            
-                            if start_date and end_date:
-                                labels = labels.filter(
-                                    labels_created_at__date__gte=start_date,
-                                    labels_created_at__date__lte=end_date
-                                )
-                            else:
-                                return Response({
-                                    "success": False,
-                                    "status": 400,
-                                    "message": "Invalid date range format. Use 'YYYY-MM-DD to YYYY-MM-DD' with valid dates",
-                                    "error": "Invalid date format in range"
-                                }, status=status.HTTP_400_BAD_REQUEST)
-                        else:
-                            return Response({
-                                "success": False,
-                                "status": 400,
-                                "message": "Invalid date range format. Use 'YYYY-MM-DD to YYYY-MM-DD'",
-                                "error": "Invalid range format"
-                            }, status=status.HTTP_400_BAD_REQUEST)
-                    
-                    elif '-' in created_at_param and created_at_param.count('-') >= 2:
-                        filter_date = parse_date(created_at_param)
-                        if filter_date:
-                            labels = labels.filter(labels_created_at__date=filter_date)
-                        else:
-                            return Response({
-                                "success": False,
-                                "status": 400,
-                                "message": "Invalid date format. Use 'YYYY-MM-DD'",
-                                "error": "Invalid date format"
-                            }, status=status.HTTP_400_BAD_REQUEST)
-                    
-                    else:
-                        return Response({
-                            "success": False,
-                            "status": 400,
-                            "message": "Invalid date parameter. Use 'YYYY-MM-DD' for single date or 'YYYY-MM-DD to YYYY-MM-DD' for range",
-                            "error": "Invalid date parameter format"
-                        }, status=status.HTTP_400_BAD_REQUEST)
-                        
-                except ValueError as e:
-                    return Response({
-                        "success": False,
-                        "status": 400,
-                        "message": "Invalid date value",
-                        "error": str(e)
-                    }, status=status.HTTP_400_BAD_REQUEST)
-                except Exception as e:
-                    return Response({
-                        "success": False,
-                        "status": 400,
-                        "message": "Error processing date filter",
-                        "error": str(e)
-                    }, status=status.HTTP_400_BAD_REQUEST)
-
+            try:
+                labels = apply_filters(
+                    Label.objects.filter(labels_is_deleted=False), request.GET, self.query_filters
+                )
+            except FilterError as e:
+                return Response({
+                    "success": False,
+                    "status": 400,
+                    "message": e.message,
+                    "error": e.error
+                }, status=status.HTTP_400_BAD_REQUEST)
 
             serializer = LabelSerializer(labels, many=True)
             return Response({
@@ -188,9 +127,14 @@ class LabelDetailView(APIView):
                 "error": "Label not found"
             }, status=status.HTTP_404_NOT_FOUND)
         try:
+            previous_name, was_active = label.labels_name, label.labels_is_active
             serializer = LabelSerializer(label, data=request.data, partial=True, context={'request': request})
             if serializer.is_valid():
                 serializer.save()
+
+                # Segments naming the label under its old or new name resolve differently now
+                if label.labels_name != previous_name or label.labels_is_active != was_active:
+                    rebuild_segments_referencing(label_names=[previous_name, label.labels_name])
                 return Response({
                     "success": True,
                     "status": 200,
@@ -222,20 +166,8 @@ class LabelDetailView(APIView):
             label.labels_is_deleted = True
             label.save()
 
-            # Get all audiences that have this label
-            audiences_with_label = Audience.objects.filter(
-                audiences_labels__contains=[labels_id],
-                audiences_is_deleted=False
-            )
-            
-            # Remove this label from all audiences
-            for audience in audiences_with_label:
-                if label.labels_id in audience.audiences_labels:
-                    audience.audiences_labels = [
-                        lbl for lbl in audience.audiences_labels 
-                        if lbl != label.labels_id
-                    ]
-                    audience.save(update_fields=['audiences_labels', 'audiences_updated_at'])
+            # Remove this label from all audiences in one statement
+            remove_labels_from_audiences([label.labels_id])
 
             return Response({
                 "success": True,
@@ -255,4 +187,87 @@ class LabelDetailView(APIView):
                 "success": False,
                 "message": "Internal server error",
                 "error": str(e)
-            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
\ No newline at end of file
+            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+class LabelBulkDeleteView(APIView):
+
+    # Soft delete several labels and strip them from audiences with set-based updates
+    # @feature_permission_required(feature_key='label', action_key='delete')
+    @transaction.atomic
+    def post(self, request):
+        try:
+            labels_ids = request.data.get('labels_ids')
+            if not isinstance(labels_ids, list) or not labels_ids:
+                return Response({
+                    "success": False,
+                    "status": 400,
+                    "message": "Invalid Input",
+                    "error": "labels_ids must be a non-empty list"
+                }, status=status.HTTP_400_BAD_REQUEST)
+
+            try:
+                labels_ids = {int(label_id) for label_id in labels_ids}
+            except (TypeError, ValueError):
+                return Response({
+                    "success": False,
+                    "status": 400,
+                    "message": "Invalid Input",
+                    "error": "labels_ids must contain only integers"
+                }, status=status.HTTP_400_BAD_REQUEST)
+
+            deleted_ids = soft_delete_labels(labels_ids)
+
+            return Response({
+                "success": True,
+                "status": 200,
+                "message": "Labels deleted successfully",
+                "data": {
+                    "deleted": sorted(deleted_ids),
+                    "not_found": sorted(labels_ids - set(deleted_ids))
+                }
+            }, status=status.HTTP_200_OK)
+
+        except Exception as e:
+            return Response({
+                "status": 500,
+                "success": False,
+                "message": "Internal server error",
+                "error": str(e)
+            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+class LabelAudienceCountView(APIView):
+
+    # Number of audiences carrying each label, computed with one indexed query
+    # @feature_permission_required(feature_key='label', action_key='read')
+    def get(self, request):
+        try:
+            labels = list(
+                Label.objects.filter(labels_is_deleted=False)
+                .order_by('labels_id')
+                .values_list('labels_id', 'labels_name')
+            )
+            counts = count_audiences_per_label([labels_id for labels_id, _ in labels])
+
+            return Response({
+                "success": True,
+                "status": 200,
+                "message": "Fetched label audience counts successfully",
+                "data": [
+                    {
+                        "labels_id": labels_id,
+                        "labels_name": labels_name,
+                        "audiences_count": counts[labels_id]
+                    }
+                    for labels_id, labels_name in labels
+                ]
+            }, status=status.HTTP_200_OK)
+
+        except Exception as e:
+            return Response({
+                "status": 500,
+                "success": False,
+                "message": "Internal server error",
+                "error": str(e)
+            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
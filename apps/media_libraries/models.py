@@ -22,4 +22,8 @@ class MediaLibrary(models.Model):
     media_libraries_updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
-        db_table = "media_libraries"
\ No newline at end of file
+        db_table = "media_libraries"
+        indexes = [
+            # Serves the created_at date range filter of the list endpoint
+            models.Index(fields=['media_libraries_created_at'], name='media_libraries_created_at_idx'),
+        ]
@@ -3,92 +3,33 @@ from django.db import transaction
 from django.core.exceptions import ObjectDoesNotExist
 from rest_framework.response import Response
 from rest_framework import status
+from apps.common.filters import DateRangeFilter, ExactFilter, FilterError, apply_filters
 from django.core.files.storage import default_storage
 from apps.media_libraries.models import MediaLibrary
 from apps.media_libraries.serializers import MediaLibrarySerializer
-from django.utils.dateparse import parse_date
 
 
 class MediaLibraryListCreateView(APIView):
+    query_filters = (
+        ExactFilter('media_type', 'media_libraries_type'),
+        DateRangeFilter('created_at', 'media_libraries_created_at'),
+    )
+
     # GET requests to fetch all non-deleted media with filters
-    @transaction.atomic
     def get(self, request):
         try:
-            media = MediaLibrary.objects.filter(media_libraries_is_deleted=False)
-            
-            # Filter by media type
-            media_type = request.GET.get('media_type')
-            if media_type:
-                media = media.filter(media_libraries_type=media_type)
-            
-            # Filter by date
-            created_at_param = request.GET.get('created_at')
-            if created_at_param:
-                try:
-                    if 'to' in created_at_param.lower():
-                        date_parts = created_at_param.lower().split('to')
-                        if len(date_parts) == 2:
-                            start_date_str = date_parts[0].strip()
-                            end_date_str = date_parts[1].strip()
-                            
-                            start_date = parse_date(start_date_str)
-                            end_date = parse_date(end_date_str)
-                            
-                            if start_date and end_date:
-                                media = media.filter(
-                                    media_libraries_created_at__date__gte=start_date,
-                                    media_libraries_created_at__date__lte=end_date
-                                )
-                            else:
-                                return Response({
-                                    "success": False,
-                                    "status": 400,
-                                    "message": "Invalid date range format. Use 'YYYY-MM-DD to YYYY-MM-DD' with valid dates",
-                                    "error": "Invalid date format in range"
-                                }, status=status.HTTP_400_BAD_REQUEST)
-                        else:
-                            return Response({
-                                "success": False,
-                                "status": 400,
-                                "message": "Invalid date range format. Use 'YYYY-MM-DD to YYYY-MM-DD'",
-                                "error": "Invalid range format"
-                            }, status=status.HTTP_400_BAD_REQUEST)
-                    
-                    elif '-' in created_at_param and created_at_param.count('-') >= 2:
-                        filter_date = parse_date(created_at_param)
-                        if filter_date:
-                            media = media.filter(media_libraries_created_at__date=filter_date)
-                        else:
-                            return Response({
-                                "success": False,
-                                "status": 400,
-                                "message": "Invalid date format. Use 'YYYY-MM-DD'",
-                                "error": "Invalid date format"
-                            }, status=status.HTTP_400_BAD_REQUEST)
-                    
-                    else:
-                        return Response({
-                            "success": False,
-                            "status": 400,
-                            "message": "Invalid date parameter. Use 'YYYY-MM-DD' for single date or 'YYYY-MM-DD to YYYY-MM-DD' for range",
-                            "error": "Invalid date parameter format"
-                        }, status=status.HTTP_400_BAD_REQUEST)
-                        
-                except ValueError as e:
-                    return Response({
-                        "success": False,
-                        "status": 400,
-                        "message": "Invalid date value",
-                        "error": str(e)
-                    }, status=status.HTTP_400_BAD_REQUEST)
-                except Exception as e:
-                    return Response({
-                        "success": False,
-                        "status": 400,
-                        "message": "Error processing date filter",
-                        "error": str(e)
-                    }, status=status.HTTP_400_BAD_REQUEST)
-            
+            try:
+                media = apply_filters(
+                    MediaLibrary.objects.filter(media_libraries_is_deleted=False), request.GET, self.query_filters
+                )
+            except FilterError as e:
+                return Response({
+                    "success": False,
+                    "status": 400,
+                    "message": e.message,
+                    "error": e.error
+                }, status=status.HTTP_400_BAD_REQUEST)
+
             serializer = MediaLibrarySerializer(media, many=True)
             return Response({
                 "success": True,
@@ -138,7 +79,6 @@ class MediaLibraryListCreateView(APIView):
 
 class MediaLibraryDetailView(APIView):
     # Retrieve media by ID if not soft deleted
-    @transaction.atomic
     def get(self, request, media_libraries_id):
         try:
             media = MediaLibrary.objects.get(media_libraries_id=media_libraries_id, media_libraries_is_deleted=False)
@@ -20,3 +20,7 @@ class OptKeyword(models.Model):
 
     class Meta:
         db_table = "opt_keywords"
+        indexes = [
+            # Serves the created_at date range filter of the list endpoint
+            models.Index(fields=['opt_keywords_created_at'], name='opt_keywords_created_at_idx'),
+        ]
@@ -3,93 +3,33 @@ from django.db import transaction
 from django.core.exceptions import ObjectDoesNotExist
 from rest_framework.response import Response
 from rest_framework import status
-from django.utils.dateparse import parse_date
 
+from apps.common.filters import DateRangeFilter, ExactFilter, FilterError, apply_filters
 from apps.opt_keywords.models import OptKeyword
 from apps.opt_keywords.serializers import OptKeywordSerializer
 
 
 class OptKeywordListCreateView(APIView):
+    query_filters = (
+        ExactFilter('type', 'opt_keywords_type', choices=('opt_in', 'opt_out')),
+        DateRangeFilter('created_at', 'opt_keywords_created_at'),
+    )
+
     # List all opt keyword configurations
-    @transaction.atomic
     def get(self, request):
         try:
-            opt_keywords = OptKeyword.objects.filter(opt_keywords_is_deleted=False)
-            
-            # Filter by type
-            type_filter = request.GET.get('type')
-            if type_filter:
-                if type_filter.lower() in ['opt_in', 'opt_out']:
-                    opt_keywords = opt_keywords.filter(opt_keywords_type=type_filter.lower())
-                else:
-                    return Response({
-                        "success": False,
-                        "status": 400,
-                        "message": "Invalid type filter. Use 'opt_in' or 'opt_out'",
-                        "error": "Invalid filter value"
-                    }, status=status.HTTP_400_BAD_REQUEST)
-            
-            # Date filtering for created_at
-            created_at_param = request.GET.get('created_at')
-            if created_at_param:
-                try:
-                    if 'to' in created_at_param.lower():
-                        date_parts = created_at_param.lower().split('to')
-                        if len(date_parts) == 2:
-                            start_date_str = date_parts[0].strip()
-                            end_date_str = date_parts[1].strip()
-                            
-                            start_date = parse_date(start_date_str)
-                            end_date = parse_date(end_date_str)
-                            
-                            if start_date and end_date:
-                                opt_keywords = opt_keywords.filter(
-                                    opt_keywords_created_at__date__gte=start_date,
-                                    opt_keywords_created_at__date__lte=end_date
-                                )
-                            else:
-                                return Response({
-                                    "success": False,
-                                    "status": 400,
-                                    "message": "Invalid date range format. Use 'YYYY-MM-DD to YYYY-MM-DD' with valid dates",
-                                    "error": "Invalid date format"
-                                }, status=status.HTTP_400_BAD_REQUEST)
-                    
-                    elif '-' in created_at_param and created_at_param.count('-') >= 2:
-                        filter_date = parse_date(created_at_param)
-                        if filter_date:
-                            opt_keywords = opt_keywords.filter(opt_keywords_created_at__date=filter_date)
-                        else:
-                            return Response({
-                                "success": False,
-                                "status": 400,
-                                "message": "Invalid date format. Use 'YYYY-MM-DD'",
-                                "error": "Invalid date format"
-                            }, status=status.HTTP_400_BAD_REQUEST)
-                    
-                    else:
-                        return Response({
-                            "success": False,
-                            "status": 400,
-                            "message": "Invalid date parameter. Use 'YYYY-MM-DD' for single date or 'YYYY-MM-DD to YYYY-MM-DD' for range",
-                            "error": "Invalid date parameter format"
-                        }, status=status.HTTP_400_BAD_REQUEST)
-                        
-                except ValueError as e:
-                    return Response({
-                        "success": False,
-                        "status": 400,
-                        "message": "Invalid date value",
-                        "error": str(e)
-                    }, status=status.HTTP_400_BAD_REQUEST)
-                except Exception as e:
-                    return Response({
-                        "success": False,
-                        "status": 400,
-                        "message": "Error processing date filter",
-                        "error": str(e)
-                    }, status=status.HTTP_400_BAD_REQUEST)
-            
+            try:
+                opt_keywords = apply_filters(
+                    OptKeyword.objects.filter(opt_keywords_is_deleted=False), request.GET, self.query_filters
+                )
+            except FilterError as e:
+                return Response({
+                    "success": False,
+                    "status": 400,
+                    "message": e.message,
+                    "error": e.error
+                }, status=status.HTTP_400_BAD_REQUEST)
+
             serializer = OptKeywordSerializer(opt_keywords, many=True)
             
             return Response({
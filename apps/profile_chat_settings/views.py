@@ -13,7 +13,6 @@ from apps.profile_chat_settings.serializers import (
 
 class ProfileChatSettingsDetailView(APIView):
     # GET - Retrieve profile chat settings by ID
-    @transaction.atomic
     def get(self, request, profile_chat_settings_id):
         try:
             instance = ProfileChatSettings.objects.get(
@@ -4,23 +4,16 @@ from django.shortcuts import render
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
-from apps.role_permissions_management.features.models import Feature
-from apps.role_permissions_management.feature_actions.models import FeatureAction
+from apps.role_permissions_management.features.catalogue import get_feature_catalogue
 from apps.role_permissions_management.feature_actions.serializers import FeatureActionSerializer
  
 class FeatureActionsListAPIView(APIView):
     def get(self, request):
         try:
-            features = Feature.objects.filter(features_is_active=True)
             response_data = []
  
-            for feature in features:
-                actions = FeatureAction.objects.filter(
-                    feature_actions_features_keys=feature.features_keys,
-                    feature_actions_is_active=True
-                )
- 
-                serialized_actions = FeatureActionSerializer(actions, many=True).data
+            for feature in get_feature_catalogue().features:
+                serialized_actions = FeatureActionSerializer(feature.active_actions, many=True).data
  
                 feature_data = {
                     "features_keys": feature.features_keys,
@@ -1,6 +1,15 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_delete, post_save
 
 
 class FeaturesConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.role_permissions_management.features'
+
+    def ready(self):
+        from apps.role_permissions_management.feature_actions.models import FeatureAction
+        from apps.role_permissions_management.features.catalogue import clear_feature_catalogue_on_commit
+
+        for model in (self.get_model('Feature'), FeatureAction):
+            post_save.connect(clear_feature_catalogue_on_commit, sender=model)
+            post_delete.connect(clear_feature_catalogue_on_commit, sender=model)
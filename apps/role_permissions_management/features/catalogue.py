@@ -0,0 +1,70 @@
+import threading
+import time
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Prefetch
+
+from apps.role_permissions_management.feature_actions.models import FeatureAction
+from apps.role_permissions_management.features.models import Feature
+
+
+DEFAULT_FEATURE_CATALOGUE_TTL = 300
+
+
+# Active features with their active actions, indexed by feature key. Features
+# and actions are seed data, so one catalogue is shared by a worker's requests
+# and must be treated as read-only.
+class FeatureCatalogue:
+    def __init__(self, features):
+        self.features = features
+        self.by_key = {feature.features_keys: feature for feature in features}
+        self.action_keys = {
+            feature.features_keys: frozenset(action.feature_actions_action_keys for action in feature.active_actions)
+            for feature in features
+        }
+
+
+# Loads the catalogue with two queries: features, and their active actions
+# through a filtered Prefetch stored on feature.active_actions.
+def load_feature_catalogue():
+    features = Feature.objects.filter(features_is_active=True).order_by('features_id').prefetch_related(
+        Prefetch(
+            'featureaction_set',
+            queryset=FeatureAction.objects.filter(feature_actions_is_active=True).order_by('feature_actions_id'),
+            to_attr='active_actions'
+        )
+    )
+    return FeatureCatalogue(list(features))
+
+
+_catalogue = None
+_catalogue_expires_at = 0
+_catalogue_lock = threading.Lock()
+
+
+# Memoized per worker for FEATURE_CATALOGUE_TTL seconds
+def get_feature_catalogue():
+    global _catalogue, _catalogue_expires_at
+    with _catalogue_lock:
+        if _catalogue is None or _catalogue_expires_at <= time.monotonic():
+            _catalogue = load_feature_catalogue()
+            _catalogue_expires_at = time.monotonic() + getattr(
+                settings, 'FEATURE_CATALOGUE_TTL', DEFAULT_FEATURE_CATALOGUE_TTL
+            )
+        return _catalogue
+
+
+# Drops this worker's catalogue so the next read reloads it
+def clear_feature_catalogue():
+    global _catalogue
+    with _catalogue_lock:
+        _catalogue = None
+
+
+# post_save/post_delete receiver for Feature and FeatureAction, connected in
+# FeaturesConfig.ready. Only the worker that made the change reloads at once;
+# other workers pick it up within FEATURE_CATALOGUE_TTL seconds. Bulk writes
+# (bulk_create, update) send no signals and must call clear_feature_catalogue.
+def clear_feature_catalogue_on_commit(sender, **kwargs):
+    transaction.on_commit(clear_feature_catalogue)
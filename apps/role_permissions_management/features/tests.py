@@ -0,0 +1,35 @@
+from django.test import TestCase
+
+from apps.role_permissions_management.feature_actions.models import FeatureAction
+from apps.role_permissions_management.features.catalogue import clear_feature_catalogue, get_feature_catalogue
+from apps.role_permissions_management.features.models import Feature
+
+
+class FeatureCatalogueTests(TestCase):
+
+    def setUp(self):
+        clear_feature_catalogue()
+        self.addCleanup(clear_feature_catalogue)
+
+    def test_saving_features_and_actions_reloads_catalogue(self):
+        self.assertEqual(get_feature_catalogue().features, [])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            feature = Feature.objects.create(features_keys='label', features_name='Label')
+        self.assertEqual(list(get_feature_catalogue().by_key), ['label'])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            action = FeatureAction.objects.create(
+                feature_actions_features_keys=feature, feature_actions_action_keys='view'
+            )
+        self.assertEqual(get_feature_catalogue().action_keys, {'label': frozenset({'view'})})
+
+        with self.captureOnCommitCallbacks(execute=True):
+            action.delete()
+        self.assertEqual(get_feature_catalogue().action_keys, {'label': frozenset()})
+
+    def test_catalogue_is_kept_until_commit(self):
+        get_feature_catalogue()
+        with self.captureOnCommitCallbacks(execute=False):
+            Feature.objects.create(features_keys='label', features_name='Label')
+        self.assertEqual(get_feature_catalogue().features, [])
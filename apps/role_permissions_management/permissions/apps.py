@@ -1,6 +1,34 @@
+import logging
+
 from django.apps import AppConfig
+from django.conf import settings
+
+
+logger = logging.getLogger(__name__)
 
 
 class PermissionsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.role_permissions_management.permissions'
+
+    # The permission and role caches invalidate other workers through a shared
+    # cache; a per-process backend in production leaves them serving stale
+    # entries until their TTL, so say so at startup
+    def ready(self):
+        from django.core.cache import caches
+        from apps.role_permissions_management.permissions.cache import get_shared_cache, is_process_local_cache
+
+        if settings.DEBUG:
+            return
+        shared_caches = {
+            'permissions': get_shared_cache(),
+            'roles': caches[getattr(settings, 'ROLE_CACHE_ALIAS', 'default')],
+        }
+        for name, cache in shared_caches.items():
+            if is_process_local_cache(cache):
+                logger.warning(
+                    "The %s cache uses a per-process backend (%s) with DEBUG off. Changes only reach the worker "
+                    "that made them; set PERMISSION_CACHE_BACKEND and PERMISSION_CACHE_LOCATION to a shared "
+                    "cache such as Redis.",
+                    name, type(cache).__name__
+                )
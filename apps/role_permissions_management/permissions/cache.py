@@ -0,0 +1,194 @@
+import threading
+import time
+from collections import OrderedDict
+from urllib.parse import quote
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.db import DEFAULT_DB_ALIAS, transaction
+from django.utils import timezone
+
+from apps.role_permissions_management.permissions.models import Permission
+
+
+DEFAULT_PERMISSION_CACHE_TTL = 300
+DEFAULT_PERMISSION_CACHE_MAX_ENTRIES = 1024
+DEFAULT_PERMISSION_CACHE_ALIAS = 'permissions'
+# Bumped whenever the cached map changes shape, so old entries are ignored
+PERMISSION_MAP_FORMAT = 3
+
+
+# Bounded LRU of permission entries with a per-entry TTL. One instance lives per
+# worker process in front of the shared cache; all methods are thread safe.
+class PermissionCache:
+    def __init__(self, ttl, max_entries):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+permission_cache = PermissionCache(
+    ttl=getattr(settings, 'PERMISSION_CACHE_TTL', DEFAULT_PERMISSION_CACHE_TTL),
+    max_entries=getattr(settings, 'PERMISSION_CACHE_MAX_ENTRIES', DEFAULT_PERMISSION_CACHE_MAX_ENTRIES),
+)
+
+
+# The cache shared by all workers (LocMem in dev, Redis or Memcached in prod)
+def get_shared_cache():
+    return caches[getattr(settings, 'PERMISSION_CACHE_ALIAS', DEFAULT_PERMISSION_CACHE_ALIAS)]
+
+
+# True for cache backends whose entries are not seen by other workers
+def is_process_local_cache(cache):
+    return isinstance(cache, (LocMemCache, DummyCache))
+
+
+def _cache_key(role_key, branch_key):
+    return f"permissions:{PERMISSION_MAP_FORMAT}:{quote(role_key, safe='')}:{quote(branch_key, safe='')}"
+
+
+def _version_key(role_key, branch_key):
+    return f"{_cache_key(role_key, branch_key)}:version"
+
+
+def _invalidated_at_key(role_key, branch_key):
+    return f"{_cache_key(role_key, branch_key)}:invalidated_at"
+
+
+# Current version of a (role, branch) permission map. A missing version key is
+# seeded from the clock, so an evicted counter never goes back to a version
+# that may still have a map cached under it.
+def get_permission_version(role_key, branch_key):
+    shared_cache = get_shared_cache()
+    version_key = _version_key(role_key, branch_key)
+    version = shared_cache.get(version_key)
+    if version is None:
+        shared_cache.add(version_key, time.time_ns(), timeout=None)
+        version = shared_cache.get(version_key)
+    return version
+
+
+# Turns stored permissions_feature_actions_keys into the frozenset of granted
+# action keys. Lists of action keys and lists of {"action_key", "has_permission"}
+# dicts are both supported; anything else grants no action.
+def compile_action_keys(actions):
+    if not isinstance(actions, list):
+        return frozenset()
+    if all(isinstance(action, str) for action in actions):
+        return frozenset(actions)
+    if all(isinstance(action, dict) for action in actions):
+        return frozenset(
+            str(action.get('action_key')) for action in actions if action.get('has_permission', False)
+        )
+    return frozenset()
+
+
+# Loads (permission_map, last_modified) for a role in a branch with one query.
+# permission_map is {feature_key: frozenset(action_keys)} over the active rows,
+# the first row of a feature winning as before. last_modified is the newest
+# permissions_updated_at of all the rows, inactive and deleted ones included,
+# or invalidated_at when later, so rows removed outright are covered too.
+# Always reads the primary: an entry loaded from a lagging replica would be
+# cached under the new version.
+def load_permission_entry(role_key, branch_key, invalidated_at=None):
+    permissions = Permission.objects.using(DEFAULT_DB_ALIAS).filter(
+        permissions_user_roles_keys=role_key,
+        permissions_branches_unique_id=branch_key
+    ).order_by('permissions_id').values_list(
+        'permissions_features_keys_id', 'permissions_feature_actions_keys',
+        'permissions_is_active', 'permissions_is_deleted', 'permissions_updated_at'
+    )
+
+    permission_map = {}
+    last_modified = invalidated_at
+    for feature_key, actions, is_active, is_deleted, updated_at in permissions:
+        if updated_at is not None and (last_modified is None or updated_at > last_modified):
+            last_modified = updated_at
+        if feature_key is None or not is_active or is_deleted:
+            continue
+        if feature_key not in permission_map:
+            permission_map[feature_key] = compile_action_keys(actions)
+    return permission_map, last_modified
+
+
+# Reads (permission_map, last_modified) through the worker LRU and the shared
+# cache. A warm read costs one shared-cache read for the version plus a dict
+# lookup. If the shared cache is unreachable the entry is read from the
+# database on every call until it is back.
+def get_permission_entry(role_key, branch_key):
+    try:
+        version = get_permission_version(role_key, branch_key)
+    except Exception:
+        return load_permission_entry(role_key, branch_key)
+
+    local_key = (role_key, branch_key, version)
+    entry = permission_cache.get(local_key)
+    if entry is not None:
+        return entry
+
+    shared_cache = get_shared_cache()
+    cache_key = _cache_key(role_key, branch_key)
+    try:
+        entry = shared_cache.get(cache_key, version=version)
+        invalidated_at = None if entry is not None else shared_cache.get(_invalidated_at_key(role_key, branch_key))
+    except Exception:
+        return load_permission_entry(role_key, branch_key)
+    if entry is None:
+        entry = load_permission_entry(role_key, branch_key, invalidated_at)
+        try:
+            shared_cache.set(cache_key, entry, timeout=permission_cache.ttl, version=version)
+        except Exception:
+            return entry
+
+    permission_cache.set(local_key, entry)
+    return entry
+
+
+def get_permission_map(role_key, branch_key):
+    return get_permission_entry(role_key, branch_key)[0]
+
+
+def _bump_permission_version(role_key, branch_key):
+    shared_cache = get_shared_cache()
+    version_key = _version_key(role_key, branch_key)
+    # Written before the version so an entry loaded under the new version sees it
+    shared_cache.set(_invalidated_at_key(role_key, branch_key), timezone.now(), timeout=None)
+    try:
+        shared_cache.incr(version_key)
+    except ValueError:
+        shared_cache.add(version_key, time.time_ns(), timeout=None)
+
+
+# Call after writing or deleting Permission rows. Bumping the version makes
+# every worker miss on its next check, and the time of the bump is recorded as
+# a lower bound for Last-Modified. It is bumped again once the transaction
+# commits so a map reloaded while the write was uncommitted is not kept.
+def invalidate_permissions(role_key, branch_key):
+    _bump_permission_version(role_key, branch_key)
+    transaction.on_commit(lambda: _bump_permission_version(role_key, branch_key))
@@ -0,0 +1,66 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from apps.role_permissions_management.features.models import Feature
+from apps.role_permissions_management.permissions.cache import permission_cache
+from apps.role_permissions_management.permissions.models import Permission
+from apps.role_permissions_management.permissions.utils import PermissionChecker
+
+
+BENCHMARK_ROLE_KEY = 'benchmark-role'
+BENCHMARK_BRANCH_KEY = 'benchmark-branch'
+
+
+# Measures warm permission checks per second, the way feature_permission_required
+# runs them (a new PermissionChecker per request). Synthetic features and
+# permissions are created inside a transaction that is rolled back.
+class Command(BaseCommand):
+    help = "Benchmark warm PermissionChecker.has_permission calls"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--checks', type=int, default=100000)
+        parser.add_argument('--features', type=int, default=30)
+        parser.add_argument('--actions', type=int, default=5, help="Actions granted per feature")
+        parser.add_argument('--target', type=int, default=10000, help="Checks per second the run must reach")
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            feature_keys = self.create_permissions(options['features'], options['actions'])
+            checks_per_sec = self.run_checks(feature_keys, options['actions'], options['checks'])
+            transaction.set_rollback(True)
+        permission_cache.clear()
+
+        self.stdout.write(f"{options['checks']} checks, {checks_per_sec:,.0f} checks/sec")
+        if checks_per_sec < options['target']:
+            raise CommandError(f"Below the target of {options['target']:,} checks/sec")
+
+    def create_permissions(self, feature_count, action_count):
+        features = Feature.objects.bulk_create([
+            Feature(features_keys=f"benchmark_{index}", features_name=f"Benchmark {index}")
+            for index in range(feature_count)
+        ])
+        Permission.objects.bulk_create([
+            Permission(
+                permissions_user_roles_keys=BENCHMARK_ROLE_KEY,
+                permissions_branches_unique_id=BENCHMARK_BRANCH_KEY,
+                permissions_features_keys=feature,
+                permissions_feature_actions_keys=[f"action_{action}" for action in range(action_count)]
+            )
+            for feature in features
+        ])
+        return [feature.features_keys for feature in features]
+
+    def run_checks(self, feature_keys, action_count, check_count):
+        # Half of the checks ask for an action that is not granted
+        requests = [
+            (feature_keys[index % len(feature_keys)], f"action_{index % (action_count * 2)}")
+            for index in range(check_count)
+        ]
+        PermissionChecker(BENCHMARK_ROLE_KEY, BENCHMARK_BRANCH_KEY).has_permission(*requests[0])
+
+        started = time.perf_counter()
+        for feature_key, action_key in requests:
+            PermissionChecker(BENCHMARK_ROLE_KEY, BENCHMARK_BRANCH_KEY).has_permission(feature_key, action_key)
+        return check_count / (time.perf_counter() - started)
@@ -1,7 +1,7 @@
 from rest_framework import serializers
-from apps.role_permissions_management.feature_actions.models import FeatureAction
-from apps.role_permissions_management.features.models import Feature
+from apps.role_permissions_management.features.catalogue import get_feature_catalogue
 from apps.role_permissions_management.permissions.models import Permission
+from apps.role_permissions_management.permissions.cache import invalidate_permissions
 import uuid
 from django.db import transaction
 
@@ -23,12 +23,11 @@ class PermissionSerializer(serializers.Serializer):
     permissions_is_active = serializers.BooleanField(default=True)
     permissions_is_deleted = serializers.BooleanField(default=False)
     
+    # Feature and action keys are checked against the cached feature catalogue
     def validate_permissions_features_keys(self, value):
-        try:
-            Feature.objects.get(features_keys=value, features_is_active=True)
-            return value
-        except Feature.DoesNotExist:
+        if value not in get_feature_catalogue().by_key:
             raise serializers.ValidationError(f"Feature '{value}' not found or inactive")
+        return value
     
     def validate_permissions_feature_actions_keys(self, value):
         if not isinstance(value, list):
@@ -39,24 +38,19 @@ class PermissionSerializer(serializers.Serializer):
         if not feature_key:
             return value
         
-        try:
-            feature = Feature.objects.get(features_keys=feature_key)
-            valid_actions = FeatureAction.objects.filter(
-                feature_actions_features_keys=feature,
-                feature_actions_is_active=True
-            ).values_list('feature_actions_action_keys', flat=True)
-            
-            invalid_actions = set(value) - set(valid_actions)
-            if invalid_actions:
-                raise serializers.ValidationError(
-                    f"Invalid actions: {', '.join(invalid_actions)}. "
-                    f"Valid actions are: {', '.join(valid_actions)}"
-                )
-            
-            return value
-            
-        except Feature.DoesNotExist:
+        feature = get_feature_catalogue().by_key.get(feature_key)
+        if feature is None:
             return value
+
+        valid_actions = [action.feature_actions_action_keys for action in feature.active_actions]
+        invalid_actions = set(value) - set(valid_actions)
+        if invalid_actions:
+            raise serializers.ValidationError(
+                f"Invalid actions: {', '.join(invalid_actions)}. "
+                f"Valid actions are: {', '.join(valid_actions)}"
+            )
+
+        return value
     
     @transaction.atomic
     def create(self, validated_data):
@@ -64,7 +58,7 @@ class PermissionSerializer(serializers.Serializer):
         
         # Get Feature object
         feature_key = validated_data['permissions_features_keys']
-        feature = Feature.objects.get(features_keys=feature_key)
+        feature = get_feature_catalogue().by_key[feature_key]
         
         # Create permission
         permission = Permission.objects.create(
@@ -78,17 +72,20 @@ class PermissionSerializer(serializers.Serializer):
             permissions_is_active=validated_data.get('permissions_is_active', True),
             permissions_is_deleted=validated_data.get('permissions_is_deleted', False)
         )
+        invalidate_permissions(permission.permissions_user_roles_keys, permission.permissions_branches_unique_id)
         
         return permission
     
     @transaction.atomic
     def update(self, instance, validated_data):
         request = self.context.get('request')
+        # The role or branch may change, so the old pair is dropped as well
+        invalidate_permissions(instance.permissions_user_roles_keys, instance.permissions_branches_unique_id)
         
         # Update feature if changed
         if 'permissions_features_keys' in validated_data:
             feature_key = validated_data['permissions_features_keys']
-            feature = Feature.objects.get(features_keys=feature_key)
+            feature = get_feature_catalogue().by_key[feature_key]
             instance.permissions_features_keys = feature
         
         # Update other fields
@@ -99,6 +96,7 @@ class PermissionSerializer(serializers.Serializer):
                 setattr(instance, attr, value)
         
         instance.save()
+        invalidate_permissions(instance.permissions_user_roles_keys, instance.permissions_branches_unique_id)
         return instance
     
     def to_representation(self, instance):
@@ -107,4 +105,9 @@ class PermissionSerializer(serializers.Serializer):
         if instance.permissions_features_keys:
             representation['permissions_features_keys'] = instance.permissions_features_keys.features_keys
         
-        return representation
\ No newline at end of file
+        return representation
+
+# Validates permissions sent with a new role, before the auth service has
+# assigned the role key that upsert_permissions will write them under
+class RolePermissionSerializer(PermissionSerializer):
+    permissions_user_roles_keys = serializers.CharField(max_length=50, required=False)
@@ -0,0 +1,178 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from django.utils.http import http_date
+from rest_framework.test import APIClient
+
+from apps.role_permissions_management.features.models import Feature
+from apps.role_permissions_management.permissions import cache as permission_cache_module
+from apps.role_permissions_management.permissions.cache import (
+    PermissionCache, get_permission_entry, get_permission_map, get_permission_version, invalidate_permissions
+)
+from apps.role_permissions_management.permissions.models import Permission
+
+
+# Stand-in for the shared cache every worker talks to
+LOCAL_CACHES = {
+    'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'tests-default'},
+    'permissions': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'tests-permissions'},
+}
+
+
+class PermissionCacheTests(TestCase):
+
+    def test_evicts_least_recently_used_entry(self):
+        cache = PermissionCache(ttl=60, max_entries=2)
+        cache.set('a', 1)
+        cache.set('b', 2)
+        cache.get('a')
+        cache.set('c', 3)
+
+        self.assertEqual(cache.get('a'), 1)
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.get('c'), 3)
+
+    def test_entries_expire_after_ttl(self):
+        cache = PermissionCache(ttl=10, max_entries=2)
+        with mock.patch.object(permission_cache_module.time, 'monotonic', return_value=100):
+            cache.set('a', 1)
+        with mock.patch.object(permission_cache_module.time, 'monotonic', return_value=109):
+            self.assertEqual(cache.get('a'), 1)
+        with mock.patch.object(permission_cache_module.time, 'monotonic', return_value=110):
+            self.assertIsNone(cache.get('a'))
+
+
+@override_settings(CACHES=LOCAL_CACHES, PERMISSION_CACHE_ALIAS='permissions')
+class PermissionMapCacheTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.feature = Feature.objects.create(features_keys='label', features_name='Label')
+        cls.permission = Permission.objects.create(
+            permissions_user_roles_keys='admin',
+            permissions_branches_unique_id='branch-1',
+            permissions_features_keys=cls.feature,
+            permissions_feature_actions_keys=['view']
+        )
+
+    def setUp(self):
+        permission_cache_module.get_shared_cache().clear()
+
+    # Reads the map as a worker with its own in-process LRU would
+    def get_map_as(self, worker):
+        with mock.patch.object(permission_cache_module, 'permission_cache', worker):
+            return get_permission_map('admin', 'branch-1')
+
+    def test_warm_read_does_not_query(self):
+        worker = PermissionCache(ttl=60, max_entries=16)
+        with self.assertNumQueries(1):
+            self.assertEqual(self.get_map_as(worker), {'label': frozenset({'view'})})
+        with self.assertNumQueries(0):
+            self.get_map_as(worker)
+
+    def test_second_worker_reads_map_from_shared_cache(self):
+        self.get_map_as(PermissionCache(ttl=60, max_entries=16))
+        with self.assertNumQueries(0):
+            self.assertEqual(self.get_map_as(PermissionCache(ttl=60, max_entries=16)), {'label': frozenset({'view'})})
+
+    def test_invalidation_reaches_other_workers(self):
+        first_worker = PermissionCache(ttl=60, max_entries=16)
+        second_worker = PermissionCache(ttl=60, max_entries=16)
+        self.get_map_as(first_worker)
+        self.get_map_as(second_worker)
+        version = get_permission_version('admin', 'branch-1')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Permission.objects.filter(permissions_id=self.permission.permissions_id).update(
+                permissions_feature_actions_keys=['view', 'update']
+            )
+            invalidate_permissions('admin', 'branch-1')
+
+        self.assertGreater(get_permission_version('admin', 'branch-1'), version)
+        with self.assertNumQueries(1):
+            self.assertEqual(self.get_map_as(second_worker), {'label': frozenset({'view', 'update'})})
+        with self.assertNumQueries(0):
+            self.assertEqual(self.get_map_as(first_worker), {'label': frozenset({'view', 'update'})})
+
+    def test_shared_cache_outage_falls_back_to_database(self):
+        unavailable = mock.Mock()
+        unavailable.get.side_effect = ConnectionError("cache down")
+        unavailable.add.side_effect = ConnectionError("cache down")
+        worker = PermissionCache(ttl=60, max_entries=16)
+
+        with mock.patch.object(permission_cache_module, 'get_shared_cache', return_value=unavailable):
+            with self.assertNumQueries(1):
+                self.assertEqual(self.get_map_as(worker), {'label': frozenset({'view'})})
+
+
+# Conditional permission checks: Last-Modified tracks the newest change to the
+# role's permissions in the branch, including rows deleted outright.
+@override_settings(CACHES=LOCAL_CACHES, PERMISSION_CACHE_ALIAS='permissions')
+class PermissionCheckLastModifiedTests(TestCase):
+    url = '/api/v1/whatsapp/permissions/check/'
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.feature = Feature.objects.create(features_keys='label', features_name='Label')
+        cls.permission = Permission.objects.create(
+            permissions_user_roles_keys='admin',
+            permissions_branches_unique_id='branch-1',
+            permissions_features_keys=cls.feature,
+            permissions_feature_actions_keys=['view']
+        )
+        cls.updated_at = timezone.now() - timedelta(days=1)
+        Permission.objects.filter(permissions_id=cls.permission.permissions_id).update(
+            permissions_updated_at=cls.updated_at
+        )
+
+    def setUp(self):
+        permission_cache_module.get_shared_cache().clear()
+        permission_cache_module.permission_cache.clear()
+        self.addCleanup(permission_cache_module.permission_cache.clear)
+
+    def check(self, **headers):
+        return APIClient().post(
+            self.url, {'checks': [{'feature_key': 'label', 'action_key': 'view'}]}, format='json',
+            headers={'X-User-Role': 'admin', 'X-Branch-Key': 'branch-1', **headers}
+        )
+
+    def test_last_modified_is_newest_row_update(self):
+        response = self.check()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Last-Modified'], http_date(self.updated_at.timestamp()))
+
+    def test_if_modified_since(self):
+        last_modified = self.check()['Last-Modified']
+        response = self.check(**{'If-Modified-Since': last_modified})
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response['Last-Modified'], last_modified)
+
+        earlier = http_date(self.updated_at.timestamp() - 60)
+        self.assertEqual(self.check(**{'If-Modified-Since': earlier}).status_code, 200)
+        self.assertEqual(self.check(**{'If-Modified-Since': 'yesterday'}).status_code, 200)
+
+    def test_if_none_match_takes_precedence(self):
+        last_modified = self.check()['Last-Modified']
+        response = self.check(**{'If-None-Match': '"other"', 'If-Modified-Since': last_modified})
+        self.assertEqual(response.status_code, 200)
+
+    def test_deactivation_advances_last_modified(self):
+        response = self.client.post(
+            '/api/v1/whatsapp/permissions/?role_key=admin', {'permissions': []},
+            content_type='application/json', headers={'X-Branch-Key': 'branch-1'}
+        )
+        self.assertEqual(response.status_code, 200)
+        permission_map, last_modified = get_permission_entry('admin', 'branch-1')
+        self.assertEqual(permission_map, {})
+        self.assertGreater(last_modified, self.updated_at)
+
+    def test_delete_advances_last_modified(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            Permission.objects.filter(permissions_id=self.permission.permissions_id).delete()
+            invalidate_permissions('admin', 'branch-1')
+
+        permission_map, last_modified = get_permission_entry('admin', 'branch-1')
+        self.assertEqual(permission_map, {})
+        self.assertGreater(last_modified, self.updated_at)
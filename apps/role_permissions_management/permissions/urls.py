@@ -1,8 +1,9 @@
 from django.urls import path
-from apps.role_permissions_management.permissions.views import PermissionAPIView
+from apps.role_permissions_management.permissions.views import PermissionAPIView, PermissionCheckAPIView
 
 
 
 urlpatterns = [
     path('permissions/', PermissionAPIView.as_view(), name='permission-list-manage'),
+    path('permissions/check/', PermissionCheckAPIView.as_view(), name='permission-check'),
 ]
\ No newline at end of file
@@ -1,3 +1,9 @@
+import uuid
+
+from django.utils import timezone
+
+from apps.role_permissions_management.features.catalogue import get_feature_catalogue
+from apps.role_permissions_management.permissions.cache import get_permission_map, invalidate_permissions
 from apps.role_permissions_management.permissions.models import Permission
 
 class PermissionChecker:
@@ -13,35 +19,90 @@ class PermissionChecker:
 
     def has_permission(self, feature_key, action_key=None):
         try:
-            permission = Permission.objects.filter(
-                permissions_user_roles_keys=self.role_key,
-                permissions_branches_unique_id=self.branch_key,
-                permissions_features_keys__features_keys=feature_key,
-                permissions_is_active=True,
-                permissions_is_deleted=False
-            ).first()
-
-            if not permission:
+            # Cached per (role, branch) as {feature_key: frozenset(action_keys)};
+            # see permissions/cache.py for loading and invalidation
+            granted_actions = get_permission_map(self.role_key, self.branch_key).get(feature_key)
+            if granted_actions is None:
                 return False
 
-            actions = permission.permissions_feature_actions_keys
             if action_key is None:
                 return True
 
+            return str(action_key) in granted_actions
 
-            if isinstance(actions, list):
-                if all(isinstance(x, str) for x in actions):
-                    print(actions)
-                    return str(action_key) in actions
-                
-                elif all(isinstance(x, dict) for x in actions):
-                    return any(
-                        str(action.get('action_key')) == str(action_key) and 
-                        action.get('has_permission', False)
-                        for action in actions
-                    )
-            
+        except Exception as e:
             return False
 
-        except Exception as e:
-            return False
\ No newline at end of file
+
+# Checks feature/action keys against the cached feature catalogue.
+# Returns an error message, or None when every key is valid.
+def validate_feature_actions(feature_key, action_keys):
+    catalogue = get_feature_catalogue()
+    if feature_key not in catalogue.by_key:
+        return f"Feature '{feature_key}' not found"
+
+    invalid_actions = set(action_keys) - catalogue.action_keys[feature_key]
+    if invalid_actions:
+        return f"Invalid actions for feature '{feature_key}': {', '.join(sorted(invalid_actions))}"
+    return None
+
+
+# Creates or updates the permissions of a role in a branch, one row per feature,
+# with a constant number of queries. Each row is a dict with
+# permissions_features_keys and permissions_feature_actions_keys, and may set
+# permissions_can_deleted, permissions_created_by, permissions_is_active and
+# permissions_is_deleted. Keys must already be validated. A later row for the
+# same feature wins. Returns the permissions in row order.
+def upsert_permissions(role_key, branch_key, rows):
+    rows_by_feature = {row['permissions_features_keys']: row for row in rows}
+    if not rows_by_feature:
+        return []
+
+    existing = {}
+    for permission in Permission.objects.filter(
+        permissions_user_roles_keys=role_key,
+        permissions_branches_unique_id=branch_key,
+        permissions_features_keys__in=list(rows_by_feature)
+    ).order_by('permissions_id'):
+        existing.setdefault(permission.permissions_features_keys_id, permission)
+
+    features = get_feature_catalogue().by_key
+    now = timezone.now()
+    permissions_to_create = []
+    permissions_to_update = []
+    permissions = []
+    for feature_key, row in rows_by_feature.items():
+        permission = existing.get(feature_key)
+        if permission is None:
+            permission = Permission(
+                permissions_unique_id=f"PER-{uuid.uuid4().hex[:10].upper()}",
+                permissions_user_roles_keys=role_key,
+                permissions_branches_unique_id=branch_key,
+                permissions_can_deleted=row.get('permissions_can_deleted', False),
+                permissions_created_by=row.get('permissions_created_by')
+            )
+            permissions_to_create.append(permission)
+        else:
+            permission.permissions_updated_at = now
+            permissions_to_update.append(permission)
+
+        # Reuse the catalogue's Feature so serializing the permission needs no query
+        permission.permissions_features_keys = features[feature_key]
+        permission.permissions_feature_actions_keys = row['permissions_feature_actions_keys']
+        permission.permissions_is_active = row.get('permissions_is_active', True)
+        permission.permissions_is_deleted = row.get('permissions_is_deleted', False)
+        permissions.append(permission)
+
+    if permissions_to_create:
+        Permission.objects.bulk_create(permissions_to_create)
+    if permissions_to_update:
+        Permission.objects.bulk_update(
+            permissions_to_update,
+            [
+                'permissions_feature_actions_keys', 'permissions_is_active',
+                'permissions_is_deleted', 'permissions_updated_at'
+            ]
+        )
+
+    invalidate_permissions(role_key, branch_key)
+    return permissions
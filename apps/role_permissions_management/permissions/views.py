@@ -2,11 +2,42 @@ from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
 from django.db import transaction
+from django.utils import timezone
 from apps.role_permissions_management.permissions.models import Permission
-from apps.role_permissions_management.features.models import Feature
-from apps.role_permissions_management.feature_actions.models import FeatureAction
 from apps.role_permissions_management.permissions.serializers import PermissionSerializer
-import uuid
+from apps.role_permissions_management.features.catalogue import get_feature_catalogue
+from apps.role_permissions_management.permissions.cache import get_permission_entry, invalidate_permissions
+from apps.role_permissions_management.permissions.utils import upsert_permissions, validate_feature_actions
+from django.utils.http import http_date, parse_etags, parse_http_date_safe
+import hashlib
+import json
+
+
+MAX_PERMISSION_CHECKS = 500
+
+
+def _opaque_tag(etag):
+    return etag[2:] if etag.startswith('W/') else etag
+
+
+# Weak comparison of an ETag against an If-None-Match header: a comma-separated
+# list of tags, each optionally W/-prefixed, or *.
+def etag_matches(etag, if_none_match):
+    if not if_none_match:
+        return False
+    tags = parse_etags(if_none_match)
+    if tags == ['*']:
+        return True
+    return _opaque_tag(etag) in {_opaque_tag(tag) for tag in tags}
+
+
+# True when last_modified, truncated to the second like HTTP dates, is not
+# after an If-Modified-Since header. Unparseable dates never match.
+def not_modified_since(last_modified, if_modified_since):
+    if last_modified is None or not if_modified_since:
+        return False
+    modified_since = parse_http_date_safe(if_modified_since)
+    return modified_since is not None and int(last_modified.timestamp()) <= modified_since
 
 
 class PermissionAPIView(APIView):
@@ -23,13 +54,8 @@ class PermissionAPIView(APIView):
                 "message": "role_key and branch_key are required."
             }, status=status.HTTP_400_BAD_REQUEST)
     
-        # Deactivate old permissions
-        Permission.objects.filter(
-            permissions_user_roles_keys=role_key,
-            permissions_branches_unique_id=branch_key
-        ).update(permissions_is_active=False)
-
-        created_permissions = []
+        # Validate every feature and its actions before writing anything
+        rows = []
         for perm_data in permissions_data:
             feature_key = perm_data.get('feature_key')
             action_keys = perm_data.get('action_keys', [])
@@ -49,45 +75,27 @@ class PermissionAPIView(APIView):
                     "message": f"Missing action_keys for feature: {feature_key}",
                 }, status=status.HTTP_400_BAD_REQUEST)
 
-            try:
-                feature = Feature.objects.get(features_keys=feature_key)
-            except Feature.DoesNotExist:
+            error_message = validate_feature_actions(feature_key, action_keys)
+            if error_message:
                 return Response({
                     "success": False,
                     "status": 400,
-                    "message": f"Feature '{feature_key}' not found",
+                    "message": error_message,
                 }, status=status.HTTP_400_BAD_REQUEST)
 
-            valid_actions = FeatureAction.objects.filter(
-                feature_actions_features_keys=feature,
-                feature_actions_is_active=True
-            ).values_list('feature_actions_action_keys', flat=True)
-            
-            invalid_actions = set(action_keys) - set(valid_actions)
-            if invalid_actions:
-                return Response({
-                    "success": False,
-                    "status": 400,
-                    "message": f"Invalid actions for feature '{feature_key}': {', '.join(invalid_actions)}",
-                }, status=status.HTTP_400_BAD_REQUEST)
-                
-            permission, created = Permission.objects.update_or_create(
-                permissions_user_roles_keys=role_key,
-                permissions_branches_unique_id=branch_key,
-                permissions_features_keys=feature,
-                defaults={
-                    'permissions_feature_actions_keys': action_keys,
-                    'permissions_is_active': True,
-                    'permissions_is_deleted': False,
-                }
-            )
-
-            if created:
-                permission.permissions_unique_id = f"PER-{uuid.uuid4().hex[:10].upper()}"
-                permission.permissions_created_by = None
-                permission.save()
-            
-            created_permissions.append(permission)
+            rows.append({
+                'permissions_features_keys': feature_key,
+                'permissions_feature_actions_keys': action_keys,
+            })
+
+        # Deactivate old permissions
+        Permission.objects.filter(
+            permissions_user_roles_keys=role_key,
+            permissions_branches_unique_id=branch_key
+        ).update(permissions_is_active=False, permissions_updated_at=timezone.now())
+        invalidate_permissions(role_key, branch_key)
+
+        created_permissions = upsert_permissions(role_key, branch_key, rows)
 
         serializer = PermissionSerializer(created_permissions, many=True, context={"request": request})
             
@@ -98,7 +106,6 @@ class PermissionAPIView(APIView):
             "data": serializer.data
         }, status=status.HTTP_200_OK)
     
-    @transaction.atomic
     def get(self, request):
         role_key = request.query_params.get('role_key')
         branch_key = request.headers.get('X-Branch-Key')
@@ -124,20 +131,19 @@ class PermissionAPIView(APIView):
             permissions_branches_unique_id=branch_key,
             permissions_is_active=True,
             permissions_is_deleted=False
-        ).select_related('permissions_features_keys')
+        ).order_by('permissions_id')
 
-        # Get all features with their actions
-        features = Feature.objects.filter(features_is_active=True).prefetch_related('featureaction_set')
+        # Index permissions by feature key, the first row of a feature wins
+        permissions_by_feature = {}
+        for permission in permissions:
+            permissions_by_feature.setdefault(permission.permissions_features_keys_id, permission)
 
         response_data = []
-        for feature in features:
-            feature_permission = next(
-                (p for p in permissions if p.permissions_features_keys_id == feature.features_keys),
-                None
-            )
+        for feature in get_feature_catalogue().features:
+            feature_permission = permissions_by_feature.get(feature.features_keys)
 
             actions = []
-            for action in feature.featureaction_set.filter(feature_actions_is_active=True):
+            for action in feature.active_actions:
         
                 has_permission = feature_permission and action.feature_actions_action_keys in feature_permission.permissions_feature_actions_keys
                 
@@ -160,3 +166,95 @@ class PermissionAPIView(APIView):
             "data": response_data
         }, status=status.HTTP_200_OK)
     
+
+
+class PermissionCheckAPIView(APIView):
+    # Answers many (feature_key, action_key) checks for the caller's role and
+    # branch from one load of the cached permission map. POST only reads, so
+    # the ETag can be sent back in If-None-Match, or Last-Modified in
+    # If-Modified-Since, to get a 304; If-None-Match wins when both are sent.
+    # The ETag is a digest of the results, so every worker gives the same tag
+    # for the same answer. Last-Modified is the latest change to the role's
+    # permissions in the branch, deletions included.
+    def post(self, request):
+        role_key = request.headers.get('X-User-Role')
+        branch_key = request.headers.get('X-Branch-Key')
+
+        if not role_key or not branch_key:
+            return Response({
+                "success": False,
+                "status": 400,
+                "message": "X-User-Role and X-Branch-Key headers are required."
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        checks = request.data.get('checks') if isinstance(request.data, dict) else None
+        if not isinstance(checks, list) or not checks:
+            return Response({
+                "success": False,
+                "status": 400,
+                "message": "checks must be a non-empty list."
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        if len(checks) > MAX_PERMISSION_CHECKS:
+            return Response({
+                "success": False,
+                "status": 400,
+                "message": f"At most {MAX_PERMISSION_CHECKS} checks are allowed per request."
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        pairs = []
+        for check in checks:
+            feature_key = check.get('feature_key') if isinstance(check, dict) else None
+            if not feature_key:
+                return Response({
+                    "success": False,
+                    "status": 400,
+                    "message": "Every check needs a feature_key.",
+                }, status=status.HTTP_400_BAD_REQUEST)
+            action_key = check.get('action_key')
+            pairs.append((str(feature_key), None if action_key is None else str(action_key)))
+
+        try:
+            permission_map, last_modified = get_permission_entry(str(role_key), str(branch_key))
+
+            results = []
+            for feature_key, action_key in pairs:
+                granted_actions = permission_map.get(feature_key)
+                results.append({
+                    'feature_key': feature_key,
+                    'action_key': action_key,
+                    'has_permission': granted_actions is not None and (
+                        action_key is None or action_key in granted_actions
+                    )
+                })
+
+            etag = '"%s"' % hashlib.sha1(json.dumps(results).encode()).hexdigest()
+            if_none_match = request.headers.get('If-None-Match')
+            if if_none_match:
+                not_modified = etag_matches(etag, if_none_match)
+            else:
+                not_modified = not_modified_since(last_modified, request.headers.get('If-Modified-Since'))
+
+            if not_modified:
+                response = Response(status=status.HTTP_304_NOT_MODIFIED)
+            else:
+                response = Response({
+                    "success": True,
+                    "status": 200,
+                    "message": "Permissions checked successfully.",
+                    "data": results
+                }, status=status.HTTP_200_OK)
+
+            response['ETag'] = etag
+            if last_modified is not None:
+                response['Last-Modified'] = http_date(last_modified.timestamp())
+            response['Cache-Control'] = 'private, no-cache'
+            return response
+
+        except Exception as e:
+            return Response({
+                "success": False,
+                "status": 500,
+                "message": "Internal server error",
+                "error": str(e)
+            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
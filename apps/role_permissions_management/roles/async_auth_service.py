@@ -0,0 +1,130 @@
+import asyncio
+import threading
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+from apps.role_permissions_management.roles.auth_service import (
+    DEFAULT_AUTH_SERVICE_MAX_RETRIES, DEFAULT_AUTH_SERVICE_POOL_SIZE, DEFAULT_AUTH_SERVICE_RETRY_BACKOFF,
+    RETRY_METHODS, RETRY_STATUSES, AuthServiceUnavailable, get_auth_service_client
+)
+
+
+# Async counterpart of AuthServiceClient for the ASGI role views, built on an
+# httpx.AsyncClient with a keep-alive pool. Timeouts, retry rules and the
+# circuit breaker are the sync client's, so both report the same health.
+class AsyncAuthServiceClient:
+    def __init__(self):
+        sync_client = get_auth_service_client()
+        self.timeout = sync_client.timeout
+        self.circuit_breaker = sync_client.circuit_breaker
+        self.build_url = sync_client.build_url
+        self.max_retries = getattr(settings, 'AUTH_SERVICE_MAX_RETRIES', DEFAULT_AUTH_SERVICE_MAX_RETRIES)
+        self.backoff = getattr(settings, 'AUTH_SERVICE_RETRY_BACKOFF', DEFAULT_AUTH_SERVICE_RETRY_BACKOFF)
+        self.pool_size = getattr(settings, 'AUTH_SERVICE_POOL_SIZE', DEFAULT_AUTH_SERVICE_POOL_SIZE)
+        self._client = None
+        self._loop = None
+        self._lock = threading.Lock()
+
+    # An AsyncClient belongs to one event loop, so it is rebuilt if the loop
+    # changes and the previous one is closed rather than left holding its pool
+    async def _get_client(self):
+        if httpx is None:
+            raise ImproperlyConfigured("The async role views require the httpx package")
+
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            if self._client is not None and self._loop is loop:
+                return self._client
+            previous_client, previous_loop = self._client, self._loop
+            connect_timeout, read_timeout = self.timeout
+            self._client = httpx.AsyncClient(
+                timeout=httpx.Timeout(read_timeout, connect=connect_timeout),
+                # The pool limits go on the transport: AsyncClient ignores its
+                # own limits when a transport is passed. Connection failures are
+                # retried for every method since nothing was sent.
+                transport=httpx.AsyncHTTPTransport(
+                    limits=httpx.Limits(max_connections=self.pool_size, max_keepalive_connections=self.pool_size),
+                    retries=self.max_retries,
+                ),
+            )
+            self._loop = loop
+            client = self._client
+
+        if previous_client is not None:
+            await self._close_client(previous_client, previous_loop)
+        return client
+
+    @staticmethod
+    async def _close_client(client, client_loop):
+        # Close on the client's own loop while it still runs; otherwise the
+        # connections can only be dropped from here
+        if client_loop.is_running() and not client_loop.is_closed():
+            asyncio.run_coroutine_threadsafe(client.aclose(), client_loop)
+            return
+        try:
+            await client.aclose()
+        except (RuntimeError, httpx.HTTPError):
+            pass
+
+    async def request(self, method, path, **kwargs):
+        if not self.circuit_breaker.allow():
+            raise AuthServiceUnavailable("Auth service is unavailable, try again shortly")
+
+        client = await self._get_client()
+        attempts = self.max_retries + 1 if method in RETRY_METHODS else 1
+        response = None
+        for attempt in range(attempts):
+            try:
+                response = await client.request(method, self.build_url(path), **kwargs)
+                error = None
+            except httpx.TransportError as e:
+                response, error = None, e
+
+            if response is not None and response.status_code not in RETRY_STATUSES:
+                break
+            if attempt + 1 < attempts:
+                await asyncio.sleep(self.backoff * (2 ** attempt))
+
+        if response is None:
+            self.circuit_breaker.record_failure()
+            raise AuthServiceUnavailable(f"Auth service request failed: {error}")
+
+        if response.status_code >= 500:
+            self.circuit_breaker.record_failure()
+        else:
+            self.circuit_breaker.record_success()
+        return response
+
+    async def get(self, path, **kwargs):
+        return await self.request('GET', path, **kwargs)
+
+    async def post(self, path, **kwargs):
+        return await self.request('POST', path, **kwargs)
+
+    async def put(self, path, **kwargs):
+        return await self.request('PUT', path, **kwargs)
+
+    async def patch(self, path, **kwargs):
+        return await self.request('PATCH', path, **kwargs)
+
+    async def delete(self, path, **kwargs):
+        return await self.request('DELETE', path, **kwargs)
+
+
+_async_client = None
+_async_client_lock = threading.Lock()
+
+
+def get_async_auth_service_client():
+    global _async_client
+    if _async_client is None:
+        with _async_client_lock:
+            if _async_client is None:
+                _async_client = AsyncAuthServiceClient()
+    return _async_client
@@ -0,0 +1,340 @@
+import asyncio
+import json
+
+from asgiref.sync import sync_to_async
+from django.db import transaction
+from django.http import JsonResponse
+from django.utils import timezone
+from django.views import View
+
+from apps.role_permissions_management.permissions.cache import invalidate_permissions
+from apps.role_permissions_management.permissions.models import Permission
+from apps.role_permissions_management.permissions.serializers import RolePermissionSerializer
+from apps.role_permissions_management.permissions.utils import upsert_permissions
+from apps.role_permissions_management.roles.async_auth_service import get_async_auth_service_client
+from apps.role_permissions_management.roles.auth_service import AuthServiceUnavailable
+from apps.role_permissions_management.roles.role_cache import aget_cached_role_response, invalidate_role_cache
+
+
+# Async (ASGI) versions of the role views in views.py. Calls to the auth service
+# go through the shared httpx client, so a worker keeps serving other requests
+# while they are in flight; database work runs in the sync thread.
+
+
+def _read_json(request):
+    try:
+        return json.loads(request.body or b'{}')
+    except ValueError:
+        return None
+
+
+def _branch_key_missing():
+    return JsonResponse({
+        "status": False,
+        "message": "branch key are required."
+    }, status=400)
+
+
+def _invalid_body():
+    return JsonResponse({
+        "success": False,
+        "status": 400,
+        "message": "Invalid Input",
+        "error": "Request body must be valid JSON"
+    }, status=400)
+
+
+def _auth_service_error(response):
+    body = response.json()
+    return JsonResponse({
+        "success": False,
+        "status": response.status_code,
+        "message": body.get("message"),
+        "error": body.get("error")
+    }, status=response.status_code)
+
+
+def _auth_service_unavailable(e):
+    return JsonResponse({
+        "success": False,
+        "status": 503,
+        "message": "Auth service unavailable",
+        "error": str(e)
+    }, status=503)
+
+
+def _internal_error(message, e):
+    return JsonResponse({
+        "success": False,
+        "status": 500,
+        "message": message,
+        "error": str(e)
+    }, status=500)
+
+
+def _headers(product_key, branch_key, with_body=False):
+    headers = {
+        "X-Product-Key": product_key,
+        "X-Branch-Key": branch_key
+    }
+    if with_body:
+        headers["Content-Type"] = "application/json"
+    return headers
+
+
+@sync_to_async
+def _validate_role_permissions(permissions_payload, branch_key):
+    valid_permissions = []
+    errors = []
+    for perm in permissions_payload:
+        perm = dict(perm, permissions_branches_unique_id=branch_key, permissions_is_active=True)
+        serializer = RolePermissionSerializer(data=perm)
+        if serializer.is_valid():
+            valid_permissions.append(serializer.validated_data)
+        else:
+            errors.append(serializer.errors)
+    return valid_permissions, errors
+
+
+@sync_to_async
+def _write_role_permissions(product_key, role_key, branch_key, rows):
+    invalidate_role_cache(product_key, branch_key)
+    with transaction.atomic():
+        upsert_permissions(role_key, branch_key, rows)
+
+
+@sync_to_async
+def _set_role_permissions_active(product_key, role_key, branch_key, is_active, updated_by):
+    invalidate_role_cache(product_key, branch_key)
+    with transaction.atomic():
+        Permission.objects.filter(
+            permissions_user_roles_keys=role_key,
+            permissions_branches_unique_id=branch_key,
+            permissions_is_deleted=False
+        ).update(
+            permissions_is_active=is_active,
+            permissions_updated_by=updated_by,
+            permissions_updated_at=timezone.now()
+        )
+        invalidate_permissions(role_key, branch_key)
+
+
+@sync_to_async
+def _delete_role_permissions(product_key, role_key, branch_key):
+    invalidate_role_cache(product_key, branch_key)
+    with transaction.atomic():
+        Permission.objects.filter(
+            permissions_user_roles_keys=role_key,
+            permissions_branches_unique_id=branch_key,
+            permissions_is_active=True
+        ).update(permissions_is_deleted=True, permissions_updated_at=timezone.now())
+        invalidate_permissions(role_key, branch_key)
+
+
+@sync_to_async
+def _invalidate_roles(product_key, branch_key):
+    invalidate_role_cache(product_key, branch_key)
+
+
+class AsyncUserRoleListCreateView(View):
+
+    async def get(self, request):
+        try:
+            product_key = request.GET.get('product_key', 'whatsapp')
+            branch_key = request.headers.get('X-Branch-Key')
+            if not branch_key:
+                return _branch_key_missing()
+
+            status_code, body = await aget_cached_role_response(product_key, branch_key, "api/v1/roles/")
+            if status_code == 200:
+                return JsonResponse({
+                    "success": True,
+                    "status": 200,
+                    "message": "User Roles fetched successfully",
+                    "data": body.get("data", [])
+                }, status=200)
+
+            return JsonResponse({
+                "success": False,
+                "status": status_code,
+                "message": body.get("message"),
+                "error": body.get("error"),
+            }, status=status_code)
+
+        except AuthServiceUnavailable as e:
+            return _auth_service_unavailable(e)
+        except Exception as e:
+            return _internal_error("Error while connecting to connect api", e)
+
+    # Creates the role in the auth service while the permissions are validated,
+    # then writes the valid permissions in bulk
+    async def post(self, request):
+        try:
+            product_key = request.GET.get('product_key', 'whatsapp')
+            branch_key = request.headers.get('X-Branch-Key')
+            if not branch_key:
+                return _branch_key_missing()
+
+            data = _read_json(request)
+            if data is None:
+                return _invalid_body()
+
+            permissions_payload = data.get("permissions", [])
+            if not permissions_payload:
+                return JsonResponse(
+                    {"success": False, "error": "At least one permission must be selected"},
+                    status=400
+                )
+
+            role_response, (valid_permissions, errors) = await asyncio.gather(
+                get_async_auth_service_client().post(
+                    "api/v1/roles/",
+                    headers=_headers(product_key, branch_key, with_body=True),
+                    json={"user_roles_name": data.get("user_roles_name")}
+                ),
+                _validate_role_permissions(permissions_payload, branch_key)
+            )
+
+            if role_response.status_code not in [200, 201]:
+                return _auth_service_error(role_response)
+
+            created_role = role_response.json().get("data", {})
+            await _write_role_permissions(product_key, created_role.get("user_roles_keys"), branch_key, valid_permissions)
+
+            return JsonResponse({
+                "success": True,
+                "status": 201,
+                "message": "Role and permissions created",
+                "data": {
+                    "role": created_role,
+                    "permission_errors": errors if errors else None
+                }
+            }, status=201)
+
+        except AuthServiceUnavailable as e:
+            return _auth_service_unavailable(e)
+        except Exception as e:
+            return _internal_error("Internal server error", e)
+
+
+class AsyncUserRoleDetailView(View):
+
+    async def get(self, request, user_roles_keys):
+        try:
+            product_key = request.GET.get('product_key', 'whatsapp')
+            branch_key = request.headers.get('X-Branch-Key')
+            if not branch_key:
+                return _branch_key_missing()
+
+            status_code, body = await aget_cached_role_response(
+                product_key, branch_key, f"api/v1/roles/{user_roles_keys}/", role_key=user_roles_keys
+            )
+            if status_code == 200:
+                return JsonResponse({
+                    "success": True,
+                    "status": 200,
+                    "message": "Role fetched successfully",
+                    "data": body.get("data", {})
+                }, status=200)
+
+            return JsonResponse({
+                "success": False,
+                "status": status_code,
+                "message": body.get("message"),
+                "error": body.get("error")
+            }, status=status_code)
+
+        except AuthServiceUnavailable as e:
+            return _auth_service_unavailable(e)
+        except Exception as e:
+            return _internal_error("Error while fetching role from CONNECT API", e)
+
+    async def put(self, request, user_roles_keys):
+        try:
+            product_key = request.GET.get('product_key', 'whatsapp')
+            branch_key = request.headers.get('X-Branch-Key')
+            if not branch_key:
+                return _branch_key_missing()
+
+            data = _read_json(request)
+            if data is None:
+                return _invalid_body()
+
+            response = await get_async_auth_service_client().put(
+                f"api/v1/roles/{user_roles_keys}/", headers=_headers(product_key, branch_key, with_body=True), json=data
+            )
+            if response.status_code != 200:
+                return _auth_service_error(response)
+
+            await _invalidate_roles(product_key, branch_key)
+            return JsonResponse({
+                "success": True,
+                "status": 200,
+                "message": "Role updated successfully",
+                "data": response.json().get("data", {})
+            }, status=200)
+
+        except AuthServiceUnavailable as e:
+            return _auth_service_unavailable(e)
+        except Exception as e:
+            return _internal_error("Error while updating role in CONNECT API", e)
+
+    # The permission update needs the status the auth service returns, so the
+    # two calls run one after the other
+    async def patch(self, request, user_roles_keys):
+        try:
+            product_key = request.GET.get('product_key', 'whatsapp')
+            branch_key = request.headers.get('X-Branch-Key')
+            if not branch_key:
+                return _branch_key_missing()
+
+            data = _read_json(request)
+            if data is None:
+                return _invalid_body()
+
+            response = await get_async_auth_service_client().patch(
+                f"api/v1/roles/{user_roles_keys}/", headers=_headers(product_key, branch_key, with_body=True), json=data
+            )
+            if response.status_code != 200:
+                return _auth_service_error(response)
+
+            user = await request.auser()
+            is_active = response.json().get('data', {}).get('is_active', True)
+            await _set_role_permissions_active(product_key, user_roles_keys, branch_key, is_active, str(user.id))
+
+            return JsonResponse({
+                "success": True,
+                "status": 200,
+                "message": "Role status and permissions updated successfully",
+                "data": response.json().get("data", {})
+            }, status=200)
+
+        except AuthServiceUnavailable as e:
+            return _auth_service_unavailable(e)
+        except Exception as e:
+            return _internal_error("Error while updating role status in CONNECT API", e)
+
+    async def delete(self, request, user_roles_keys):
+        try:
+            product_key = request.GET.get('product_key', 'whatsapp')
+            branch_key = request.headers.get('X-Branch-Key')
+            if not branch_key:
+                return _branch_key_missing()
+
+            response = await get_async_auth_service_client().delete(
+                f"api/v1/roles/{user_roles_keys}/", headers=_headers(product_key, branch_key)
+            )
+            if response.status_code != 200:
+                return _auth_service_error(response)
+
+            await _delete_role_permissions(product_key, user_roles_keys, branch_key)
+            return JsonResponse({
+                "success": True,
+                "status": 200,
+                "message": "Role deleted successfully"
+            }, status=200)
+
+        except AuthServiceUnavailable as e:
+            return _auth_service_unavailable(e)
+        except Exception as e:
+            return _internal_error("Error while deleting role from CONNECT API", e)
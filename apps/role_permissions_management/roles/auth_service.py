@@ -0,0 +1,142 @@
+import threading
+import time
+
+import requests
+from django.conf import settings
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+
+DEFAULT_AUTH_SERVICE_CONNECT_TIMEOUT = 3.05
+DEFAULT_AUTH_SERVICE_READ_TIMEOUT = 10
+DEFAULT_AUTH_SERVICE_MAX_RETRIES = 2
+DEFAULT_AUTH_SERVICE_RETRY_BACKOFF = 0.3
+DEFAULT_AUTH_SERVICE_POOL_SIZE = 20
+DEFAULT_AUTH_SERVICE_CIRCUIT_FAILURES = 5
+DEFAULT_AUTH_SERVICE_CIRCUIT_RESET = 30
+
+# Only idempotent calls are retried on a read error or a 502/503/504 response;
+# connection failures are retried for every method since nothing was sent
+RETRY_METHODS = frozenset({'GET', 'HEAD', 'OPTIONS', 'PUT', 'DELETE'})
+RETRY_STATUSES = (502, 503, 504)
+
+
+# Raised when the auth service cannot be reached, times out, or the circuit
+# breaker is open. Views return it as a 503 response.
+class AuthServiceUnavailable(Exception):
+    pass
+
+
+# Opens after failure_threshold consecutive failures and rejects calls for
+# reset_timeout seconds. One probe call is then let through: success closes
+# the circuit, failure opens it again.
+class CircuitBreaker:
+    def __init__(self, failure_threshold, reset_timeout):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._failures = 0
+        self._opened_at = None
+        self._probing = False
+        self._lock = threading.Lock()
+
+    def allow(self):
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            if self._probing or time.monotonic() - self._opened_at < self.reset_timeout:
+                return False
+            self._probing = True
+            return True
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._probing = False
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            self._probing = False
+            if self._failures >= self.failure_threshold:
+                self._opened_at = time.monotonic()
+
+
+# Shared client for the auth service: one pooled keep-alive Session per worker,
+# connect/read timeouts on every call, bounded retries with backoff and a
+# circuit breaker. Configured through the AUTH_SERVICE_* settings.
+class AuthServiceClient:
+    def __init__(self):
+        self.timeout = (
+            getattr(settings, 'AUTH_SERVICE_CONNECT_TIMEOUT', DEFAULT_AUTH_SERVICE_CONNECT_TIMEOUT),
+            getattr(settings, 'AUTH_SERVICE_READ_TIMEOUT', DEFAULT_AUTH_SERVICE_READ_TIMEOUT),
+        )
+        self.circuit_breaker = CircuitBreaker(
+            failure_threshold=getattr(settings, 'AUTH_SERVICE_CIRCUIT_FAILURES', DEFAULT_AUTH_SERVICE_CIRCUIT_FAILURES),
+            reset_timeout=getattr(settings, 'AUTH_SERVICE_CIRCUIT_RESET', DEFAULT_AUTH_SERVICE_CIRCUIT_RESET),
+        )
+        self.session = self._build_session()
+
+    def _build_session(self):
+        retries = Retry(
+            total=getattr(settings, 'AUTH_SERVICE_MAX_RETRIES', DEFAULT_AUTH_SERVICE_MAX_RETRIES),
+            backoff_factor=getattr(settings, 'AUTH_SERVICE_RETRY_BACKOFF', DEFAULT_AUTH_SERVICE_RETRY_BACKOFF),
+            status_forcelist=RETRY_STATUSES,
+            allowed_methods=RETRY_METHODS,
+            raise_on_status=False,
+        )
+        pool_size = getattr(settings, 'AUTH_SERVICE_POOL_SIZE', DEFAULT_AUTH_SERVICE_POOL_SIZE)
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=retries)
+
+        session = requests.Session()
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        return session
+
+    def build_url(self, path):
+        return f"{settings.AUTH_SERVICE_BASE_URL.rstrip('/')}/{path.lstrip('/')}"
+
+    def request(self, method, path, **kwargs):
+        if not self.circuit_breaker.allow():
+            raise AuthServiceUnavailable("Auth service is unavailable, try again shortly")
+
+        kwargs.setdefault('timeout', self.timeout)
+        try:
+            response = self.session.request(method, self.build_url(path), **kwargs)
+        except requests.RequestException as e:
+            self.circuit_breaker.record_failure()
+            raise AuthServiceUnavailable(f"Auth service request failed: {e}") from e
+
+        if response.status_code >= 500:
+            self.circuit_breaker.record_failure()
+        else:
+            self.circuit_breaker.record_success()
+        return response
+
+    def get(self, path, **kwargs):
+        return self.request('GET', path, **kwargs)
+
+    def post(self, path, **kwargs):
+        return self.request('POST', path, **kwargs)
+
+    def put(self, path, **kwargs):
+        return self.request('PUT', path, **kwargs)
+
+    def patch(self, path, **kwargs):
+        return self.request('PATCH', path, **kwargs)
+
+    def delete(self, path, **kwargs):
+        return self.request('DELETE', path, **kwargs)
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_auth_service_client():
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = AuthServiceClient()
+    return _client
@@ -0,0 +1,67 @@
+import asyncio
+import time
+import uuid
+
+from django.core.management.base import BaseCommand, CommandError
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+
+ROLE_LIST_PATHS = {
+    'sync': 'api/v1/whatsapp/roles/',
+    'async': 'api/v1/whatsapp/async/roles/',
+}
+
+
+# Fires concurrent GETs at the sync and async role list views of a running
+# server and reports throughput and the average number of requests outstanding
+# (total latency / wall time). Every request uses its own branch key so the
+# role cache misses and each one waits on the auth service.
+class Command(BaseCommand):
+    help = "Load test the sync and async role views of a running server"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--url', default='http://127.0.0.1:8000/', help="Base URL of the running server")
+        parser.add_argument('--requests', type=int, default=200)
+        parser.add_argument('--concurrency', type=int, default=50)
+        parser.add_argument('--views', nargs='+', choices=sorted(ROLE_LIST_PATHS), default=['sync', 'async'])
+
+    def handle(self, *args, **options):
+        if httpx is None:
+            raise CommandError("loadtest_role_views requires the httpx package")
+
+        for view in options['views']:
+            url = f"{options['url'].rstrip('/')}/{ROLE_LIST_PATHS[view]}"
+            elapsed, latencies, failures = asyncio.run(
+                self.run(url, options['requests'], options['concurrency'])
+            )
+            self.stdout.write(
+                f"{view:>5}: {options['requests']} requests in {elapsed:.2f}s, "
+                f"{options['requests'] / elapsed:,.1f} req/sec, "
+                f"avg latency {sum(latencies) / len(latencies) * 1000:.0f} ms, "
+                f"avg outstanding {sum(latencies) / elapsed:.1f}, "
+                f"{failures} failed"
+            )
+
+    async def run(self, url, request_count, concurrency):
+        semaphore = asyncio.Semaphore(concurrency)
+        latencies = []
+        failures = 0
+
+        async def send(client):
+            nonlocal failures
+            async with semaphore:
+                started = time.perf_counter()
+                response = await client.get(url, headers={"X-Branch-Key": f"loadtest-{uuid.uuid4().hex}"})
+                latencies.append(time.perf_counter() - started)
+                if response.status_code != 200:
+                    failures += 1
+
+        limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+        async with httpx.AsyncClient(timeout=60, limits=limits) as client:
+            started = time.perf_counter()
+            await asyncio.gather(*(send(client) for _ in range(request_count)))
+            return time.perf_counter() - started, latencies, failures
@@ -0,0 +1,167 @@
+import asyncio
+import threading
+import time
+from urllib.parse import quote
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import caches
+
+from apps.role_permissions_management.roles.async_auth_service import get_async_auth_service_client
+from apps.role_permissions_management.roles.auth_service import AuthServiceUnavailable, get_auth_service_client
+
+
+DEFAULT_ROLE_CACHE_ALIAS = 'default'
+DEFAULT_ROLE_CACHE_TTL = 60
+DEFAULT_ROLE_CACHE_STALE_TTL = 600
+ROLE_REFRESH_LOCK_TIMEOUT = 30
+
+
+# The cache holding role responses and their version keys (ROLE_CACHE_ALIAS).
+# Invalidation only reaches other workers when this is a shared backend such as
+# Redis; with a per-process one (LocMem, the fallback 'default' alias) other
+# workers keep serving the old roles for up to ROLE_CACHE_TTL plus
+# ROLE_CACHE_STALE_TTL seconds.
+def _cache():
+    return caches[getattr(settings, 'ROLE_CACHE_ALIAS', DEFAULT_ROLE_CACHE_ALIAS)]
+
+
+def _fresh_ttl():
+    return getattr(settings, 'ROLE_CACHE_TTL', DEFAULT_ROLE_CACHE_TTL)
+
+
+def _stale_ttl():
+    return getattr(settings, 'ROLE_CACHE_STALE_TTL', DEFAULT_ROLE_CACHE_STALE_TTL)
+
+
+def _branch_key(product_key, branch_key):
+    return f"roles:{quote(product_key, safe='')}:{quote(branch_key, safe='')}"
+
+
+# Version of every cached role response of a product in a branch, seeded from
+# the clock so an evicted version key never reuses an old version
+def _get_version(product_key, branch_key):
+    version_key = f"{_branch_key(product_key, branch_key)}:version"
+    version = _cache().get(version_key)
+    if version is None:
+        _cache().add(version_key, time.time_ns(), timeout=None)
+        version = _cache().get(version_key)
+    return version
+
+
+# Drops the cached role list and role details of a product in a branch.
+# Call after a role is created, updated or deleted.
+def invalidate_role_cache(product_key, branch_key):
+    version_key = f"{_branch_key(product_key, branch_key)}:version"
+    try:
+        _cache().incr(version_key)
+    except ValueError:
+        _cache().add(version_key, time.time_ns(), timeout=None)
+
+
+def _headers(product_key, branch_key):
+    return {
+        "X-Product-Key": product_key,
+        "X-Branch-Key": branch_key
+    }
+
+
+def _fetch(path, headers):
+    response = get_auth_service_client().get(path, headers=headers)
+    return response.status_code, response.json()
+
+
+async def _afetch(path, headers):
+    response = await get_async_auth_service_client().get(path, headers=headers)
+    return response.status_code, response.json()
+
+
+def _store(cache_key, version, body):
+    _cache().set(cache_key, {"body": body, "fetched_at": time.time()}, timeout=_fresh_ttl() + _stale_ttl(), version=version)
+
+
+# Returns (version, cache_key, entry, refresh_lock_key). The lock key is only
+# set when the entry is stale and this caller won the right to refresh it.
+def _lookup(product_key, branch_key, role_key):
+    version = _get_version(product_key, branch_key)
+    cache_key = f"{_branch_key(product_key, branch_key)}:{quote(role_key, safe='') if role_key else 'list'}"
+    entry = _cache().get(cache_key, version=version)
+
+    refresh_lock_key = None
+    if entry is not None and time.time() - entry["fetched_at"] >= _fresh_ttl():
+        lock_key = f"{cache_key}:refreshing"
+        if _cache().add(lock_key, 1, timeout=ROLE_REFRESH_LOCK_TIMEOUT):
+            refresh_lock_key = lock_key
+    return version, cache_key, entry, refresh_lock_key
+
+
+def _refresh(cache_key, lock_key, version, path, headers):
+    try:
+        status_code, body = _fetch(path, headers)
+        if status_code == 200:
+            _store(cache_key, version, body)
+    except (AuthServiceUnavailable, ValueError):
+        # Keep serving the stale entry until it expires
+        pass
+    finally:
+        _cache().delete(lock_key)
+
+
+# Cache calls hold no database connection, so the async path runs them on the
+# shared executor rather than a thread of their own per request
+def _run_in_executor(func, *args):
+    return sync_to_async(func, thread_sensitive=False)(*args)
+
+
+async def _arefresh(cache_key, lock_key, version, path, headers):
+    try:
+        status_code, body = await _afetch(path, headers)
+        if status_code == 200:
+            await _run_in_executor(_store, cache_key, version, body)
+    except (AuthServiceUnavailable, ValueError):
+        pass
+    finally:
+        await _run_in_executor(_cache().delete, lock_key)
+
+
+# Read-through GET of an auth-service role path, cached per
+# (product_key, branch_key[, role_key]). Returns (status_code, body).
+# Fresh entries are served for ROLE_CACHE_TTL seconds; for ROLE_CACHE_STALE_TTL
+# seconds after that the stale entry is still served while one background
+# refresh per entry runs. Only 200 responses are cached.
+def get_cached_role_response(product_key, branch_key, path, role_key=None):
+    headers = _headers(product_key, branch_key)
+    version, cache_key, entry, refresh_lock_key = _lookup(product_key, branch_key, role_key)
+    if refresh_lock_key:
+        threading.Thread(
+            target=_refresh, args=(cache_key, refresh_lock_key, version, path, headers), daemon=True
+        ).start()
+    if entry is not None:
+        return 200, entry["body"]
+
+    status_code, body = _fetch(path, headers)
+    if status_code == 200:
+        _store(cache_key, version, body)
+    return status_code, body
+
+
+# References to running background refreshes so they are not garbage collected
+_refresh_tasks = set()
+
+
+# Async variant of get_cached_role_response for the ASGI views; refreshes run
+# as tasks on the event loop instead of threads.
+async def aget_cached_role_response(product_key, branch_key, path, role_key=None):
+    headers = _headers(product_key, branch_key)
+    version, cache_key, entry, refresh_lock_key = await _run_in_executor(_lookup, product_key, branch_key, role_key)
+    if refresh_lock_key:
+        task = asyncio.create_task(_arefresh(cache_key, refresh_lock_key, version, path, headers))
+        _refresh_tasks.add(task)
+        task.add_done_callback(_refresh_tasks.discard)
+    if entry is not None:
+        return 200, entry["body"]
+
+    status_code, body = await _afetch(path, headers)
+    if status_code == 200:
+        await _run_in_executor(_store, cache_key, version, body)
+    return status_code, body
@@ -0,0 +1,226 @@
+import json
+import socket
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock, skipIf
+
+from django.test import SimpleTestCase, override_settings
+from rest_framework.test import APIClient
+
+from apps.role_permissions_management.roles import async_auth_service, auth_service
+from apps.role_permissions_management.roles.auth_service import AuthServiceUnavailable, get_auth_service_client
+
+
+LOCAL_CACHES = {
+    'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'tests-default'},
+    'roles': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'tests-roles'},
+}
+
+
+# Auth service stand-in on a local port. Each request takes the next scripted
+# (status, delay) reply, the last one repeating, and is recorded by method.
+class StubAuthService:
+    def __init__(self):
+        self.replies = [(200, 0)]
+        self.requests = []
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def reply(self):
+                stub.requests.append(self.command)
+                status_code, delay = stub.replies.pop(0) if len(stub.replies) > 1 else stub.replies[0]
+                length = int(self.headers.get('Content-Length') or 0)
+                if length:
+                    self.rfile.read(length)
+                time.sleep(delay)
+                body = json.dumps({"data": [], "message": f"stub {status_code}"}).encode()
+                try:
+                    self.send_response(status_code)
+                    self.send_header('Content-Type', 'application/json')
+                    self.send_header('Content-Length', str(len(body)))
+                    self.end_headers()
+                    self.wfile.write(body)
+                except (BrokenPipeError, ConnectionResetError):
+                    # The client gave up waiting
+                    pass
+
+            do_GET = do_POST = do_PUT = do_DELETE = reply
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.server.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self.server.server_port}/"
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    def start(self):
+        self.thread.start()
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+# A local port with nothing listening on it
+def closed_port_url():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return f"http://127.0.0.1:{sock.getsockname()[1]}/"
+
+
+class AuthServiceTestCase(SimpleTestCase):
+    auth_settings = {
+        'AUTH_SERVICE_CONNECT_TIMEOUT': 1,
+        'AUTH_SERVICE_READ_TIMEOUT': 1,
+        'AUTH_SERVICE_MAX_RETRIES': 2,
+        'AUTH_SERVICE_RETRY_BACKOFF': 0,
+        'AUTH_SERVICE_CIRCUIT_FAILURES': 3,
+        'AUTH_SERVICE_CIRCUIT_RESET': 30,
+    }
+
+    def setUp(self):
+        self.stub = StubAuthService()
+        self.stub.start()
+        self.addCleanup(self.stub.stop)
+
+        settings_override = override_settings(
+            AUTH_SERVICE_BASE_URL=self.stub.url, CACHES=LOCAL_CACHES, ROLE_CACHE_ALIAS='roles', **self.auth_settings
+        )
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        # The clients are per-worker singletons built from the settings
+        self.reset_clients()
+        self.addCleanup(self.reset_clients)
+
+    def reset_clients(self):
+        auth_service._client = None
+        async_auth_service._async_client = None
+
+
+class AuthServiceRetryTests(AuthServiceTestCase):
+
+    def test_get_is_retried_on_gateway_errors(self):
+        for status_code in (502, 503, 504):
+            with self.subTest(status_code=status_code):
+                self.reset_clients()
+                self.stub.requests = []
+                self.stub.replies = [(status_code, 0), (status_code, 0), (200, 0)]
+                response = get_auth_service_client().get('api/v1/roles/')
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(self.stub.requests, ['GET'] * 3)
+
+    def test_get_returns_last_error_after_max_retries(self):
+        self.stub.replies = [(503, 0)]
+        response = get_auth_service_client().get('api/v1/roles/')
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(len(self.stub.requests), 3)
+
+    def test_post_is_not_retried(self):
+        self.stub.replies = [(503, 0), (200, 0)]
+        response = get_auth_service_client().post('api/v1/roles/', json={"user_roles_name": "Agent"})
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(self.stub.requests, ['POST'])
+
+    def test_other_errors_are_not_retried(self):
+        self.stub.replies = [(500, 0), (200, 0)]
+        response = get_auth_service_client().get('api/v1/roles/')
+        self.assertEqual(response.status_code, 500)
+        self.assertEqual(self.stub.requests, ['GET'])
+
+
+class AuthServiceTimeoutTests(AuthServiceTestCase):
+    auth_settings = {
+        **AuthServiceTestCase.auth_settings,
+        'AUTH_SERVICE_CONNECT_TIMEOUT': 0.5,
+        'AUTH_SERVICE_READ_TIMEOUT': 0.2,
+        'AUTH_SERVICE_MAX_RETRIES': 0,
+    }
+
+    def test_sends_connect_and_read_timeouts(self):
+        client = get_auth_service_client()
+        with mock.patch.object(client.session, 'request', wraps=client.session.request) as request:
+            client.get('api/v1/roles/')
+        self.assertEqual(request.call_args.kwargs['timeout'], (0.5, 0.2))
+
+    def test_read_timeout_raises_unavailable(self):
+        self.stub.replies = [(200, 1)]
+        started = time.monotonic()
+        with self.assertRaises(AuthServiceUnavailable):
+            get_auth_service_client().get('api/v1/roles/')
+        self.assertLess(time.monotonic() - started, 1)
+
+    def test_connect_failure_raises_unavailable(self):
+        with override_settings(AUTH_SERVICE_BASE_URL=closed_port_url()):
+            with self.assertRaises(AuthServiceUnavailable):
+                get_auth_service_client().get('api/v1/roles/')
+        self.assertEqual(self.stub.requests, [])
+
+
+class CircuitBreakerTests(AuthServiceTestCase):
+    auth_settings = {**AuthServiceTestCase.auth_settings, 'AUTH_SERVICE_MAX_RETRIES': 0}
+
+    def test_opens_after_failures_and_probes_after_reset(self):
+        client = get_auth_service_client()
+        self.stub.replies = [(500, 0)]
+        with mock.patch.object(auth_service.time, 'monotonic', return_value=1000):
+            for _ in range(3):
+                self.assertEqual(client.get('api/v1/roles/').status_code, 500)
+            with self.assertRaises(AuthServiceUnavailable):
+                client.get('api/v1/roles/')
+        self.assertEqual(len(self.stub.requests), 3)
+
+        # Still open just before AUTH_SERVICE_CIRCUIT_RESET seconds have passed
+        with mock.patch.object(auth_service.time, 'monotonic', return_value=1029):
+            with self.assertRaises(AuthServiceUnavailable):
+                client.get('api/v1/roles/')
+
+        # A failed probe opens it again
+        with mock.patch.object(auth_service.time, 'monotonic', return_value=1030):
+            self.assertEqual(client.get('api/v1/roles/').status_code, 500)
+            with self.assertRaises(AuthServiceUnavailable):
+                client.get('api/v1/roles/')
+
+        # A successful probe closes it
+        self.stub.replies = [(200, 0)]
+        with mock.patch.object(auth_service.time, 'monotonic', return_value=1060):
+            self.assertEqual(client.get('api/v1/roles/').status_code, 200)
+            self.assertEqual(client.get('api/v1/roles/').status_code, 200)
+        self.assertEqual(len(self.stub.requests), 6)
+
+
+# The role views answer 503 in the usual envelope when the auth service is
+# down or the circuit is open.
+class RoleViewUnavailableTests(AuthServiceTestCase):
+    auth_settings = {**AuthServiceTestCase.auth_settings, 'AUTH_SERVICE_MAX_RETRIES': 0}
+
+    def assertUnavailable(self, response):
+        self.assertEqual(response.status_code, 503)
+        body = response.json()
+        self.assertEqual((body['success'], body['status']), (False, 503))
+        self.assertEqual(body['message'], "Auth service unavailable")
+
+    def open_circuit(self):
+        circuit_breaker = get_auth_service_client().circuit_breaker
+        for _ in range(circuit_breaker.failure_threshold):
+            circuit_breaker.record_failure()
+
+    def test_unreachable_service(self):
+        with override_settings(AUTH_SERVICE_BASE_URL=closed_port_url()):
+            self.assertUnavailable(APIClient().get('/api/v1/whatsapp/roles/', headers={'X-Branch-Key': 'branch-1'}))
+
+    def test_open_circuit(self):
+        self.open_circuit()
+        client = APIClient()
+        self.assertUnavailable(client.get('/api/v1/whatsapp/roles/', headers={'X-Branch-Key': 'branch-1'}))
+        self.assertUnavailable(client.get('/api/v1/whatsapp/roles/agent/', headers={'X-Branch-Key': 'branch-1'}))
+        self.assertEqual(self.stub.requests, [])
+
+    @skipIf(async_auth_service.httpx is None, "httpx is not installed")
+    async def test_async_views_open_circuit(self):
+        self.open_circuit()
+        response = await self.async_client.get('/api/v1/whatsapp/async/roles/', headers={'X-Branch-Key': 'branch-1'})
+        self.assertUnavailable(response)
+        self.assertEqual(self.stub.requests, [])
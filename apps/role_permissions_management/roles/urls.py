@@ -1,7 +1,12 @@
 from django.urls import path
+from django.views.decorators.csrf import csrf_exempt
 from apps.role_permissions_management.roles.views import UserRoleListCreateView, UserRoleDetailView
+from apps.role_permissions_management.roles.async_views import AsyncUserRoleListCreateView, AsyncUserRoleDetailView
 
 urlpatterns = [
     path('roles/', UserRoleListCreateView.as_view(), name='role-list-create'),
     path('roles/<str:user_roles_keys>/', UserRoleDetailView.as_view(), name='role-detail-view'),
+    # Async variants, served without a blocked thread per auth-service call under ASGI
+    path('async/roles/', csrf_exempt(AsyncUserRoleListCreateView.as_view()), name='async-role-list-create'),
+    path('async/roles/<str:user_roles_keys>/', csrf_exempt(AsyncUserRoleDetailView.as_view()), name='async-role-detail-view'),
 ]
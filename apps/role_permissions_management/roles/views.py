@@ -1,14 +1,16 @@
-import requests
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
-from django.conf import settings
 from django.db import transaction
+from django.utils import timezone
 from apps.role_permissions_management.permissions.models import Permission
 from apps.role_permissions_management.permissions.serializers import PermissionSerializer
+from apps.role_permissions_management.permissions.cache import invalidate_permissions
+from apps.role_permissions_management.permissions.utils import upsert_permissions
+from apps.role_permissions_management.roles.auth_service import AuthServiceUnavailable, get_auth_service_client
+from apps.role_permissions_management.roles.role_cache import get_cached_role_response, invalidate_role_cache
 
 class UserRoleListCreateView(APIView):
-    @transaction.atomic
     def get(self, request):
         try:
             product_key = request.query_params.get('product_key', 'whatsapp')
@@ -20,28 +22,31 @@ class UserRoleListCreateView(APIView):
                     "message": "branch key are required."
                 }, status=status.HTTP_400_BAD_REQUEST)
             
-            headers = {
-                "X-Product-Key": product_key,
-                "X-Branch-Key": branch_key
-            }
-    
-            url = f"{settings.AUTH_SERVICE_BASE_URL}/api/v1/roles/"
-            response = requests.get(url, headers=headers)
+            # Served from the role cache; see role_cache.py
+            status_code, body = get_cached_role_response(product_key, branch_key, "api/v1/roles/")
 
-            if response.status_code == 200:
+            if status_code == 200:
                 return Response({
                     "success": True,
                     "status": 200,
                     "message": "User Roles fetched successfully",
-                    "data": response.json().get("data", [])
+                    "data": body.get("data", [])
                 }, status=status.HTTP_200_OK)
             else:
                 return Response({
                     "success": False,
-                    "status": response.status_code,
-                    "message":  response.json().get("message"),
-                    "error":  response.json().get("error"),
-                }, status=response.status_code)
+                    "status": status_code,
+                    "message":  body.get("message"),
+                    "error":  body.get("error"),
+                }, status=status_code)
+
+        except AuthServiceUnavailable as e:
+            return Response({
+                "success": False,
+                "status": 503,
+                "message": "Auth service unavailable",
+                "error": str(e)
+            }, status=status.HTTP_503_SERVICE_UNAVAILABLE)
 
         except Exception as e:
             return Response({
@@ -75,8 +80,8 @@ class UserRoleListCreateView(APIView):
             }
  
             # Create Role in binarybiz
-            role_url = f"{settings.AUTH_SERVICE_BASE_URL}/api/v1/roles/"
-            role_response = requests.post(role_url, headers=headers, json=role_payload)
+            role_url = "api/v1/roles/"
+            role_response = get_auth_service_client().post(role_url, headers=headers, json=role_payload)
  
             if role_response.status_code not in [200, 201]:
                 return Response({
@@ -86,6 +91,7 @@ class UserRoleListCreateView(APIView):
                     "error": role_response.json().get("error")
                 }, status=role_response.status_code)
  
+            invalidate_role_cache(product_key, branch_key)
             created_role = role_response.json().get("data", {})
             role_key = created_role.get("user_roles_keys")
  
@@ -97,7 +103,9 @@ class UserRoleListCreateView(APIView):
                     status=status.HTTP_400_BAD_REQUEST
                 )
             errors = []
+            valid_permissions = []
  
+            # Validation reads the cached feature catalogue; the valid rows are then written together
             for perm in permissions_payload:
                 perm["permissions_user_roles_keys"] = role_key
                 perm["permissions_branches_unique_id"] = branch_key
@@ -105,9 +113,11 @@ class UserRoleListCreateView(APIView):
  
                 serializer = PermissionSerializer(data=perm, context={"request": request})
                 if serializer.is_valid():
-                    serializer.save()
+                    valid_permissions.append(serializer.validated_data)
                 else:
                     errors.append(serializer.errors)
+
+            upsert_permissions(role_key, branch_key, valid_permissions)
  
             return Response({
                 "success": True,
@@ -119,6 +129,14 @@ class UserRoleListCreateView(APIView):
                 }
             }, status=status.HTTP_201_CREATED)
  
+        except AuthServiceUnavailable as e:
+            return Response({
+                "success": False,
+                "status": 503,
+                "message": "Auth service unavailable",
+                "error": str(e)
+            }, status=status.HTTP_503_SERVICE_UNAVAILABLE)
+
         except Exception as e:
             return Response({
                 "success": False,
@@ -129,7 +147,6 @@ class UserRoleListCreateView(APIView):
         
 class UserRoleDetailView(APIView):
 
-    @transaction.atomic
     def get(self, request, user_roles_keys):
         try:
             product_key = request.query_params.get('product_key', 'whatsapp')
@@ -142,28 +159,33 @@ class UserRoleDetailView(APIView):
                     "message": "branch key are required."
                 }, status=status.HTTP_400_BAD_REQUEST)
 
-            headers = {
-                "X-Product-Key": product_key,
-                "X-Branch-Key": branch_key
-            }
-
-            url = f"{settings.AUTH_SERVICE_BASE_URL}/api/v1/roles/{user_roles_keys}/"
-            response = requests.get(url, headers=headers)
+            # Served from the role cache; see role_cache.py
+            status_code, body = get_cached_role_response(
+                product_key, branch_key, f"api/v1/roles/{user_roles_keys}/", role_key=user_roles_keys
+            )
 
-            if response.status_code == 200:
+            if status_code == 200:
                 return Response({
                     "success": True,
                     "status": 200,
                     "message": "Role fetched successfully",
-                    "data": response.json().get("data", {})
+                    "data": body.get("data", {})
                 }, status=status.HTTP_200_OK)
 
             return Response({
                 "success": False,
-                "status": response.status_code,
-                "message": response.json().get("message"),
-                "error": response.json().get("error")
-            }, status=response.status_code)
+                "status": status_code,
+                "message": body.get("message"),
+                "error": body.get("error")
+            }, status=status_code)
+
+        except AuthServiceUnavailable as e:
+            return Response({
+                "success": False,
+                "status": 503,
+                "message": "Auth service unavailable",
+                "error": str(e)
+            }, status=status.HTTP_503_SERVICE_UNAVAILABLE)
 
         except Exception as e:
             return Response({
@@ -192,10 +214,11 @@ class UserRoleDetailView(APIView):
                 "Content-Type": "application/json"
             }
 
-            url = f"{settings.AUTH_SERVICE_BASE_URL}/api/v1/roles/{user_roles_keys}/"
-            response = requests.put(url, headers=headers, json=request.data)
+            url = f"api/v1/roles/{user_roles_keys}/"
+            response = get_auth_service_client().put(url, headers=headers, json=request.data)
 
             if response.status_code == 200:
+                invalidate_role_cache(product_key, branch_key)
                 return Response({
                     "success": True,
                     "status": 200,
@@ -210,6 +233,14 @@ class UserRoleDetailView(APIView):
                 "error": response.json().get("error")
             }, status=response.status_code)
 
+        except AuthServiceUnavailable as e:
+            return Response({
+                "success": False,
+                "status": 503,
+                "message": "Auth service unavailable",
+                "error": str(e)
+            }, status=status.HTTP_503_SERVICE_UNAVAILABLE)
+
         except Exception as e:
             return Response({
                 "success": False,
@@ -239,10 +270,11 @@ class UserRoleDetailView(APIView):
                     "Content-Type": "application/json"
                 }
 
-                url = f"{settings.AUTH_SERVICE_BASE_URL}/api/v1/roles/{user_roles_keys}/"
-                response = requests.patch(url, headers=headers, json=request.data)
+                url = f"api/v1/roles/{user_roles_keys}/"
+                response = get_auth_service_client().patch(url, headers=headers, json=request.data)
 
                 if response.status_code == 200:
+                    invalidate_role_cache(product_key, branch_key)
                     
                     is_active = response.json().get('data', {}).get('is_active', True)
 
@@ -252,8 +284,10 @@ class UserRoleDetailView(APIView):
                         permissions_is_deleted = False
                     ).update(
                         permissions_is_active=is_active,
-                        permissions_updated_by=str(request.user.id)
+                        permissions_updated_by=str(request.user.id),
+                        permissions_updated_at=timezone.now()
                     )
+                    invalidate_permissions(user_roles_keys, branch_key)
 
                     return Response({
                         "success": True,
@@ -269,6 +303,14 @@ class UserRoleDetailView(APIView):
                     "error": response.json().get("error")
                 }, status=response.status_code)
 
+        except AuthServiceUnavailable as e:
+            return Response({
+                "success": False,
+                "status": 503,
+                "message": "Auth service unavailable",
+                "error": str(e)
+            }, status=status.HTTP_503_SERVICE_UNAVAILABLE)
+
         except Exception as e:
             return Response({
                 "success": False,
@@ -295,16 +337,18 @@ class UserRoleDetailView(APIView):
                 "X-Branch-Key": branch_key
             }
 
-            url = f"{settings.AUTH_SERVICE_BASE_URL}/api/v1/roles/{user_roles_keys}/"
-            response = requests.delete(url, headers=headers)
+            url = f"api/v1/roles/{user_roles_keys}/"
+            response = get_auth_service_client().delete(url, headers=headers)
 
             if response.status_code == 200:
+                invalidate_role_cache(product_key, branch_key)
 
                 Permission.objects.filter(
                     permissions_user_roles_keys=user_roles_keys,
                     permissions_branches_unique_id=branch_key,
                     permissions_is_active = True
-                ).update(permissions_is_deleted=True)
+                ).update(permissions_is_deleted=True, permissions_updated_at=timezone.now())
+                invalidate_permissions(user_roles_keys, branch_key)
 
                 return Response({
                     "success": True,
@@ -319,6 +363,14 @@ class UserRoleDetailView(APIView):
                 "error": response.json().get("error")
             }, status=response.status_code)
 
+        except AuthServiceUnavailable as e:
+            return Response({
+                "success": False,
+                "status": 503,
+                "message": "Auth service unavailable",
+                "error": str(e)
+            }, status=status.HTTP_503_SERVICE_UNAVAILABLE)
+
         except Exception as e:
             return Response({
                 "success": False,
@@ -0,0 +1,91 @@
+import statistics
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.http import QueryDict
+
+from apps.audiences.filters import filter_audiences
+from apps.audiences.management.commands.benchmark_attribute_segments import (
+    DEFAULT_SEGMENTS,
+    Command as AttributeSegmentsBenchmark,
+)
+from apps.segments.membership import rebuild_segment_members, refresh_segment_members, segment_member_page
+from apps.segments.models import Segment
+
+PAGE_SIZE = 50
+REFRESH_AUDIENCES = 100
+
+
+# Times saved segments on the synthetic audiences of benchmark_attribute_segments:
+# the size and first member page read from segment_members against recomputing
+# them from the filters, plus a full rebuild and an incremental refresh of
+# REFRESH_AUDIENCES audiences. Rows are inserted inside a transaction that is
+# rolled back.
+class Command(BaseCommand):
+    help = "Benchmark saved segment membership reads and refreshes"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=1000000)
+        parser.add_argument('--repeat', type=int, default=5)
+        parser.add_argument('--segments', nargs='+', default=DEFAULT_SEGMENTS, help="Query strings of attribute filters")
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'postgresql':
+            raise CommandError("The benchmark needs a PostgreSQL database")
+
+        with transaction.atomic():
+            AttributeSegmentsBenchmark().insert_rows(options['rows'])
+            self.stdout.write(
+                f"{'size':>8} {'rebuild ms':>10} {'refresh ms':>10} {'size ms':>8} {'count ms':>9} "
+                f"{'page ms':>8} {'recompute ms':>12}  segment"
+            )
+            for query in options['segments']:
+                timings = self.run_segment(query, options['repeat'])
+                self.stdout.write(
+                    f"{timings['size']:>8} {timings['rebuild'] * 1000:>10.2f} {timings['refresh'] * 1000:>10.2f} "
+                    f"{timings['stored_size'] * 1000:>8.2f} {timings['count'] * 1000:>9.2f} "
+                    f"{timings['page'] * 1000:>8.2f} {timings['recompute_page'] * 1000:>12.2f}  {query}"
+                )
+            transaction.set_rollback(True)
+
+    def run_segment(self, query, repeat):
+        params = QueryDict(query)
+        filters = {key: params.getlist(key) if key == 'attribute' else params[key] for key in params}
+        segment = Segment.objects.create(segments_name=query, segments_filters=filters)
+        audiences = filter_audiences(params)
+
+        started = time.perf_counter()
+        size = rebuild_segment_members(segment)
+        rebuild_elapsed = time.perf_counter() - started
+
+        audience_ids = list(audiences.order_by('audiences_id').values_list('audiences_id', flat=True)[:REFRESH_AUDIENCES])
+        timings = {'stored_size': [], 'count': [], 'page': [], 'recompute_page': [], 'refresh': []}
+        for _ in range(repeat):
+            started = time.perf_counter()
+            Segment.objects.values_list('segments_size', flat=True).get(segments_id=segment.segments_id)
+            timings['stored_size'].append(time.perf_counter() - started)
+
+            started = time.perf_counter()
+            audiences.count()
+            timings['count'].append(time.perf_counter() - started)
+
+            started = time.perf_counter()
+            page, _ = segment_member_page(segment, 0, PAGE_SIZE)
+            list(page)
+            timings['page'].append(time.perf_counter() - started)
+
+            started = time.perf_counter()
+            list(audiences.order_by('audiences_id')[:PAGE_SIZE])
+            timings['recompute_page'].append(time.perf_counter() - started)
+
+            started = time.perf_counter()
+            refresh_segment_members(audience_ids)
+            timings['refresh'].append(time.perf_counter() - started)
+
+        # Only this segment is refreshed and measured on the next iteration
+        Segment.objects.filter(segments_id=segment.segments_id).update(segments_is_deleted=True)
+
+        result = {name: statistics.median(values) for name, values in timings.items()}
+        result.update(size=size, rebuild=rebuild_elapsed)
+        return result
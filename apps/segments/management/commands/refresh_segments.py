@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+
+from apps.segments.membership import rebuild_segment_members
+from apps.segments.models import Segment
+
+
+# Rebuilds segment membership from the segment definitions. Membership is
+# otherwise kept up to date by the audience, attribute value, label and
+# attribute write paths; run this after changing rows outside of them.
+class Command(BaseCommand):
+    help = "Rebuild the segment_members table from the segment definitions"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--segment', type=int, action='append', help="Segment ID to rebuild (repeatable)")
+
+    def handle(self, *args, **options):
+        segments = Segment.objects.filter(segments_is_deleted=False).order_by('segments_id')
+        if options['segment']:
+            segments = segments.filter(segments_id__in=options['segment'])
+        for segment in segments:
+            size = rebuild_segment_members(segment)
+            self.stdout.write(f"Segment {segment.segments_id} ({segment.segments_name}): {size} members")
@@ -0,0 +1,159 @@
+from django.db import connection, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from apps.audiences.filters import filter_audiences
+from apps.audiences.models import Audience
+from apps.common.filters import FilterError
+from apps.segments.models import Segment, SegmentMember
+
+
+REFRESH_BATCH_SIZE = 5000
+
+
+# The audiences matching a segment's definition, or None when the definition
+# no longer resolves (a label or attribute it names was deleted); such a
+# segment has no members.
+def segment_audiences(segment):
+    try:
+        return filter_audiences(segment.segments_filters or {})
+    except FilterError:
+        return None
+
+
+# One page of a segment's audiences in audiences_id order, read from
+# segment_members through its unique index. Returns (audiences, next_after),
+# next_after being None on the last page.
+def segment_member_page(segment, after, limit):
+    # Fetch one extra member to know whether another page exists
+    member_ids = list(SegmentMember.objects.filter(
+        segment_members_segments_id=segment.segments_id,
+        segment_members_audiences_id__gt=after
+    ).order_by('segment_members_audiences_id').values_list('segment_members_audiences_id', flat=True)[:limit + 1])
+    has_more = len(member_ids) > limit
+    member_ids = member_ids[:limit]
+
+    audiences = Audience.objects.filter(audiences_id__in=member_ids).order_by('audiences_id')
+    return audiences, member_ids[-1] if has_more else None
+
+
+# Returns the (added, removed) audience IDs that bring the segment's members
+# among audience_ids in line with its definition, audiences being the
+# segment_audiences of that definition.
+def _membership_changes(segment, audiences, audience_ids):
+    matching = set()
+    if audiences is not None:
+        matching = set(audiences.filter(audiences_id__in=audience_ids).values_list('audiences_id', flat=True))
+    current = set(SegmentMember.objects.filter(
+        segment_members_segments_id=segment.segments_id,
+        segment_members_audiences_id__in=audience_ids
+    ).values_list('segment_members_audiences_id', flat=True))
+    return matching - current, current - matching
+
+
+def _apply_membership_changes(segment, added, removed):
+    if removed:
+        SegmentMember.objects.filter(
+            segment_members_segments_id=segment.segments_id,
+            segment_members_audiences_id__in=removed
+        ).delete()
+    if added:
+        SegmentMember.objects.bulk_create([
+            SegmentMember(segment_members_segments_id_id=segment.segments_id, segment_members_audiences_id_id=audience_id)
+            for audience_id in added
+        ], batch_size=REFRESH_BATCH_SIZE)
+    Segment.objects.filter(segments_id=segment.segments_id).update(
+        segments_size=F('segments_size') + len(added) - len(removed)
+    )
+
+
+# Brings segment membership up to date for audiences that were just created,
+# changed or deleted, or whose attribute values were. Cost depends on the
+# number of audiences and segments, not on segment sizes. Each saved segment's
+# definition is resolved once per call and queried once per batch, so the cost
+# every audience write pays grows linearly with the number of segments. A
+# segment row is locked (in segments_id order) only when its members change,
+# and the changes are recomputed under the lock so concurrent refreshes count
+# each one once.
+def refresh_segment_members(audience_ids):
+    audience_ids = sorted(set(audience_ids))
+    if not audience_ids:
+        return
+
+    segments = Segment.objects.filter(segments_is_deleted=False).order_by('segments_id')
+    for segment in segments:
+        audiences = segment_audiences(segment)
+        for start in range(0, len(audience_ids), REFRESH_BATCH_SIZE):
+            batch = audience_ids[start:start + REFRESH_BATCH_SIZE]
+            added, removed = _membership_changes(segment, audiences, batch)
+            if not (added or removed):
+                continue
+            with transaction.atomic():
+                locked = Segment.objects.select_for_update().get(segments_id=segment.segments_id)
+                if locked.segments_filters != segment.segments_filters:
+                    # Redefined by a concurrent update since it was read
+                    segment, audiences = locked, segment_audiences(locked)
+                added, removed = _membership_changes(locked, audiences, batch)
+                if added or removed:
+                    _apply_membership_changes(locked, added, removed)
+
+
+# Recomputes a segment's members from its definition with one INSERT ...
+# SELECT. Used when a segment is created or its filters change, and by the
+# refresh_segments command. Returns the new size.
+@transaction.atomic
+def rebuild_segment_members(segment):
+    segment = Segment.objects.select_for_update().get(segments_id=segment.segments_id)
+    SegmentMember.objects.filter(segment_members_segments_id=segment.segments_id).delete()
+
+    size = 0
+    audiences = None if segment.segments_is_deleted else segment_audiences(segment)
+    if audiences is not None:
+        sql, params = audiences.values('audiences_id').query.sql_with_params()
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"""
+                INSERT INTO segment_members (segment_members_segments_id, segment_members_audiences_id)
+                SELECT %s, matching.audiences_id FROM ({sql}) AS matching
+                """,
+                (segment.segments_id, *params)
+            )
+            size = cursor.rowcount
+
+    Segment.objects.filter(segments_id=segment.segments_id).update(
+        segments_size=size,
+        segments_refreshed_at=timezone.now()
+    )
+    return size
+
+
+def _referenced_label_names(filters):
+    names = set()
+    if filters.get('audiences_label'):
+        names.add(filters['audiences_label'].strip().lower())
+    if filters.get('audiences_labels'):
+        names.update(name.strip().lower() for name in filters['audiences_labels'].split(',') if name.strip())
+    return names
+
+
+def _referenced_attribute_names(filters):
+    conditions = filters.get('attribute') or []
+    if isinstance(conditions, str):
+        conditions = [conditions]
+    return {condition.partition(':')[0].strip().lower() for condition in conditions}
+
+
+# Rebuilds the segments whose definition names one of the given labels or
+# attributes. Called when labels or attributes are renamed, deactivated or
+# deleted, since their definitions then resolve differently without any
+# audience row changing.
+def rebuild_segments_referencing(label_names=(), attribute_names=()):
+    label_names = {name.strip().lower() for name in label_names if name}
+    attribute_names = {name.strip().lower() for name in attribute_names if name}
+    if not (label_names or attribute_names):
+        return
+
+    for segment in Segment.objects.filter(segments_is_deleted=False).order_by('segments_id'):
+        filters = segment.segments_filters or {}
+        if _referenced_label_names(filters) & label_names or _referenced_attribute_names(filters) & attribute_names:
+            rebuild_segment_members(segment)
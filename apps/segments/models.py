@@ -0,0 +1,54 @@
+from django.db import models
+
+from apps.audiences.models import Audience
+
+# Create your models here.
+
+
+# Model for Segment, a saved audience filter. segments_filters holds the
+# audience list filter parameters; segments_size is the number of rows in
+# segment_members, kept up to date as members are added and removed.
+class Segment(models.Model):
+    segments_id = models.AutoField(primary_key=True)
+    segments_name = models.CharField(max_length=255, null=True, blank=True)
+    segments_filters = models.JSONField(default=dict)
+    segments_size = models.PositiveIntegerField(default=0)
+    segments_refreshed_at = models.DateTimeField(null=True, blank=True)
+    segments_created_by = models.CharField(max_length=255, null=True, blank=True)
+    segments_updated_by = models.CharField(max_length=255, null=True, blank=True)
+    segments_is_active = models.BooleanField(default=True)
+    segments_is_deleted = models.BooleanField(default=False)
+    segments_created_at = models.DateTimeField(auto_now_add=True)
+    segments_updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = "segments"
+
+
+# Model for SegmentMember, one row per audience currently matching a segment
+class SegmentMember(models.Model):
+    segment_members_id = models.AutoField(primary_key=True)
+    segment_members_segments_id = models.ForeignKey(
+        Segment,
+        to_field="segments_id",
+        db_column="segment_members_segments_id",
+        on_delete=models.CASCADE,
+        # The unique constraint below already leads with this column
+        db_index=False
+    )
+    segment_members_audiences_id = models.ForeignKey(
+        Audience,
+        to_field="audiences_id",
+        db_column="segment_members_audiences_id",
+        on_delete=models.CASCADE
+    )
+
+    class Meta:
+        db_table = "segment_members"
+        constraints = [
+            # Also serves member reads: segment = X ordered by audience ID
+            models.UniqueConstraint(
+                fields=['segment_members_segments_id', 'segment_members_audiences_id'],
+                name='segment_members_segment_audience_uniq'
+            ),
+        ]
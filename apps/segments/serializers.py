@@ -0,0 +1,103 @@
+from django.db import transaction
+from rest_framework import serializers
+
+from apps.audiences.filters import AUDIENCE_FILTER_PARAMS, filter_audiences
+from apps.common.filters import FilterError
+from apps.segments.membership import rebuild_segment_members
+from apps.segments.models import Segment
+
+
+# Serializer for Segment model, handling creation and updates. Membership is
+# rebuilt whenever the filters are set.
+class SegmentSerializer(serializers.Serializer):
+    segments_id = serializers.IntegerField(read_only=True)
+    segments_name = serializers.CharField(
+        max_length=255,
+        required=True,
+        error_messages={
+            'required': 'Segment Name is required.',
+            'blank': 'Segment Name cannot be empty.',
+            'max_length': 'Segment Name cannot exceed 255 characters.'
+        })
+    segments_filters = serializers.JSONField(
+        required=True,
+        error_messages={
+            'required': 'Segment filters are required.'
+        })
+    segments_size = serializers.IntegerField(read_only=True)
+    segments_refreshed_at = serializers.DateTimeField(read_only=True)
+    segments_created_by = serializers.CharField(read_only=True)
+    segments_updated_by = serializers.CharField(read_only=True)
+    segments_is_active = serializers.BooleanField(default=True)
+    segments_is_deleted = serializers.BooleanField(read_only=True)
+    segments_created_at = serializers.DateTimeField(read_only=True)
+    segments_updated_at = serializers.DateTimeField(read_only=True)
+
+    def validate_segments_name(self, value):
+        instance = getattr(self, 'instance', None)
+
+        queryset = Segment.objects.filter(
+            segments_name__iexact=value.strip(),
+            segments_is_deleted=False
+        )
+
+        if instance:
+            queryset = queryset.exclude(segments_id=instance.segments_id)
+
+        if queryset.exists():
+            raise serializers.ValidationError(f"segment with this name {value} already exists.")
+
+        return value.strip()
+
+    # Filters use the audience list parameters, e.g.
+    #   {"audiences_opted": "in", "audiences_labels": "vip", "attribute": ["City:Pune"]}
+    def validate_segments_filters(self, value):
+        if not isinstance(value, dict):
+            raise serializers.ValidationError("Segment filters must be an object of audience filter parameters.")
+
+        for param, param_value in value.items():
+            if param not in AUDIENCE_FILTER_PARAMS:
+                raise serializers.ValidationError(f"Unknown segment filter '{param}'.")
+            # attribute may be repeated, like the query parameter
+            param_values = param_value if param == 'attribute' and isinstance(param_value, list) else [param_value]
+            if not all(isinstance(item, str) for item in param_values):
+                raise serializers.ValidationError(f"Segment filter '{param}' must be a string.")
+
+        try:
+            filter_audiences(value)
+        except FilterError as e:
+            raise serializers.ValidationError(e.message)
+        return value
+
+    # Creates a new segment instance and fills its membership
+    @transaction.atomic()
+    def create(self, validated_data):
+        segment = Segment.objects.create(
+            segments_name=validated_data.get('segments_name'),
+            segments_filters=validated_data.get('segments_filters'),
+            segments_is_active=validated_data.get('segments_is_active', True),
+            segments_created_by=None,
+        )
+        rebuild_segment_members(segment)
+        segment.refresh_from_db()
+        return segment
+
+    # Updates an existing segment instance, rebuilding membership when the filters change
+    @transaction.atomic()
+    def update(self, instance, validated_data):
+        filters_changed = (
+            "segments_filters" in validated_data
+            and validated_data["segments_filters"] != instance.segments_filters
+        )
+        instance.segments_name = validated_data.get("segments_name", instance.segments_name)
+        instance.segments_filters = validated_data.get("segments_filters", instance.segments_filters)
+        instance.segments_is_active = validated_data.get("segments_is_active", instance.segments_is_active)
+        instance.segments_updated_by = None
+        # segments_size is maintained by the membership refresh, never written from here
+        instance.save(update_fields=[
+            'segments_name', 'segments_filters', 'segments_is_active', 'segments_updated_by', 'segments_updated_at'
+        ])
+        if filters_changed:
+            rebuild_segment_members(instance)
+            instance.refresh_from_db()
+        return instance
@@ -0,0 +1,71 @@
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from apps.labels.models import Label
+from apps.segments.models import Segment, SegmentMember
+
+
+SEGMENT_URL = '/api/v1/whatsapp/segment/'
+AUDIENCE_URL = '/api/v1/whatsapp/audience/'
+AUDIENCE_IMPORT_URL = '/api/v1/whatsapp/audience/import/'
+LABEL_URL = '/api/v1/whatsapp/label/'
+
+
+# segments_size is kept in step with segment_members by every write path
+# instead of being recounted on read.
+class SegmentMembershipTests(TestCase):
+
+    def setUp(self):
+        self.client = APIClient()
+        self.vip = Label.objects.create(labels_name='Vip')
+        response = self.client.post(SEGMENT_URL, {
+            'segments_name': 'VIP customers',
+            'segments_filters': {'audiences_label': 'vip'}
+        }, format='json')
+        self.assertEqual(response.status_code, 201)
+        self.segment = Segment.objects.get(segments_id=response.json()['data']['segments_id'])
+
+    def assertSizeMatchesMembers(self, expected):
+        self.segment.refresh_from_db()
+        members = SegmentMember.objects.filter(segment_members_segments_id=self.segment.segments_id).count()
+        self.assertEqual(self.segment.segments_size, members)
+        self.assertEqual(members, expected)
+
+    def create_audience(self, name, phone_number, labels):
+        response = self.client.post(AUDIENCE_URL, {
+            'audiences_name': name,
+            'audiences_phone_number': phone_number,
+            'audiences_labels': labels
+        }, format='json')
+        self.assertEqual(response.status_code, 201)
+        return response.json()['data']['audiences_id']
+
+    def test_size_follows_create_update_import_and_label_delete(self):
+        first = self.create_audience('Asha Rao', '9000000001', [self.vip.labels_id])
+        self.create_audience('Vikram Das', '9000000002', [])
+        self.assertSizeMatchesMembers(1)
+
+        response = self.client.put(f'{AUDIENCE_URL}{first}/', {'audiences_labels': []}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertSizeMatchesMembers(0)
+
+        response = self.client.post(AUDIENCE_IMPORT_URL, {'audiences': [
+            {'audiences_name': 'Neha Jain', 'audiences_phone_number': '9000000003', 'audiences_labels': ['vip']},
+            {'audiences_name': 'Kabir Shah', 'audiences_phone_number': '9000000004', 'audiences_labels': ['vip']},
+        ]}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertSizeMatchesMembers(2)
+
+        response = self.client.delete(f'{LABEL_URL}{self.vip.labels_id}/')
+        self.assertEqual(response.status_code, 200)
+        self.assertSizeMatchesMembers(0)
+
+    def test_redefining_segment_rebuilds_members(self):
+        self.create_audience('Asha Rao', '9000000001', [self.vip.labels_id])
+        self.create_audience('Vikram Das', '9000000002', [])
+
+        response = self.client.put(f'{SEGMENT_URL}{self.segment.segments_id}/', {
+            'segments_filters': {}
+        }, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertSizeMatchesMembers(2)
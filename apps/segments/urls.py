@@ -0,0 +1,12 @@
+from django.urls import path
+
+from apps.segments.views import SegmentListCreateView, SegmentDetailView, SegmentMemberListView
+
+urlpatterns = [
+    # URL for listing all Segments and creating a new one
+    path('segment/', SegmentListCreateView.as_view(), name='segment-list-create'),
+    # URL for retrieving, updating, or soft deleting a specific Segment by its ID
+    path('segment/<int:segments_id>/', SegmentDetailView.as_view(), name='segment-detail'),
+    # URL for the audiences currently in a Segment
+    path('segment/<int:segments_id>/members/', SegmentMemberListView.as_view(), name='segment-members'),
+]
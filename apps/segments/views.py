@@ -0,0 +1,225 @@
+from rest_framework.views import APIView
+from django.db import transaction
+from django.core.exceptions import ObjectDoesNotExist
+from rest_framework.response import Response
+from rest_framework import status
+from apps.audiences.pagination import CursorPaginationError, parse_cursor_limit
+from apps.audiences.serializers import AudienceSerializer
+from apps.common.filters import BooleanFilter, DateRangeFilter, FilterError, apply_filters
+from apps.segments.membership import segment_member_page
+from apps.segments.models import Segment, SegmentMember
+from apps.segments.serializers import SegmentSerializer
+
+
+class SegmentListCreateView(APIView):
+    query_filters = (
+        BooleanFilter('segments_status', 'segments_is_active'),
+        DateRangeFilter('created_at', 'segments_created_at'),
+    )
+
+    # GET requests to fetch all non-deleted segments with their sizes
+    def get(self, request):
+        try:
+            try:
+                segments = apply_filters(
+                    Segment.objects.filter(segments_is_deleted=False), request.GET, self.query_filters
+                )
+            except FilterError as e:
+                return Response({
+                    "success": False,
+                    "status": 400,
+                    "message": e.message,
+                    "error": e.error
+                }, status=status.HTTP_400_BAD_REQUEST)
+
+            serializer = SegmentSerializer(segments, many=True)
+            return Response({
+                "success": True,
+                "status": 200,
+                "message": "Fetched all segment data successfully",
+                "data": serializer.data
+            }, status=status.HTTP_200_OK)
+        except Exception as e:
+            return Response({
+                "success": False,
+                "status": 500,
+                "message": "Internal server error",
+                "error": str(e)
+            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+    # POST requests to create a new segment
+    @transaction.atomic
+    def post(self, request):
+        try:
+            serializer = SegmentSerializer(data=request.data, context={"request": request})
+
+            if serializer.is_valid():
+                serializer.save()
+                return Response({
+                    "success": True,
+                    "status": 201,
+                    "message": "Segment created successfully",
+                    "data": serializer.data
+                }, status=status.HTTP_201_CREATED)
+
+            error_message = list(serializer.errors.values())[0][0] if serializer.errors else "Invalid request."
+            return Response({
+                "success": False,
+                "status": 400,
+                "message": "Invalid Input",
+                "error": error_message
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        except Exception as e:
+            return Response({
+                "status": 500,
+                "success": False,
+                "message": "Internal server error",
+                "error": str(e)
+            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+class SegmentDetailView(APIView):
+
+    # Retrieve segment by ID if not soft deleted
+    def get(self, request, segments_id):
+        try:
+            segment = Segment.objects.get(segments_id=segments_id, segments_is_deleted=False)
+            serializer = SegmentSerializer(segment)
+            return Response({
+                "success": True,
+                "status": 200,
+                "message": "Fetched Segment by ID Successfully",
+                "data": serializer.data
+            }, status=status.HTTP_200_OK)
+
+        except ObjectDoesNotExist:
+            return Response({
+                "success": False,
+                "status": 404,
+                "error": "Segment not found"
+            }, status=status.HTTP_404_NOT_FOUND)
+
+        except Exception as e:
+            return Response({
+                "status": 500,
+                "success": False,
+                "message": "Internal server error",
+                "error": str(e)
+            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+    # update the Segment
+    @transaction.atomic
+    def put(self, request, segments_id):
+        try:
+            segment = Segment.objects.get(segments_id=segments_id, segments_is_deleted=False)
+        except ObjectDoesNotExist:
+            return Response({
+                "success": False,
+                "status": 404,
+                "error": "Segment not found"
+            }, status=status.HTTP_404_NOT_FOUND)
+        try:
+            serializer = SegmentSerializer(segment, data=request.data, partial=True, context={'request': request})
+            if serializer.is_valid():
+                serializer.save()
+                return Response({
+                    "success": True,
+                    "status": 200,
+                    "message": "Segment updated successfully",
+                    "data": serializer.data
+                }, status=status.HTTP_200_OK)
+
+            error_message = list(serializer.errors.values())[0][0] if serializer.errors else "Invalid request for update."
+            return Response({
+                "success": False,
+                "status": 400,
+                "error": error_message
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        except Exception as e:
+            return Response({
+                "status": 500,
+                "success": False,
+                "message": "Internal server error",
+                "error": str(e)
+            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+    # Mark the Segment as soft deleted and drop its members
+    @transaction.atomic
+    def delete(self, request, segments_id):
+        try:
+            segment = Segment.objects.select_for_update().get(segments_id=segments_id, segments_is_deleted=False)
+            segment.segments_is_deleted = True
+            segment.segments_size = 0
+            segment.save()
+
+            SegmentMember.objects.filter(segment_members_segments_id=segment).delete()
+
+            return Response({
+                "success": True,
+                "status": 200,
+                "message": "Segment deleted successfully"
+            }, status=status.HTTP_200_OK)
+
+        except ObjectDoesNotExist:
+            return Response({
+                "success": False,
+                "status": 404,
+                "error": "Segment not found"
+            }, status=status.HTTP_404_NOT_FOUND)
+        except Exception as e:
+            return Response({
+                "status": 500,
+                "success": False,
+                "message": "Internal server error",
+                "error": str(e)
+            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+class SegmentMemberListView(APIView):
+
+    # GET one page of a segment's audiences in audiences_id order, read from
+    # segment_members. Pass the returned next value as after for the next page.
+    def get(self, request, segments_id):
+        try:
+            try:
+                segment = Segment.objects.get(segments_id=segments_id, segments_is_deleted=False)
+            except ObjectDoesNotExist:
+                return Response({
+                    "success": False,
+                    "status": 404,
+                    "error": "Segment not found"
+                }, status=status.HTTP_404_NOT_FOUND)
+
+            try:
+                limit = parse_cursor_limit(request.GET.get('limit'))
+                after = int(request.GET.get('after') or 0)
+            except (CursorPaginationError, ValueError) as e:
+                return Response({
+                    "success": False,
+                    "status": 400,
+                    "message": "Invalid pagination parameters",
+                    "error": str(e)
+                }, status=status.HTTP_400_BAD_REQUEST)
+
+            audiences, next_after = segment_member_page(segment, after, limit)
+            serializer = AudienceSerializer(audiences, many=True)
+            return Response({
+                "success": True,
+                "status": 200,
+                "message": "Fetched segment members successfully",
+                "data": serializer.data,
+                "size": segment.segments_size,
+                "pagination": {
+                    "limit": limit,
+                    "next": next_after
+                }
+            }, status=status.HTTP_200_OK)
+        except Exception as e:
+            return Response({
+                "success": False,
+                "status": 500,
+                "message": "Internal server error",
+                "error": str(e)
+            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
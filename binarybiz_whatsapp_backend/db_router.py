@@ -0,0 +1,107 @@
+import math
+import time
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import connections
+
+
+PRIMARY_DB_ALIAS = 'default'
+REPLICA_DB_ALIAS = 'replica'
+DEFAULT_REPLICA_STICKY_SECONDS = 5
+REPLICA_STICKY_COOKIE = 'db_read_primary'
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+# Whether the client wrote within the sticky window (set from the cookie) and
+# whether the current request has written. Either sends its reads to the primary.
+_client_pinned = ContextVar('db_client_pinned', default=False)
+_wrote = ContextVar('db_wrote', default=False)
+
+
+def replica_configured():
+    return REPLICA_DB_ALIAS in settings.DATABASES
+
+
+# Sends reads to the optional replica database and writes to the primary.
+# Reads stay on the primary inside a transaction, after a write in the same
+# request, and for DB_REPLICA_STICKY_SECONDS after a write by the same client
+# (see ReplicaStickinessMiddleware), so clients read their own writes.
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        if not replica_configured() or _client_pinned.get() or _wrote.get():
+            return PRIMARY_DB_ALIAS
+        if connections[PRIMARY_DB_ALIAS].in_atomic_block:
+            return PRIMARY_DB_ALIAS
+        return REPLICA_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        _wrote.set(True)
+        return PRIMARY_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == PRIMARY_DB_ALIAS
+
+
+# Pins a client's reads to the primary for DB_REPLICA_STICKY_SECONDS after a
+# request of theirs wrote (or used an unsafe method), through a short-lived
+# cookie holding the end of the window. Does nothing unless a replica is
+# configured. Sync and async capable, so it adds no thread switches in front
+# of the async views under ASGI.
+class ReplicaStickinessMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        if not replica_configured():
+            return self.get_response(request)
+
+        tokens = self.start_request(request)
+        try:
+            return self.finish_request(request, self.get_response(request))
+        finally:
+            self.reset(tokens)
+
+    async def __acall__(self, request):
+        if not replica_configured():
+            return await self.get_response(request)
+
+        tokens = self.start_request(request)
+        try:
+            return self.finish_request(request, await self.get_response(request))
+        finally:
+            self.reset(tokens)
+
+    def start_request(self, request):
+        return _client_pinned.set(self.pinned_until(request) > time.time()), _wrote.set(False)
+
+    def finish_request(self, request, response):
+        if _wrote.get() or request.method not in SAFE_METHODS:
+            sticky_seconds = getattr(settings, 'DB_REPLICA_STICKY_SECONDS', DEFAULT_REPLICA_STICKY_SECONDS)
+            response.set_cookie(
+                REPLICA_STICKY_COOKIE, str(math.ceil(time.time() + sticky_seconds)),
+                max_age=sticky_seconds, httponly=True, samesite='Lax'
+            )
+        return response
+
+    def reset(self, tokens):
+        pinned_token, wrote_token = tokens
+        _client_pinned.reset(pinned_token)
+        _wrote.reset(wrote_token)
+
+    def pinned_until(self, request):
+        try:
+            return float(request.COOKIES.get(REPLICA_STICKY_COOKIE, 0))
+        except ValueError:
+            return 0
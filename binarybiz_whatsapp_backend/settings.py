@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
+from importlib.util import find_spec
 from pathlib import Path
 import os
 
@@ -47,6 +48,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
     
     'rest_framework',
     'corsheaders',
@@ -58,6 +60,7 @@ INSTALLED_APPS = [
     'apps.media_libraries',
     'apps.profile_chat_settings',
     'apps.opt_keywords',
+    'apps.segments',
     'apps.role_permissions_management.feature_actions',
     'apps.role_permissions_management.features',
     'apps.role_permissions_management.permissions',
@@ -73,6 +76,7 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'binarybiz_whatsapp_backend.db_router.ReplicaStickinessMiddleware',
 ]
 
 ROOT_URLCONF = 'binarybiz_whatsapp_backend.urls'
@@ -98,6 +102,11 @@ WSGI_APPLICATION = 'binarybiz_whatsapp_backend.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 
+# Persistent connections are per thread. Under ASGI every request may run in a
+# different thread, so they are off by default there (asgi.py sets
+# DJANGO_SERVER_INTERFACE); use DB_POOL=true for connection reuse instead.
+SERVING_ASGI = os.environ.get('DJANGO_SERVER_INTERFACE') == 'asgi'
+
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.postgresql',
@@ -106,9 +115,41 @@ DATABASES = {
         'PASSWORD': 'root',
         'HOST': 'localhost',
         'PORT': '5432',
+        # Keep connections open between requests and check them before reuse
+        'CONN_MAX_AGE': int(os.environ.get('DB_CONN_MAX_AGE', 0 if SERVING_ASGI else 60)),
+        'CONN_HEALTH_CHECKS': os.environ.get('DB_CONN_HEALTH_CHECKS', 'true').lower() == 'true',
     }
 }
 
+# With DB_POOL=true and psycopg[pool] (psycopg 3) installed, connections come
+# from psycopg's pool instead of being kept per thread. This is the way to
+# reuse connections under ASGI.
+if os.environ.get('DB_POOL', 'false').lower() == 'true' and find_spec('psycopg') and find_spec('psycopg_pool'):
+    DATABASES['default']['CONN_MAX_AGE'] = 0
+    DATABASES['default']['OPTIONS'] = {
+        'pool': {
+            'min_size': int(os.environ.get('DB_POOL_MIN_SIZE', 2)),
+            'max_size': int(os.environ.get('DB_POOL_MAX_SIZE', 10)),
+            'timeout': float(os.environ.get('DB_POOL_TIMEOUT', 10)),
+        }
+    }
+
+# Optional read replica. When DB_REPLICA_HOST is set, reads go to the replica
+# except for DB_REPLICA_STICKY_SECONDS after the same client wrote.
+if os.environ.get('DB_REPLICA_HOST'):
+    DATABASES['replica'] = {
+        **DATABASES['default'],
+        'NAME': os.environ.get('DB_REPLICA_NAME', DATABASES['default']['NAME']),
+        'USER': os.environ.get('DB_REPLICA_USER', DATABASES['default']['USER']),
+        'PASSWORD': os.environ.get('DB_REPLICA_PASSWORD', DATABASES['default']['PASSWORD']),
+        'HOST': os.environ['DB_REPLICA_HOST'],
+        'PORT': os.environ.get('DB_REPLICA_PORT', DATABASES['default']['PORT']),
+        'TEST': {'MIRROR': 'default'},
+    }
+
+DATABASE_ROUTERS = ['binarybiz_whatsapp_backend.db_router.ReplicaRouter']
+DB_REPLICA_STICKY_SECONDS = int(os.environ.get('DB_REPLICA_STICKY_SECONDS', 5))
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -155,3 +196,56 @@ MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
+
+
+# Keep the normalized audience_labels table in sync with audiences_labels and
+# use it for label filters and counts. Run the sync_audience_labels command
+# once before switching it on.
+AUDIENCE_LABELS_JOIN_TABLE = os.environ.get('AUDIENCE_LABELS_JOIN_TABLE', 'false').lower() == 'true'
+
+# Caches. The permissions and roles caches are shared by every worker in
+# production, e.g.
+# PERMISSION_CACHE_BACKEND=django.core.cache.backends.redis.RedisCache
+# PERMISSION_CACHE_LOCATION=redis://127.0.0.1:6379/1
+# With DEBUG off and no shared backend, a warning is logged at startup.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'permissions': {
+        'BACKEND': os.environ.get('PERMISSION_CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': os.environ.get('PERMISSION_CACHE_LOCATION', 'permissions'),
+        'KEY_PREFIX': 'whatsapp',
+    },
+    'roles': {
+        'BACKEND': os.environ.get('PERMISSION_CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': os.environ.get('PERMISSION_CACHE_LOCATION', 'roles'),
+        'KEY_PREFIX': 'whatsapp',
+    },
+}
+
+# Role permissions used by feature_permission_required: PERMISSION_CACHE_ALIAS
+# is the shared cache, the other two size the per-worker LRU in front of it
+PERMISSION_CACHE_ALIAS = 'permissions'
+PERMISSION_CACHE_TTL = int(os.environ.get('PERMISSION_CACHE_TTL', 300))
+PERMISSION_CACHE_MAX_ENTRIES = int(os.environ.get('PERMISSION_CACHE_MAX_ENTRIES', 1024))
+
+# Seconds each worker keeps the feature/action catalogue before reloading it.
+# Saving a Feature or FeatureAction clears it at once in the saving worker only.
+FEATURE_CATALOGUE_TTL = int(os.environ.get('FEATURE_CATALOGUE_TTL', 300))
+
+# Auth service client used by the role views (seconds unless noted)
+AUTH_SERVICE_CONNECT_TIMEOUT = float(os.environ.get('AUTH_SERVICE_CONNECT_TIMEOUT', 3.05))
+AUTH_SERVICE_READ_TIMEOUT = float(os.environ.get('AUTH_SERVICE_READ_TIMEOUT', 10))
+AUTH_SERVICE_MAX_RETRIES = int(os.environ.get('AUTH_SERVICE_MAX_RETRIES', 2))
+AUTH_SERVICE_RETRY_BACKOFF = float(os.environ.get('AUTH_SERVICE_RETRY_BACKOFF', 0.3))
+AUTH_SERVICE_POOL_SIZE = int(os.environ.get('AUTH_SERVICE_POOL_SIZE', 20))
+# Consecutive failures that open the circuit, and how long it stays open
+AUTH_SERVICE_CIRCUIT_FAILURES = int(os.environ.get('AUTH_SERVICE_CIRCUIT_FAILURES', 5))
+AUTH_SERVICE_CIRCUIT_RESET = float(os.environ.get('AUTH_SERVICE_CIRCUIT_RESET', 30))
+
+# Role listings proxied from the auth service: served fresh for ROLE_CACHE_TTL
+# seconds, then stale for up to ROLE_CACHE_STALE_TTL more while refreshing
+ROLE_CACHE_ALIAS = 'roles'
+ROLE_CACHE_TTL = int(os.environ.get('ROLE_CACHE_TTL', 60))
+ROLE_CACHE_STALE_TTL = int(os.environ.get('ROLE_CACHE_STALE_TTL', 600))
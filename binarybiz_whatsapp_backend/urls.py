@@ -29,6 +29,7 @@ urlpatterns = [
     path('api/v1/whatsapp/',include('apps.media_libraries.urls')),
     path('api/v1/whatsapp/',include('apps.profile_chat_settings.urls')),
     path('api/v1/whatsapp/',include('apps.opt_keywords.urls')),
+    path('api/v1/whatsapp/',include('apps.segments.urls')),
     path('api/v1/whatsapp/', include('apps.role_permissions_management.permissions.urls')),
     path('api/v1/whatsapp/', include('apps.role_permissions_management.roles.urls')),
     path('api/v1/whatsapp/', include('apps.role_permissions_management.feature_actions.urls')),